@@ -1,5 +1,5 @@
 # backend/app.py
-from flask import Flask
+from flask import Flask, request
 from flask_cors import CORS
 from flask_socketio import SocketIO, join_room, leave_room
 import logging
@@ -23,8 +23,25 @@ if not supabase:
     logger.warning("Supabase client could not be initialized. Check .env")
 
 # Create the SocketIO instance bound to the app immediately
-# In development the default async_mode is fine. For production, consider eventlet or gevent.
-socketio = SocketIO(app, cors_allowed_origins="*")
+# SOCKETIO_ASYNC_MODE selects the server loop (see backend/utils/concurrency.py).
+# Production runs under gevent so sockets, auth checks and bid loops share one event loop.
+# Socket.IO payloads go through the fast JSON encoder; clients that connect with
+# ?encoding=msgpack get MessagePack frames instead (see backend/utils/serialization.py).
+from backend.utils.concurrency import ASYNC_MODE
+from backend.utils.serialization import BINARY_ROOM_SUFFIX, FastJSON, wants_msgpack
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode=ASYNC_MODE, json=FastJSON)
+logger.info(f"SocketIO async mode: {socketio.async_mode}")
+
+# sid -> True for connections that negotiated MessagePack
+binary_clients = {}
+
+
+def _auction_room(auction_id):
+    room_name = f"auction_{auction_id}"
+    if binary_clients.get(request.sid):
+        room_name += BINARY_ROOM_SUFFIX
+    return room_name
+
 
 # --- Socket handlers: clients join/leave auction-specific rooms ---
 @socketio.on('join_auction')
@@ -34,7 +51,7 @@ def handle_join_auction(data):
     if not auction_id:
         logger.warning("join_auction called without auction_id")
         return
-    room_name = f"auction_{auction_id}"
+    room_name = _auction_room(auction_id)
     join_room(room_name)
     logger.info(f"Socket joined room: {room_name}")
 
@@ -45,17 +62,22 @@ def handle_leave_auction(data):
     if not auction_id:
         logger.warning("leave_auction called without auction_id")
         return
-    room_name = f"auction_{auction_id}"
+    room_name = _auction_room(auction_id)
     leave_room(room_name)
     logger.info(f"Socket left room: {room_name}")
 
 # Optional: simple ping/pong handlers for debugging
 @socketio.on('connect')
-def on_connect():
-    logger.info("Socket connected")
+def on_connect(auth=None):
+    # Encoding is picked at handshake: ?encoding=msgpack or auth={'encoding': 'msgpack'}
+    encoding = request.args.get('encoding') or (auth or {}).get('encoding')
+    if wants_msgpack(encoding):
+        binary_clients[request.sid] = True
+    logger.info(f"Socket connected ({'msgpack' if binary_clients.get(request.sid) else 'json'})")
 
 @socketio.on('disconnect')
-def on_disconnect():
+def on_disconnect(*args):
+    binary_clients.pop(request.sid, None)
     logger.info("Socket disconnected")
 
 
@@ -70,15 +92,33 @@ app.register_blueprint(auction_bp, url_prefix='/api/auction')
 app.register_blueprint(auth_bp, url_prefix='/api/user')
 app.register_blueprint(agent_bp, url_prefix='/api/agent')
 
+
+def configure_serving():
+    """
+    Server-only setup: torch thread pinning and the fp32/int8/traced serving variant
+    (INFERENCE_PROFILE). Called from the entry points below and gunicorn.conf.py, never
+    on import, because the simulation imports this module for its app context.
+    """
+    from backend.models.inference import open_inference_profile
+    from backend.routes.auction_routes import dqn_agent
+    open_inference_profile(dqn_agent)
+
+
 @app.route('/health', methods=['GET'])
 def health():
     return {"status": "ok", "message": "backend reachable"}
 
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    from backend.utils import metrics
+    return metrics.snapshot()
+
 
 if __name__ == '__main__':
     # Allow running from backend/ directory by adding parent to sys.path
     import sys
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+    configure_serving()
     # Use socketio.run to serve app with SocketIO support
     socketio.run(app, host='0.0.0.0', port=int(os.environ.get('PORT', 8000)), debug=True)
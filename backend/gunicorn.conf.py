@@ -0,0 +1,8 @@
+# Picked up automatically when gunicorn starts in backend/ (the Docker image's WORKDIR);
+# elsewhere pass it with -c backend/gunicorn.conf.py
+import sys
+
+
+def post_worker_init(worker):
+    # the app module is imported as `app` or `backend.app` depending on where gunicorn runs
+    sys.modules[worker.wsgi.import_name].configure_serving()
@@ -32,3 +32,48 @@ class AuctionEnvironment:
         rewards[winner] = self.valuations[winner] - price
         done = self.current_round >= self.rounds
         return self._get_state(), rewards, done, {'winner': winner, 'price': price}
+
+
+def truthful_bid(env, seat):
+    """Bid the most the seat can pay for this round's item: min(valuation, budget)."""
+    return min(env.valuations[seat], env.budgets[seat])
+
+
+def observe(env, seat, increment):
+    """Serving-layout state for `seat` (see SingleAgentAuctionEnv)."""
+    return np.array([
+        0.0,
+        increment,
+        min(env.valuations[seat], env.budgets[seat]),
+        env.rounds - env.current_round,
+    ], dtype=np.float32)
+
+
+class SingleAgentAuctionEnv:
+    """
+    One seat of an AuctionEnvironment exposed through the reset()/step(action) interface
+    DQNAgent.train expects; the other seats bid with `opponent(env, seat)`.
+
+    Observations use the serving state layout [current_price, increment, remaining_budget,
+    time_left] so trained weights drop into the live agent: each round is a fresh sealed
+    lot (current_price 0), increment spreads the action range over max_valuation, the
+    budget slot holds min(budget, valuation) — what the item is worth paying — and
+    time_left counts rounds.
+    """
+
+    def __init__(self, env=None, seat=0, action_size=10, opponent=truthful_bid):
+        self.env = env or AuctionEnvironment()
+        self.seat = seat
+        self.increment = self.env.max_valuation / action_size
+        self.opponent = opponent
+
+    def reset(self):
+        self.env.reset()
+        return observe(self.env, self.seat, self.increment)
+
+    def step(self, action):
+        bids = [self.opponent(self.env, i) for i in range(self.env.num_agents)]
+        bids[self.seat] = self.increment * (action + 1)
+        _, rewards, done, info = self.env.step(np.array(bids))
+        return observe(self.env, self.seat, self.increment), rewards[self.seat], done, info
+
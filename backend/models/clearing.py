@@ -0,0 +1,95 @@
+import numpy as np
+
+PRICING_RULES = ("first_price", "second_price")
+
+
+def _grouped_spend(winners, prices):
+    """
+    For every won lot, the winner's cumulative spend up to and including that lot
+    (lots taken in index order). Returns (lot_indices, bidder_ids, cumulative_spend).
+    """
+    lots = np.flatnonzero(winners >= 0)
+    if lots.size == 0:
+        return lots, lots, np.zeros(0)
+    # lexsort is stable: group by bidder, keep lot order inside each group
+    order = np.lexsort((lots, winners[lots]))
+    lots = lots[order]
+    bidders = winners[lots]
+    spend = prices[lots]
+
+    total = np.cumsum(spend)
+    group_start = np.r_[True, bidders[1:] != bidders[:-1]]
+    start_idx = np.maximum.accumulate(np.where(group_start, np.arange(lots.size), 0))
+    offset = (total - spend)[start_idx]
+    return lots, bidders, total - offset
+
+
+def clear_lots(bids, reserves=None, budgets=None, pricing="second_price", rng=None):
+    """
+    Clear many sealed-bid lots at once.
+
+    bids:     [lots, bidders] array; NaN (or <= 0) means the bidder did not bid on that lot.
+    reserves: [lots] minimum acceptable price per lot (default 0).
+    budgets:  [bidders] total spend limit across all lots (default unlimited). A single bid
+              above budget is capped at the budget, as in AuctionEnvironment.step.
+    pricing:  "first_price" (winner pays own bid) or "second_price" (Vickrey: winner pays the
+              highest losing bid, never below reserve).
+    rng:      np.random.Generator used to break ties uniformly at random.
+
+    Returns (winners, prices): winners[l] is the winning bidder index or -1, prices[l] the
+    clearing price (0 when unsold). Lots are charged to winners in index order; once a
+    bidder's cumulative spend would exceed its budget, its bids on those lots are withdrawn
+    and the lots re-cleared among the remaining bidders, pass by pass, until every winner
+    can pay.
+    """
+    if pricing not in PRICING_RULES:
+        raise ValueError(f"pricing must be one of {PRICING_RULES}, got {pricing!r}")
+
+    bids = np.array(bids, dtype=np.float64, ndmin=2)
+    n_lots, n_bidders = bids.shape
+    reserves = np.zeros(n_lots) if reserves is None else np.asarray(reserves, dtype=np.float64)
+    budgets = np.full(n_bidders, np.inf) if budgets is None else np.asarray(budgets, dtype=np.float64)
+    rng = rng or np.random.default_rng()
+
+    winners = np.full(n_lots, -1, dtype=np.int64)
+    prices = np.zeros(n_lots)
+    if n_lots == 0 or n_bidders == 0:
+        return winners, prices
+
+    effective = np.minimum(np.nan_to_num(bids, nan=-np.inf), budgets[None, :])
+    valid = (effective > 0) & (effective >= reserves[:, None])
+    effective = np.where(valid, effective, -np.inf)
+    priority = rng.random((n_lots, n_bidders))
+
+    pending = np.ones(n_lots, dtype=bool)
+    while pending.any():
+        lots = np.flatnonzero(pending)
+        eff = effective[lots]
+
+        top = eff.max(axis=1)
+        tied = eff == top[:, None]
+        winner = np.argmax(np.where(tied, priority[lots], -1.0), axis=1)
+        sold = np.isfinite(top)
+
+        if pricing == "first_price":
+            price = top
+        else:
+            runner_up = eff.copy()
+            runner_up[np.arange(lots.size), winner] = -np.inf
+            price = np.maximum(runner_up.max(axis=1), reserves[lots])
+
+        winners[lots] = np.where(sold, winner, -1)
+        prices[lots] = np.where(sold, price, 0.0)
+
+        # withdraw wins past each bidder's budget and re-clear those lots
+        won_lots, won_by, spent = _grouped_spend(winners, prices)
+        over = spent > budgets[won_by] + 1e-9
+        pending[:] = False
+        if over.any():
+            dropped = won_lots[over]
+            effective[dropped, won_by[over]] = -np.inf
+            winners[dropped] = -1
+            prices[dropped] = 0.0
+            pending[dropped] = True
+
+    return winners, prices
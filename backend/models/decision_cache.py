@@ -0,0 +1,122 @@
+import os
+import random
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class DecisionCache:
+    """
+    LRU cache of greedy DQN actions keyed on a quantized state.
+
+    States are [current_price, increment, remaining_budget, time_left]; each feature is
+    bucketed as floor(value / quantum) (a quantum of 0 keeps the exact value), so agents
+    in near-identical situations share one forward pass. Only the action is cached; the
+    bid amount is recomputed from the caller's real price and increment.
+
+    Entries belong to one model version. When the agent's model_version changes (new
+    weights loaded or trained) the cache empties itself on the next lookup. Exploratory
+    (epsilon) decisions never touch the cache.
+    """
+
+    def __init__(self, max_size=50_000, quantum=(10.0, 1.0, 100.0, 1000.0)):
+        self.max_size = max_size
+        self.quantum = np.asarray(quantum, dtype=np.float64)
+        self._exact = self.quantum <= 0
+        self._divisor = np.where(self._exact, 1.0, self.quantum)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._version = None
+        self.stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def keys_for(self, states_np):
+        scaled = np.asarray(states_np, dtype=np.float64) / self._divisor
+        buckets = np.where(self._exact, scaled, np.floor(scaled))
+        return [tuple(row) for row in buckets.tolist()]
+
+    def _lookup(self, agent, keys):
+        """Cached actions (None where missing) for `keys`; resets the cache on a model swap."""
+        with self._lock:
+            if agent.model_version != self._version:
+                if self._entries:
+                    self.stats['invalidations'] += 1
+                self._entries.clear()
+                self._version = agent.model_version
+            found = []
+            for key in keys:
+                action = self._entries.get(key)
+                if action is not None:
+                    self._entries.move_to_end(key)
+                found.append(action)
+            hits = sum(a is not None for a in found)
+            self.stats['hits'] += hits
+            self.stats['misses'] += len(found) - hits
+            return found, self._version
+
+    def _store(self, version, keys, actions):
+        with self._lock:
+            if version != self._version:
+                return
+            for key, action in zip(keys, actions):
+                self._entries[key] = int(action)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def act(self, agent, state):
+        """Drop-in for agent.act(state): (action, bid_amount) for one state."""
+        state_np = np.asarray(state, dtype=np.float32).reshape(1, agent.state_size)
+        if random.random() <= agent.epsilon:
+            action = random.randrange(agent.action_size)
+        else:
+            keys = self.keys_for(state_np)
+            [action], version = self._lookup(agent, keys)
+            if action is None:
+                action = int(agent.greedy_actions(state_np)[0])
+                self._store(version, keys, [action])
+        return action, float(state_np[0, 0]) + float(state_np[0, 1]) * (action + 1)
+
+    def act_batch(self, agent, states):
+        """Drop-in for agent.act_batch(states): (actions [N], bid_amounts [N])."""
+        states_np = np.asarray(states, dtype=np.float32).reshape(-1, agent.state_size)
+        n = states_np.shape[0]
+        actions = np.empty(n, dtype=np.int64)
+
+        explore = np.random.rand(n) <= agent.epsilon
+        if explore.any():
+            actions[explore] = np.random.randint(0, agent.action_size, int(explore.sum()))
+        greedy = np.flatnonzero(~explore)
+        if greedy.size:
+            keys = self.keys_for(states_np[greedy])
+            found, version = self._lookup(agent, keys)
+            missing = []
+            for i, key, action in zip(greedy, keys, found):
+                if action is None:
+                    missing.append((i, key))
+                else:
+                    actions[i] = action
+            if missing:
+                rows = np.fromiter((i for i, _ in missing), dtype=np.int64, count=len(missing))
+                actions[rows] = agent.greedy_actions(states_np[rows])
+                self._store(version, [key for _, key in missing], actions[rows])
+
+        return actions, agent.bid_amounts(states_np, actions)
+
+    def snapshot(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {**self.stats, 'size': len(self._entries), 'model_version': self._version,
+                'hit_rate': self.stats['hits'] / lookups if lookups else 0.0}
+
+
+def open_decision_cache():
+    """
+    DecisionCache from the environment, or None when disabled:
+      DECISION_CACHE_SIZE     max cached states (default 0 = off)
+      DECISION_CACHE_QUANTUM  bucket widths for price,increment,budget,time_left(ms)
+                              (default "10,1,100,1000")
+    """
+    size = int(os.environ.get("DECISION_CACHE_SIZE", 0))
+    if size <= 0:
+        return None
+    quantum = [float(q) for q in os.environ.get("DECISION_CACHE_QUANTUM", "10,1,100,1000").split(",")]
+    return DecisionCache(max_size=size, quantum=quantum)
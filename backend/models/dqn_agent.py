@@ -9,6 +9,7 @@ from typing import Tuple, List, Optional
 # Keep your existing save/load and logger imports (they were used in original).
 from backend.utils.model_utils import save_model, load_model
 from backend.utils.logger import log_training
+from backend.models.inference import build_serving_model
 
 # ---------- Configuration / Defaults ----------
 DEFAULT_DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
@@ -104,6 +105,12 @@ class DQNAgent:
         # replay
         self.memory = ReplayBuffer(capacity=buffer_capacity)
         self.learn_step_counter = 0
+        # bumped whenever the online weights change, so cached decisions can be dropped
+        self.model_version = 0
+        # module used for action selection; self.model itself unless an int8/traced
+        # profile is set (see models/inference.py)
+        self.inference_profile = "fp32"
+        self.serving_model = self.model
 
         # try to load pretrained weights (keeps your original behavior)
         try:
@@ -130,7 +137,7 @@ class DQNAgent:
             # forward pass (ensure shape [1, state_size])
             state_t = torch.from_numpy(state_np).unsqueeze(0).to(self.device)  # [1, S]
             with torch.no_grad():
-                q_values = self.model(state_t)  # [1, action_size]
+                q_values = self.serving_model(state_t)  # [1, action_size]
                 action = int(torch.argmax(q_values, dim=1).item())
 
         # mapping action -> bid_amount (keeps your original mapping)
@@ -146,6 +153,36 @@ class DQNAgent:
         bid_amount = current_price + increment * (action + 1)
         return action, bid_amount
 
+    def act_batch(self, states) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorised act(): `states` is [N, state_size]. Returns (actions [N], bid_amounts [N])
+        from a single forward pass, with the same epsilon-greedy rule and action -> bid mapping.
+        """
+        states_np = np.asarray(states, dtype=np.float32).reshape(-1, self.state_size)
+        n = states_np.shape[0]
+        actions = np.empty(n, dtype=np.int64)
+
+        explore = np.random.rand(n) <= self.epsilon
+        if explore.any():
+            actions[explore] = np.random.randint(0, self.action_size, int(explore.sum()))
+        greedy = ~explore
+        if greedy.any():
+            actions[greedy] = self.greedy_actions(states_np[greedy])
+
+        return actions, self.bid_amounts(states_np, actions)
+
+    def greedy_actions(self, states_np: np.ndarray) -> np.ndarray:
+        """argmax_a Q(s, a) for a [N, state_size] float32 array, in one forward pass."""
+        state_t = torch.from_numpy(states_np).to(self.device)  # [N, S]
+        with torch.no_grad():
+            q_values = self.serving_model(state_t)  # [N, action_size]
+        return torch.argmax(q_values, dim=1).cpu().numpy()
+
+    @staticmethod
+    def bid_amounts(states_np, actions) -> np.ndarray:
+        # same action -> bid mapping as act(): current_price + increment * (action + 1)
+        return states_np[:, 0].astype(np.float64) + states_np[:, 1].astype(np.float64) * (actions + 1)
+
     # -------- memory --------
     def remember(self, state, action, reward, next_state, done):
         self.memory.push(state, action, reward, next_state, done)
@@ -182,6 +219,7 @@ class DQNAgent:
         if self.grad_clip is not None:
             torch.nn.utils.clip_grad_norm_(self.model.parameters(), self.grad_clip)
         self.optimizer.step()
+        self.model_version += 1
 
         # increment step counter and update target periodically
         self.learn_step_counter += 1
@@ -195,11 +233,14 @@ class DQNAgent:
         return loss.item()
 
     # -------- training loop for episodes --------
-    def train(self, env, episodes: int = 100, max_steps_per_episode: int = 1000, log_every: int = 1):
+    def train(self, env, episodes: int = 100, max_steps_per_episode: int = 1000, log_every: int = 1,
+              checkpoint: bool = True):
         """
         env must implement reset() -> state and step(action) -> (next_state, reward, done) OR (next_state, reward, done, info).
-        Training saves the model after each episode using your save_model utility.
+        With `checkpoint` the model is saved after each episode using your save_model utility.
+        Returns one {'episode', 'reward', 'steps', 'avg_loss'} dict per episode.
         """
+        history = []
         for e in range(1, episodes + 1):
             state = env.reset()
             done = False
@@ -228,20 +269,23 @@ class DQNAgent:
 
             # logging and checkpoint
             avg_loss = float(np.mean(episode_losses)) if episode_losses else 0.0
-            log_training(self.agent_id, e, total_reward)
-            # Attempt to save via your save_model utility; fall back to saving model.state_dict
-            try:
-                save_model(self, f"{self.agent_id}_pretrained.pth")
-            except Exception as ex:
-                # fallback: save model state dict locally
-                torch.save(self.model.state_dict(), f"{self.agent_id}_pretrained_fallback.pth")
-                print(f"[DQNAgent] save_model failed: {ex}. Saved fallback state dict.")
+            history.append({'episode': e, 'reward': total_reward, 'steps': steps, 'avg_loss': avg_loss})
+            if checkpoint:
+                log_training(self.agent_id, e, total_reward)
+                # Attempt to save via your save_model utility; fall back to saving model.state_dict
+                try:
+                    save_model(self, f"{self.agent_id}_pretrained.pth")
+                except Exception as ex:
+                    # fallback: save model state dict locally
+                    torch.save(self.model.state_dict(), f"{self.agent_id}_pretrained_fallback.pth")
+                    print(f"[DQNAgent] save_model failed: {ex}. Saved fallback state dict.")
 
             if e % log_every == 0:
                 print(
                     f"[DQNAgent] Episode {e}/{episodes} | Reward: {total_reward:.3f} | "
                     f"Steps: {steps} | Epsilon: {self.epsilon:.4f} | AvgLoss: {avg_loss:.6f}"
                 )
+        return history
 
     # -------- load pretrained (explicit) --------
     def load_pretrained(self, filename: str = "pretrained_agent.pth"):
@@ -251,10 +295,37 @@ class DQNAgent:
             self.model.to(self.device)
             self.target_model.load_state_dict(self.model.state_dict())
             self.target_model.to(self.device)
+            # rebuild after the move: non-fp32 profiles copy the module and must see it on its final device
+            self.serving_model = build_serving_model(self.model, self.inference_profile, self.state_size)
+            self.model_version += 1
             print(f"[DQNAgent] Loaded pretrained from {filename}")
         except Exception as e:
             print(f"[DQNAgent] load_pretrained failed: {e}")
 
+    # -------- hot swap (serving) --------
+    def swap_weights(self, state_dict):
+        """
+        Replace the online network with one holding `state_dict` (tensors or numpy arrays).
+        The new module is built aside and assigned in one step, so concurrent act() calls
+        see either the old or the new network, never a half-loaded one. The optimizer keeps
+        pointing at the old parameters; this is meant for serving agents, not for training.
+        """
+        model = DQN(self.state_size, self.action_size)
+        model.load_state_dict({k: torch.as_tensor(v) for k, v in state_dict.items()})
+        model.to(self.device).eval()
+        self.model = model
+        self.serving_model = build_serving_model(model, self.inference_profile, self.state_size)
+        self.model_version += 1
+
+    def set_inference_profile(self, profile: str):
+        """
+        Serve actions from an fp32, int8 or traced version of the online network. Non-fp32
+        profiles are snapshots: swap_weights/load_pretrained rebuild them, replay() does not.
+        """
+        self.serving_model = build_serving_model(self.model, profile, self.state_size)
+        self.inference_profile = profile
+        self.model_version += 1
+
     # convenience: save model manually
     def save(self, filename: str):
         try:
@@ -0,0 +1,144 @@
+"""
+CPU inference profiles for serving the DQN.
+
+  fp32    the training module as is (default)
+  int8    dynamically quantized copy: Linear weights int8, activations quantized per call
+  traced  TorchScript trace of the module, frozen (weights folded in as constants)
+
+Forward passes here are tiny, so torch's default of one intra-op thread per core mostly
+buys contention with the web server's own threads; configure_threads pins both pools.
+
+    python -m backend.models.inference --batch 1,32,1024
+benchmarks every profile and reports its action agreement with fp32.
+"""
+import argparse
+import copy
+import os
+import time
+import warnings
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+PROFILES = ('fp32', 'int8', 'traced')
+
+
+def configure_threads(intra=1, inter=1):
+    """Pin torch's intra-op and inter-op pools. Inter-op can only be set before first use."""
+    torch.set_num_threads(intra)
+    try:
+        torch.set_num_interop_threads(inter)
+    except RuntimeError:
+        pass  # already fixed by earlier parallel work; keep what is there
+    return torch.get_num_threads(), torch.get_num_interop_threads()
+
+
+def build_serving_model(model, profile, state_size):
+    """An inference-only module for `model` under `profile`; fp32 returns `model` itself."""
+    if profile not in PROFILES:
+        raise ValueError(f"unknown inference profile {profile!r}; choose from {', '.join(PROFILES)}")
+    if profile == 'fp32':
+        return model
+    if next(model.parameters()).device.type != 'cpu':
+        raise ValueError(f"inference profile {profile!r} is CPU-only")
+
+    frozen = copy.deepcopy(model).eval()
+    if profile == 'int8':
+        return torch.ao.quantization.quantize_dynamic(frozen, {nn.Linear}, dtype=torch.qint8)
+    with torch.no_grad(), warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)   # TorchScript deprecation notices
+        traced = torch.jit.trace(frozen, torch.zeros(1, state_size))
+        return torch.jit.freeze(traced)
+
+
+def sample_states(n, seed=0):
+    """[n, 4] states spread over the ranges the live engine produces."""
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.uniform(0, 20_000, n),       # current_price
+        rng.choice([1, 5, 10, 25, 50, 100], n),
+        rng.uniform(0, 20_000, n),       # remaining_budget
+        rng.uniform(0, 120_000, n),      # time_left (ms)
+    ]).astype(np.float32)
+
+
+def greedy(model, states_np):
+    with torch.no_grad():
+        return torch.argmax(model(torch.from_numpy(states_np)), dim=1).numpy()
+
+
+def action_agreement(reference, candidate, states_np):
+    """Fraction of states on which `candidate` picks the same greedy action as `reference`."""
+    return float(np.mean(greedy(reference, states_np) == greedy(candidate, states_np)))
+
+
+def benchmark(model, batch_size, iters=1000, warmup=50):
+    """Latency of one forward pass at `batch_size`: (p50, p99) in microseconds."""
+    x = torch.from_numpy(sample_states(batch_size, seed=1))
+    timings = np.empty(iters)
+    with torch.no_grad():
+        for _ in range(warmup):
+            model(x)
+        for i in range(iters):
+            started = time.perf_counter()
+            model(x)
+            timings[i] = time.perf_counter() - started
+    return float(np.percentile(timings, 50) * 1e6), float(np.percentile(timings, 99) * 1e6)
+
+
+def open_inference_profile(agent):
+    """
+    Apply the serving profile from the environment to `agent`:
+      INFERENCE_PROFILE          fp32 (default) | int8 | traced
+      INFERENCE_THREADS          intra-op threads (default 1)
+      INFERENCE_INTEROP_THREADS  inter-op threads (default 1)
+      INFERENCE_MIN_AGREEMENT    fall back to fp32 if the profile agrees with it on fewer
+                                 greedy actions than this over sample states (default 0.98)
+    """
+    intra, inter = configure_threads(int(os.environ.get("INFERENCE_THREADS", 1)),
+                                     int(os.environ.get("INFERENCE_INTEROP_THREADS", 1)))
+    profile = os.environ.get("INFERENCE_PROFILE", "fp32")
+    agent.set_inference_profile(profile)
+    if profile != 'fp32':
+        agreement = action_agreement(agent.model, agent.serving_model, sample_states(4096))
+        if agreement < float(os.environ.get("INFERENCE_MIN_AGREEMENT", 0.98)):
+            print(f"⚠️ Inference profile {profile} agrees with fp32 on {agreement:.1%} of actions; serving fp32")
+            agent.set_inference_profile('fp32')
+            profile = 'fp32'
+        else:
+            print(f"⚡ Inference profile {profile}: {agreement:.1%} action agreement with fp32")
+    print(f"⚡ Serving {profile} on {intra} intra-op / {inter} inter-op threads")
+    return profile
+
+
+def main():
+    from backend.models.dqn_agent import DQNAgent
+
+    parser = argparse.ArgumentParser(description="Benchmark DQN inference profiles on CPU")
+    parser.add_argument("--batch", default="1,32,1024", help="comma-separated batch sizes")
+    parser.add_argument("--iters", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--interop-threads", type=int, default=1)
+    parser.add_argument("--agent-id", default="dqn1", help="loads models/<agent-id>_pretrained.pth if present")
+    args = parser.parse_args()
+
+    configure_threads(args.threads, args.interop_threads)
+    agent = DQNAgent(agent_id=args.agent_id, state_size=4, action_size=10, device=torch.device("cpu"))
+    agent.model.eval()
+    states = sample_states(10_000, seed=2)
+    batches = [int(b) for b in args.batch.split(",")]
+
+    print(f"{'profile':>8} {'agree':>7} " + " ".join(f"{f'b={b} p50/p99 µs':>22}" for b in batches))
+    for profile in PROFILES:
+        model = build_serving_model(agent.model, profile, agent.state_size)
+        agreement = action_agreement(agent.model, model, states)
+        cells = []
+        for b in batches:
+            p50, p99 = benchmark(model, b, iters=args.iters)
+            cells.append(f"{p50:>10.1f} / {p99:>9.1f}")
+        print(f"{profile:>8} {agreement:>7.2%} " + " ".join(f"{c:>22}" for c in cells))
+
+
+if __name__ == "__main__":
+    main()
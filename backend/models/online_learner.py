@@ -0,0 +1,225 @@
+"""
+Online learning from live auctions.
+
+The serving process turns each agent's bid decisions into transitions
+(state, action, reward, next_state, done) and appends them to a bounded in-process
+buffer. A native OS thread (never a gevent greenlet) drains the buffer into a pipe
+to a separate learner process, so a slow learner can only stall that thread, not
+the event loop. The learner owns its own DQNAgent and optimizer, runs
+replay() as data arrives and periodically publishes its weights. The serving
+side polls for published weights and swaps them in by reference
+(DQNAgent.swap_weights), so inference never waits on the learner.
+
+Live auctions have no private valuations, so the terminal reward is a proxy:
+the winner earns 1 - price / budget (cheaper wins score higher), everyone else 0.
+"""
+import contextlib
+import multiprocessing as mp
+import os
+import queue
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from backend.utils.concurrency import native_sleep, start_native_thread
+
+
+def outcome_reward(price, budget):
+    """Terminal reward for winning at `price` with `budget`: 1 at a free win, 0 when it took the whole budget."""
+    if budget <= 0:
+        return 0.0
+    return 1.0 - min(price, budget) / budget
+
+
+@contextlib.contextmanager
+def _bare_main():
+    # spawn re-imports __main__ in the child; app.py is not import-safe (it restores
+    # state and starts background tasks), so hide it while the learner is launched
+    main = sys.modules['__main__']
+    sys.modules['__main__'] = types.ModuleType('__main__')
+    try:
+        yield
+    finally:
+        sys.modules['__main__'] = main
+
+
+class OnlineLearner:
+    """Serving-side half: builds transitions, feeds the learner process, applies published weights."""
+
+    def __init__(self, agent, publish_seconds=30.0, queue_size=10_000, replay_ratio=1, max_auctions=10_000):
+        self.agent = agent
+        self.publish_seconds = publish_seconds
+        self.queue_size = queue_size
+        self.replay_ratio = replay_ratio
+        self.max_auctions = max_auctions
+        # auction_id -> {agent_id: (state, action) awaiting its next state}, least recently active first
+        self._pending = OrderedDict()
+        self._lock = threading.Lock()
+        self._buffer = deque()   # transitions waiting for the feeder thread
+        self._stopping = False
+        self._sender = None
+        self._weights = None
+        self._process = None
+        self.stats = {'sent': 0, 'dropped': 0, 'evicted': 0, 'weights_applied': 0}
+
+    def start(self):
+        ctx = mp.get_context('spawn')
+        receiver, self._sender = ctx.Pipe(duplex=False)
+        self._weights = ctx.Queue(maxsize=1)
+        initial = {k: v.detach().cpu().numpy() for k, v in self.agent.model.state_dict().items()}
+        config = {
+            'agent_id': self.agent.agent_id,
+            'state_size': self.agent.state_size,
+            'action_size': self.agent.action_size,
+            'publish_seconds': self.publish_seconds,
+            'replay_ratio': self.replay_ratio,
+            'initial_weights': initial,
+        }
+        self._process = ctx.Process(target=learner_main, args=(receiver, self._weights, config),
+                                    name='dqn-online-learner', daemon=True)
+        with _bare_main():
+            self._process.start()
+        receiver.close()
+        start_native_thread(self._feed, 'online-learner-feeder')
+        print(f"🧠 Online learner started (pid {self._process.pid})", flush=True)
+
+    def stop(self):
+        if self._process is None:
+            return
+        self._stopping = True    # the feeder sends what is buffered, then the stop marker
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process = None
+
+    # -------- transitions --------
+    def _send(self, transition):
+        # deque appends are atomic; never stall a bid round on the learner
+        if len(self._buffer) >= self.queue_size:
+            self.stats['dropped'] += 1
+            return
+        self._buffer.append(transition)
+
+    def _feed(self):
+        """Feeder thread: drain the buffer into the learner's pipe; blocking writes only stall this thread."""
+        try:
+            while True:
+                while self._buffer:
+                    self._sender.send(self._buffer.popleft())
+                    self.stats['sent'] += 1
+                if self._stopping:
+                    self._sender.send(None)
+                    return
+                native_sleep(0.01)
+        except (OSError, EOFError):
+            pass  # learner exited; stats keep what was sent
+        finally:
+            self._sender.close()
+
+    def record(self, auction_id, agent_id, state, action):
+        """An agent acted in an auction; closes its previous (non-terminal) transition there."""
+        state = np.asarray(state, dtype=np.float32)
+        with self._lock:
+            agents = self._pending.get(auction_id)
+            if agents is None:
+                if len(self._pending) >= self.max_auctions:
+                    # an auction that never reached finish(); its open decisions are dropped
+                    self._pending.popitem(last=False)
+                    self.stats['evicted'] += 1
+                agents = self._pending[auction_id] = {}
+            else:
+                self._pending.move_to_end(auction_id)
+            prev = agents.get(agent_id)
+            agents[agent_id] = (state, int(action))
+        if prev is not None:
+            self._send((prev[0], prev[1], 0.0, state, 0.0))
+
+    def finish(self, auction_id, winner_id=None, winner_reward=0.0):
+        """Auction closed: emit a terminal transition for every agent that acted in it."""
+        with self._lock:
+            closing = self._pending.pop(auction_id, {})
+        for agent_id, (state, action) in closing.items():
+            reward = winner_reward if agent_id == winner_id else 0.0
+            self._send((state, action, reward, state, 1.0))
+
+    # -------- weights --------
+    def poll_weights(self):
+        """Apply the newest published weights, if any. Returns True when the model changed."""
+        try:
+            weights = self._weights.get_nowait()
+        except queue.Empty:
+            return False
+        self.agent.swap_weights(weights)
+        self.stats['weights_applied'] += 1
+        return True
+
+    def snapshot(self):
+        return {**self.stats, 'pending_auctions': len(self._pending), 'buffered': len(self._buffer),
+                'model_version': self.agent.model_version,
+                'alive': bool(self._process and self._process.is_alive())}
+
+
+def learner_main(transitions, weights, config):
+    """Learner process: replay as transitions arrive, publish weights every publish_seconds."""
+    import torch
+    from backend.models.dqn_agent import DQNAgent
+
+    torch.set_num_threads(1)
+    agent = DQNAgent(agent_id=config['agent_id'], state_size=config['state_size'],
+                     action_size=config['action_size'], device=torch.device("cpu"))
+    # load in place so the optimizer keeps training these parameters
+    initial = {k: torch.as_tensor(v) for k, v in config['initial_weights'].items()}
+    agent.model.load_state_dict(initial)
+    agent.target_model.load_state_dict(initial)
+
+    last_publish = time.monotonic()
+    while True:
+        batch = []
+        try:
+            if transitions.poll(1.0):
+                batch.append(transitions.recv())
+                while len(batch) < 1024 and transitions.poll():
+                    batch.append(transitions.recv())
+        except EOFError:
+            return   # serving process went away
+
+        for item in batch:
+            if item is None:
+                return
+            agent.remember(*item)
+        for _ in range(len(batch) * config['replay_ratio']):
+            agent.replay()
+
+        if time.monotonic() - last_publish >= config['publish_seconds']:
+            last_publish = time.monotonic()
+            state = {k: v.detach().cpu().numpy() for k, v in agent.model.state_dict().items()}
+            try:
+                weights.put_nowait(state)
+            except queue.Full:
+                pass  # serving side hasn't picked up the previous weights yet
+
+
+def open_online_learner(agent):
+    """
+    Start the learner when ONLINE_LEARNING=1, else return None.
+      ONLINE_PUBLISH_SECONDS  how often new weights are published (default 30)
+      ONLINE_QUEUE_SIZE       transitions buffered before new ones are dropped (default 10000)
+      ONLINE_REPLAY_RATIO     replay() steps per received transition (default 1)
+      ONLINE_PENDING_AUCTIONS auctions tracked awaiting their outcome; the least recently
+                              active is evicted past this (default 10000)
+    """
+    if os.environ.get("ONLINE_LEARNING") != "1" or mp.parent_process() is not None:
+        return None
+    learner = OnlineLearner(
+        agent,
+        publish_seconds=float(os.environ.get("ONLINE_PUBLISH_SECONDS", 30)),
+        queue_size=int(os.environ.get("ONLINE_QUEUE_SIZE", 10_000)),
+        replay_ratio=int(os.environ.get("ONLINE_REPLAY_RATIO", 1)),
+        max_auctions=int(os.environ.get("ONLINE_PENDING_AUCTIONS", 10_000)),
+    )
+    learner.start()
+    return learner
@@ -0,0 +1,213 @@
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+
+# Bids included in API/socket auction payloads; older ones are paged via the bid history endpoint
+BID_WINDOW = int(os.environ.get("BID_WINDOW", 50))
+
+
+class Bid:
+    """One bid. Materialised on demand from an Auction's columnar history."""
+
+    __slots__ = ("id", "bidder_id", "bidder_name", "bidder_type", "amount", "timestamp")
+
+    def __init__(self, id, bidder_id, bidder_name, bidder_type, amount, timestamp):
+        self.id = id
+        self.bidder_id = bidder_id
+        self.bidder_name = bidder_name
+        self.bidder_type = bidder_type
+        self.amount = float(amount)
+        self.timestamp = float(timestamp)
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d['id'], d['bidderId'], d.get('bidderName'), d.get('bidderType'), d['amount'], d['timestamp'])
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'bidderId': self.bidder_id,
+            'bidderName': self.bidder_name,
+            'bidderType': self.bidder_type,
+            'amount': self.amount,
+            'timestamp': self.timestamp,
+        }
+
+
+# API (camelCase) key -> attribute, for the auction header fields
+_HEADER_FIELDS = (
+    ('id', 'id'),
+    ('title', 'title'),
+    ('description', 'description'),
+    ('startingPrice', 'starting_price'),
+    ('reservePrice', 'reserve_price'),
+    ('increment', 'increment'),
+    ('format', 'format'),
+    ('startTime', 'start_time'),
+    ('endTime', 'end_time'),
+    ('currentPrice', 'current_price'),
+    ('status', 'status'),
+    ('participants', 'participants'),
+    ('selectedAgents', 'selected_agents'),
+    ('winnerId', 'winner_id'),
+    ('winnerName', 'winner_name'),
+    ('winnerType', 'winner_type'),
+    ('winningPrice', 'winning_price'),
+)
+
+
+class Auction:
+    """
+    An auction with its bid history stored column-wise: bid ids as packed 16-byte UUIDs,
+    amounts/timestamps as float arrays and bidders as indexes into a per-auction bidder
+    table, so a long auction costs ~30 bytes per bid instead of a dict per bid.
+
+    Leader, top amount, bid count and last bidder are maintained on every add_bid, so
+    finalizing never scans the history.
+    """
+
+    __slots__ = tuple(attr for _, attr in _HEADER_FIELDS) + (
+        "_bid_ids", "_amounts", "_timestamps", "_bidder_idx", "_bidders", "_bidder_pos",
+        "top_index", "top_amount", "last_bidder",
+    )
+
+    def __init__(self, id, title=None, description=None, starting_price=0.0, reserve_price=0.0,
+                 increment=1.0, format='english', start_time=0.0, end_time=0.0, current_price=None,
+                 status='pending', participants=None, selected_agents=None, winner_id=None,
+                 winner_name=None, winner_type=None, winning_price=None):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.starting_price = float(starting_price)
+        self.reserve_price = float(reserve_price)
+        self.increment = float(increment)
+        self.format = format
+        self.start_time = float(start_time)
+        self.end_time = float(end_time)
+        self.current_price = float(starting_price if current_price is None else current_price)
+        self.status = status
+        self.participants = participants if participants is not None else []
+        self.selected_agents = selected_agents if selected_agents is not None else {}  # userId → agentId
+        self.winner_id = winner_id
+        self.winner_name = winner_name
+        self.winner_type = winner_type
+        self.winning_price = winning_price
+
+        self._bid_ids = bytearray()
+        self._amounts = array('d')
+        self._timestamps = array('d')
+        self._bidder_idx = array('I')
+        self._bidders = []        # (bidder_id, bidder_name, bidder_type)
+        self._bidder_pos = {}     # bidder_id -> index into _bidders
+        self.top_index = -1
+        self.top_amount = None
+        self.last_bidder = None
+
+    # -------- construction / serialization --------
+    @classmethod
+    def from_dict(cls, d):
+        """Build from the API/journal shape (bids, if present, are replayed through add_bid)."""
+        auction = cls(d['id'])
+        auction.apply_header(d)
+        for bid in d.get('bids') or ():
+            auction.add_bid(Bid.from_dict(bid))
+        return auction
+
+    def apply_header(self, d):
+        """Overwrite header fields present in `d`; bid history and aggregates are kept."""
+        for key, attr in _HEADER_FIELDS:
+            if key in d:
+                setattr(self, attr, d[key])
+
+    def to_dict(self, include_bids=True, bid_window=None):
+        """
+        API shape. `bids` holds only the most recent `bid_window` bids (BID_WINDOW by
+        default) so payload size doesn't grow with the auction; `bidCount` is the total.
+        """
+        d = {key: getattr(self, attr) for key, attr in _HEADER_FIELDS}
+        d['bidCount'] = self.bid_count
+        if include_bids:
+            window = BID_WINDOW if bid_window is None else bid_window
+            d['bids'] = self.bids_as_dicts(max(0, self.bid_count - window))
+        return d
+
+    # -------- bids --------
+    @property
+    def bid_count(self):
+        return len(self._amounts)
+
+    def add_bid(self, bid):
+        """Append a bid and update the running aggregates in O(1)."""
+        pos = self._bidder_pos.get(bid.bidder_id)
+        if pos is None:
+            pos = self._bidder_pos[bid.bidder_id] = len(self._bidders)
+            self._bidders.append((bid.bidder_id, bid.bidder_name, bid.bidder_type))
+
+        self._bid_ids += bytes.fromhex(str(bid.id).replace('-', ''))
+        self._amounts.append(bid.amount)
+        self._timestamps.append(bid.timestamp)
+        self._bidder_idx.append(pos)
+
+        if self.top_amount is None or bid.amount > self.top_amount:
+            self.top_index = len(self._amounts) - 1
+            self.top_amount = bid.amount
+        self.last_bidder = bid.bidder_id
+
+    def approx_bytes(self):
+        """Rough in-memory footprint, used for the completed-auction memory budget."""
+        return 512 + len(self._bid_ids) + 20 * len(self._amounts) + 128 * len(self._bidders)
+
+    def bid(self, i):
+        if i < 0:
+            i += self.bid_count
+        bidder_id, bidder_name, bidder_type = self._bidders[self._bidder_idx[i]]
+        return Bid(self._id_strings(i, i + 1)[0], bidder_id, bidder_name, bidder_type, self._amounts[i], self._timestamps[i])
+
+    def last_bid(self):
+        return self.bid(-1) if self.bid_count else None
+
+    def top_bid(self):
+        """Highest bid (earliest on ties), without scanning the history."""
+        return self.bid(self.top_index) if self.top_index >= 0 else None
+
+    def bid_ids(self):
+        return set(self._id_strings(0, self.bid_count))
+
+    def bids_as_dicts(self, start=0, stop=None):
+        """API dicts for bids[start:stop], built straight from the columns."""
+        stop = self.bid_count if stop is None else min(stop, self.bid_count)
+        bidders = self._bidders
+        out = []
+        for bid_id, amount, ts, idx in zip(self._id_strings(start, stop), self._amounts[start:stop],
+                                           self._timestamps[start:stop], self._bidder_idx[start:stop]):
+            bidder_id, bidder_name, bidder_type = bidders[idx]
+            out.append({'id': bid_id, 'bidderId': bidder_id, 'bidderName': bidder_name,
+                        'bidderType': bidder_type, 'amount': amount, 'timestamp': ts})
+        return out
+
+    def bids_page(self, after_ts=None, after_id=None, limit=50):
+        """
+        Keyset page over the full history in (timestamp, id) order: up to `limit` bids
+        strictly after the cursor (after_ts, after_id). Bids are appended in timestamp
+        order, so the cursor is found by bisection rather than a scan.
+        """
+        ts = self._timestamps
+        i = 0 if after_ts is None else bisect_left(ts, after_ts)
+        out = []
+        while i < len(ts) and len(out) < limit:
+            # one run of equal timestamps, ordered by id within the run
+            j = bisect_right(ts, ts[i], i)
+            run = sorted(zip(self._id_strings(i, j), range(i, j)))
+            for bid_id, k in run:
+                if after_ts is not None and (ts[k], bid_id) <= (after_ts, after_id or ''):
+                    continue
+                out.append(self.bids_as_dicts(k, k + 1)[0])
+                if len(out) == limit:
+                    break
+            i = j
+        return out
+
+    def _id_strings(self, start, stop):
+        raw = self._bid_ids[start * 16:stop * 16].hex()
+        return [f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+                for h in (raw[i:i + 32] for i in range(0, len(raw), 32))]
@@ -0,0 +1,210 @@
+"""
+Hyperparameter sweep + round-robin tournament for DQNAgent.
+
+Each config is trained in its own worker process against truthful bidders
+(SingleAgentAuctionEnv), then every pair of trained agents plays head-to-head
+episodes in a 2-seat AuctionEnvironment. Training runs and matches are spread
+over a process pool (one single-threaded torch per core) and every run is seeded
+through utils/helpers.set_seed, so a sweep is reproducible for a given --seed.
+
+    python -m backend.models.sweep --param lr=1e-3,5e-4 --param gamma=0.9,0.99 --episodes 300
+    python -m backend.models.sweep --random 32 --out sweep.csv
+"""
+import argparse
+import csv
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
+
+import numpy as np
+
+# Hyperparameters the sweep may vary, with the values searched by default
+PARAM_SPACE = {
+    'lr': [1e-3, 5e-4, 1e-4],
+    'gamma': [0.9, 0.99],
+    'epsilon_decay': [0.99, 0.995],
+    'batch_size': [32, 64],
+    'target_update_freq': [100, 1000],
+}
+PARAM_TYPES = {'lr': float, 'gamma': float, 'epsilon_decay': float, 'batch_size': int, 'target_update_freq': int}
+
+ACTION_SIZE = 10
+
+
+def grid_configs(space):
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+
+
+def random_configs(space, n, seed):
+    rng = random.Random(seed)
+    return [{name: rng.choice(values) for name, values in space.items()} for _ in range(n)]
+
+
+def _init_worker():
+    import torch
+    # one core per worker; the pool provides the parallelism
+    torch.set_num_threads(1)
+
+
+def train_run(run_id, config, seed, episodes, num_agents, rounds):
+    """Train one config; returns its metrics row and the trained weights as numpy arrays."""
+    import torch
+    from backend.models.auction_env import AuctionEnvironment, SingleAgentAuctionEnv
+    from backend.models.dqn_agent import DQNAgent
+    from backend.utils.helpers import set_seed
+
+    set_seed(seed)
+    env = SingleAgentAuctionEnv(AuctionEnvironment(num_agents=num_agents, rounds=rounds), action_size=ACTION_SIZE)
+    agent = DQNAgent(agent_id=f'sweep{run_id}', state_size=4, action_size=ACTION_SIZE,
+                     device=torch.device("cpu"), **config)
+
+    started = time.perf_counter()
+    history = agent.train(env, episodes=episodes, log_every=episodes + 1, checkpoint=False)
+    elapsed = time.perf_counter() - started
+
+    rewards = np.array([h['reward'] for h in history])
+    steps = sum(h['steps'] for h in history)
+    row = {
+        'run': run_id,
+        'seed': seed,
+        **config,
+        'train_steps': steps,
+        'train_seconds': round(elapsed, 3),
+        'steps_per_sec': round(steps / elapsed, 1) if elapsed else 0.0,
+        'train_reward_mean': float(rewards.mean()),
+        'train_reward_last10pct': float(rewards[-max(1, len(rewards) // 10):].mean()),
+    }
+    weights = {k: v.detach().cpu().numpy() for k, v in agent.model.state_dict().items()}
+    return row, weights
+
+
+def _greedy_policy(weights):
+    import torch
+    from backend.models.dqn_agent import DQN
+
+    model = DQN(4, ACTION_SIZE)
+    model.load_state_dict({k: torch.as_tensor(v) for k, v in weights.items()})
+    model.eval()
+
+    def act(state):
+        with torch.no_grad():
+            return int(torch.argmax(model(torch.from_numpy(state).unsqueeze(0)), dim=1).item())
+    return act
+
+
+def play_match(a, b, weights_a, weights_b, episodes, rounds, seed):
+    """Greedy head-to-head in a 2-seat AuctionEnvironment, swapping seats every episode."""
+    from backend.models.auction_env import AuctionEnvironment, observe
+    from backend.utils.helpers import set_seed
+
+    set_seed(seed)
+    policies = {a: _greedy_policy(weights_a), b: _greedy_policy(weights_b)}
+    env = AuctionEnvironment(num_agents=2, rounds=rounds)
+    increment = env.max_valuation / ACTION_SIZE
+    rewards = {a: [], b: []}
+    wins = {a: 0, b: 0}
+
+    for episode in range(episodes):
+        seats = (a, b) if episode % 2 == 0 else (b, a)
+        env.reset()
+        totals = [0.0, 0.0]
+        done = False
+        while not done:
+            bids = [increment * (policies[run](observe(env, seat, increment)) + 1) for seat, run in enumerate(seats)]
+            _, step_rewards, done, info = env.step(np.array(bids))
+            wins[seats[info['winner']]] += 1
+            totals[0] += step_rewards[0]
+            totals[1] += step_rewards[1]
+        for seat, run in enumerate(seats):
+            rewards[run].append(totals[seat])
+    return rewards, wins
+
+
+def run_sweep(configs, episodes=200, match_episodes=50, num_agents=3, rounds=5, seed=0, workers=None):
+    """Train every config, play the round robin and return one result row per config."""
+    workers = workers or os.cpu_count()
+    ctx = mp.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker) as pool:
+        started = time.perf_counter()
+        runs = [pool.submit(train_run, i, config, seed + i, episodes, num_agents, rounds)
+                for i, config in enumerate(configs)]
+        rows, weights = zip(*(f.result() for f in runs)) if runs else ((), ())
+        print(f"🏋️ Trained {len(rows)} configs in {time.perf_counter() - started:.1f}s on {workers} workers")
+
+        pairs = list(itertools.combinations(range(len(rows)), 2))
+        matches = [pool.submit(play_match, a, b, weights[a], weights[b], match_episodes, rounds, seed + 10_000 + k)
+                   for k, (a, b) in enumerate(pairs)]
+        tournament_rewards = {i: [] for i in range(len(rows))}
+        tournament_wins = {i: 0 for i in range(len(rows))}
+        for f in matches:
+            rewards, wins = f.result()
+            for run, values in rewards.items():
+                tournament_rewards[run].extend(values)
+            for run, count in wins.items():
+                tournament_wins[run] += count
+
+    rounds_per_run = max(1, (len(rows) - 1) * match_episodes * rounds)
+    results = []
+    for row in rows:
+        values = np.array(tournament_rewards[row['run']] or [0.0])
+        results.append({
+            **row,
+            'tournament_reward_mean': float(values.mean()),
+            'tournament_reward_std': float(values.std()),
+            'tournament_win_rate': tournament_wins[row['run']] / rounds_per_run if len(rows) > 1 else 0.0,
+        })
+    results.sort(key=lambda r: r['tournament_reward_mean'], reverse=True)
+    return results
+
+
+def write_results(results, path):
+    if not results:
+        return
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0]))
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def _parse_param(spec):
+    name, _, values = spec.partition('=')
+    if name not in PARAM_TYPES:
+        raise argparse.ArgumentTypeError(f"unknown parameter {name!r}; choose from {', '.join(PARAM_TYPES)}")
+    return name, [PARAM_TYPES[name](v) for v in values.split(',') if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel DQNAgent hyperparameter sweep with a round-robin tournament")
+    parser.add_argument("--param", type=_parse_param, action="append", default=[], metavar="NAME=V1,V2",
+                        help=f"values to search for one of {', '.join(PARAM_SPACE)} (others keep the default grid)")
+    parser.add_argument("--random", type=int, metavar="N", help="sample N configs instead of the full grid")
+    parser.add_argument("--episodes", type=int, default=200, help="training episodes per config")
+    parser.add_argument("--match-episodes", type=int, default=50, help="episodes per tournament pairing")
+    parser.add_argument("--agents", type=int, default=3, help="bidders per training auction")
+    parser.add_argument("--rounds", type=int, default=5, help="rounds per episode")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--out", default="sweep_results.csv")
+    args = parser.parse_args()
+
+    space = {**PARAM_SPACE, **dict(args.param)}
+    configs = random_configs(space, args.random, args.seed) if args.random else grid_configs(space)
+    results = run_sweep(configs, episodes=args.episodes, match_episodes=args.match_episodes,
+                        num_agents=args.agents, rounds=args.rounds, seed=args.seed, workers=args.workers)
+    write_results(results, args.out)
+
+    print(f"{'run':>4} {'lr':>8} {'gamma':>6} {'eps_dec':>8} {'batch':>5} {'target':>6} "
+          f"{'steps/s':>8} {'train_r':>8} {'tourn_r':>8} {'win%':>6}")
+    for r in results:
+        print(f"{r['run']:>4} {r['lr']:>8g} {r['gamma']:>6g} {r['epsilon_decay']:>8g} {r['batch_size']:>5} "
+              f"{r['target_update_freq']:>6} {r['steps_per_sec']:>8.0f} {r['train_reward_mean']:>8.2f} "
+              f"{r['tournament_reward_mean']:>8.2f} {100 * r['tournament_win_rate']:>6.1f}")
+    print(f"📄 Wrote {len(results)} rows to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
-from flask import Blueprint, jsonify
-from backend.routes.auction_routes import initialize_user_agents, user_agents
+from flask import Blueprint
+from backend.routes.auction_routes import agents_for_user
+from backend.utils.serialization import encode_response
 
 agent_bp = Blueprint('agent_bp', __name__)
 
@@ -8,7 +9,4 @@ def get_agents(user_id):
     """
     Get AI agents for a specific user.
     """
-    initialize_user_agents(user_id)
-    if user_id in user_agents:
-        return jsonify({'agents': list(user_agents[user_id].values())}), 200
-    return jsonify({'agents': []}), 200
+    return encode_response({'agents': agents_for_user(user_id)})
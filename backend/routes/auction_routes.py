@@ -1,28 +1,163 @@
 # backend/routes/auction_routes.py
 from flask import Blueprint, request, jsonify
 from backend.models.dqn_agent import DQNAgent
+from backend.models.clearing import clear_lots
+from backend.models.records import Auction, Bid
+from backend.models.decision_cache import open_decision_cache
+from backend.models.online_learner import open_online_learner, outcome_reward
 import numpy as np
-import time
+import copy
+import os
 import threading
+import time
 from uuid import uuid4
 import torch
-from datetime import datetime
 
 auction_bp = Blueprint('auction_bp', __name__)
-from backend.utils.supabase_client import supabase
+from backend.storage.repository import create_repository
 from backend.utils.auth_middleware import require_auth
+from backend.utils.admission import admission_controlled, open_admission_controller, open_ai_bid_admission
+from backend.utils.concurrency import run_blocking
+from backend.utils.clock import WallClock
+from backend.utils.emitter import EmitAggregator, open_emitter
+from backend.utils.budget_ledger import BudgetLedger
+from backend.utils.serialization import encode_response
+from backend.utils.auction_store import open_auction_store
+from backend.utils import metrics
+from backend.utils.coalescer import RequestCoalescer
+from backend.utils.bid_journal import (
+    open_journal, REC_AUCTION, REC_BID, REC_STATUS, REC_PARTICIPANT, REC_BUDGET,
+)
 
 
 
 # ----------------------------
 # In-memory stores
 # ----------------------------
-auctions = {}
+# Live auctions stay in memory; completed ones age out through a bounded LRU
+# into the cold tier and are read back through the repository on lookup (see utils/auction_store.py).
+auctions = open_auction_store(loader=lambda auction_id: repository.load_auction(auction_id))
+metrics.register('auction_store', lambda: {**auctions.stats, **auctions.tier_sizes()})
 user_agents = {}
 running_threads = set() # Track active auction threads
 
+# Bid history page size for /get-auction/<id>/bids
+BID_PAGE_DEFAULT = 50
+BID_PAGE_MAX = 500
+
+# Auctions, bids and agent budgets are persisted through this (PERSISTENCE_BACKEND)
+repository = create_repository()
+
+# Local append-only journal of auction mutations (None unless BID_JOURNAL_DIR is set)
+journal = open_journal()
+JOURNAL_SNAPSHOT_SECONDS = float(os.environ.get("BID_JOURNAL_SNAPSHOT_SECONDS", 60))
+
+# Bid round cadence: BID_ROUND_SECONDS normally, shrinking linearly towards
+# BID_ROUND_MIN_SECONDS over the last BID_ROUND_RAMP_SECONDS before endTime.
+BID_ROUND_SECONDS = float(os.environ.get("BID_ROUND_SECONDS", 4))
+BID_ROUND_MIN_SECONDS = float(os.environ.get("BID_ROUND_MIN_SECONDS", BID_ROUND_SECONDS))
+BID_ROUND_RAMP_SECONDS = float(os.environ.get("BID_ROUND_RAMP_SECONDS", 20))
+
+# Sealed-bid formats and the pricing rule each clears with; 'english' is the ascending default
+SEALED_FORMATS = {'sealed': 'first_price', 'vickrey': 'second_price'}
+AUCTION_FORMATS = ('english',) + tuple(SEALED_FORMATS)
+SEALED_CLEARING_SECONDS = float(os.environ.get("SEALED_CLEARING_SECONDS", 1))
+_sealed_clearing_started = False
+
+# Auctions whose bidding loop is parked because nobody can bid, and the
+# events used to wake a loop early (new participant, budget change)
+parked_auctions = set()
+_parked_by_agent = {}  # agent id -> parked auction ids it takes part in
+_wake_events = {}
+
+# Budget holds for standing bids across all auctions, and agent id -> (user_id, agent)
+ledger = BudgetLedger()
+# Held while a bid round commits or an auction is closed: a round re-checks the auction
+# under it after inference, so it can't land on a closed lot or below a newer bid
+_commit_lock = threading.Lock()
+agent_index = {}
+
+
+def _socketio_sleep(seconds):
+    from backend.app import socketio
+    socketio.sleep(seconds)
+
+
+# Time source and event sink for the bid engine; backend/simulation.py swaps these
+# for a virtual clock and a no-op emitter to run auctions faster than real time.
+clock = WallClock(sleep=_socketio_sleep)
+# Batches room events per EMIT_COALESCE_MS window when set (see utils/emitter.py)
+emitter = open_emitter()
+if isinstance(emitter, EmitAggregator):
+    metrics.register('emit', lambda: dict(emitter.stats))
+
 # Instantiate a single DQNAgent for inference on the server (force CPU)
 dqn_agent = DQNAgent(agent_id='dqn1', state_size=4, action_size=10, device=torch.device("cpu"))
+# Exploration rate while serving; unset keeps the agent's own epsilon. The decision
+# cache only helps greedy decisions, so pair it with a low SERVING_EPSILON.
+if os.environ.get("SERVING_EPSILON"):
+    dqn_agent.epsilon = float(os.environ["SERVING_EPSILON"])
+elif os.environ.get("ONLINE_LEARNING") == "1":
+    # the learner process does the exploring-free updates; serve its policy greedily
+    dqn_agent.epsilon = 0.0
+
+# Live bid decisions and outcomes stream to a background learner process whose
+# weights are swapped into dqn_agent periodically; None unless ONLINE_LEARNING=1
+online_learner = open_online_learner(dqn_agent)
+if online_learner:
+    metrics.register('online_learner', online_learner.snapshot)
+ONLINE_POLL_SECONDS = float(os.environ.get("ONLINE_POLL_SECONDS", 1))
+
+# Greedy decisions for recently seen (quantized) states skip the forward pass; None when disabled
+decision_cache = open_decision_cache()
+if decision_cache:
+    metrics.register('decision_cache', decision_cache.snapshot)
+
+
+def model_decisions(states):
+    """(actions, bid_amounts) for [N, 4] states from one model call, through the decision cache if enabled."""
+    if decision_cache is None:
+        return dqn_agent.act_batch(states)
+    return decision_cache.act_batch(dqn_agent, states)
+
+
+def model_decision(state):
+    """(action, bid_amount) for one state; the single-state counterpart of model_decisions."""
+    if decision_cache is None:
+        return dqn_agent.act(state)
+    return decision_cache.act(dqn_agent, state)
+
+
+# /ai-bid requests arriving within AI_BID_COALESCE_MS share one forward pass
+AI_BID_STATE_FIELDS = ('current_price', 'increment', 'remaining_budget', 'time_left')
+AI_BID_MAX_BATCH = int(os.environ.get("AI_BID_MAX_BATCH", 1024))
+decision_coalescer = RequestCoalescer(
+    lambda states: run_blocking(model_decisions, states),
+    window_ms=float(os.environ.get("AI_BID_COALESCE_MS", 2)),
+    max_batch=AI_BID_MAX_BATCH,
+)
+metrics.register('ai_bid', lambda: dict(decision_coalescer.stats))
+
+# /ai-bid needs no login, so each client address is charged one token per state and a
+# batch may carry at most AI_BID_MAX_STATES rows
+AI_BID_MAX_STATES = int(os.environ.get("AI_BID_MAX_STATES", 64))
+ai_bid_admission = open_ai_bid_admission()
+metrics.register('ai_bid_admission', ai_bid_admission.snapshot)
+
+
+def _ai_bid_client(data):
+    return request.remote_addr
+
+
+def _ai_bid_cost(data):
+    states = data.get('states')
+    # oversized batches are refused with 413 before any inference, so they cost one token
+    return len(states) if isinstance(states, list) and 0 < len(states) <= AI_BID_MAX_STATES else 1
+
+# Per-user / per-auction rate limits and an in-flight cap for endpoints that run
+# bid rounds in the request (/start, /simulate-bid); see utils/admission.py
+admission = open_admission_controller()
+metrics.register('admission', admission.snapshot)
 
 
 # ----------------------------
@@ -60,6 +195,42 @@ def initialize_user_agents(user_id):
                 "strategyType": "reinforcement_learning",
             },
         }
+        register_user_agents(user_id)
+
+
+def register_user_agents(user_id):
+    """Index a user's agents by id and open their ledger accounts."""
+    for agent in user_agents[user_id].values():
+        agent_index[agent['id']] = (user_id, agent)
+        ledger.open_account(agent['id'], agent['budget'], spent=agent['totalSpent'])
+
+
+def agents_for_user(user_id):
+    """A user's agents as returned by the API, with the balance not committed to standing bids."""
+    initialize_user_agents(user_id)
+    return [{**agent, 'availableBudget': ledger.available(agent['id'])}
+            for agent in user_agents[user_id].values()]
+
+
+def new_auction(auction_id, data, now_ms):
+    """Build the in-memory auction record from a create request payload."""
+    return Auction(
+        auction_id,
+        title=data.get('title'),
+        description=data.get('description'),
+        starting_price=float(data.get('startingPrice', 0)),
+        reserve_price=float(data.get('reservePrice', 0)),
+        increment=float(data.get('increment', 1)),
+        format=data.get('format', 'english'),
+        start_time=now_ms,
+        end_time=now_ms + float(data.get('duration', 60)) * 1000,
+    )
+
+
+def start_bidding_task(auction_id):
+    """Spawn the auto-bidding loop on the SocketIO server's task runner (thread or greenlet)."""
+    from backend.app import socketio
+    socketio.start_background_task(run_auto_bidding, auction_id)
 
 
 # ----------------------------
@@ -70,53 +241,21 @@ def initialize_user_agents(user_id):
 def create_auction():
     data = request.get_json()
     print(f"📝 Received create_auction request: {data}")
+    if data.get('format', 'english') not in AUCTION_FORMATS:
+        return jsonify({'error': f"Unknown auction format, expected one of {list(AUCTION_FORMATS)}"}), 400
     auction_id = str(uuid4())
 
-    auctions[auction_id] = {
-        'id': auction_id,
-        'title': data.get('title'),
-        'description': data.get('description'),
-        'startingPrice': float(data.get('startingPrice', 0)),
-        'reservePrice': float(data.get('reservePrice', 0)),
-        'increment': float(data.get('increment', 1)),
-        'startTime': time.time() * 1000,
-        'endTime': time.time() * 1000 + float(data.get('duration', 60)) * 1000,
-        'currentPrice': float(data.get('startingPrice', 0)),
-        'status': 'pending',
-        'participants': [],
-        'selectedAgents': {},  # userId → agentId
-        'bids': [],
-        'winnerId': None,
-        'winnerName': None,
-        'winnerType': None,
-        'winningPrice': None,
-    }
+    auctions[auction_id] = new_auction(auction_id, data, clock.now_ms())
 
     print(f"✅ Auction {auction_id} created in memory. Total auctions: {len(auctions)}")
+    if journal:
+        journal.record_auction(auctions[auction_id].to_dict(include_bids=False))
     
-    # Persist to Supabase using User Token (RLS)
+    # Persist with the creator's token so Supabase RLS applies
     token = request.headers.get("Authorization").split(" ")[1]
-    from backend.utils.supabase_client import get_authenticated_client
-    
-    try:
-        auth_client = get_authenticated_client(token)
-        print(f"💾 Persisting auction {auction_id} to Supabase (User Context)...")
-        auth_client.table('auctions').insert({
-            'id': auction_id,
-            'title': data.get('title'),
-            'description': data.get('description'),
-            'starting_price': float(data.get('startingPrice', 0)),
-            'current_price': float(data.get('startingPrice', 0)),
-            'status': 'pending',
-            'start_time': datetime.fromtimestamp(auctions[auction_id]['startTime']/1000).isoformat(),
-            'end_time': datetime.fromtimestamp(auctions[auction_id]['endTime']/1000).isoformat(),
-            'created_by': data.get('created_by')
-        }).execute()
-        print(f"✅ Auction {auction_id} persisted to Supabase.")
-    except Exception as e:
-        print(f"❌ Error creating auction in Supabase: {e}")
+    repository.create_auction(auctions[auction_id], created_by=data.get('created_by'), token=token)
 
-    return jsonify({'auction': auctions[auction_id]}), 201
+    return jsonify({'auction': auctions[auction_id].to_dict()}), 201
 
 
 # ----------------------------
@@ -125,11 +264,47 @@ def create_auction():
 @auction_bp.route('/get-auction', methods=['GET'])
 def get_auctions():
     # print(f"🔍 get_auctions called. Total in memory: {len(auctions)}")
-    current_time = time.time() * 1000
+    current_time = clock.now_ms()
     for auction in list(auctions.values()):
-        if auction['status'] == 'active' and current_time >= auction['endTime']:
-            finalize_auction(auction['id'])
-    return jsonify({'auctions': list(auctions.values())}), 200
+        if auction.status == 'active' and current_time >= auction.end_time:
+            finalize_auction(auction.id)
+    return encode_response({'auctions': [a.to_dict() for a in list(auctions.values())]})
+
+
+@auction_bp.route('/get-auction/<auction_id>', methods=['GET'])
+def get_auction(auction_id):
+    # reads through to the cold tier for auctions evicted from memory
+    auction = auctions.get(auction_id)
+    if auction is None:
+        return jsonify({'error': 'Auction not found'}), 404
+    return encode_response({'auction': auction.to_dict()})
+
+
+@auction_bp.route('/get-auction/<auction_id>/bids', methods=['GET'])
+def get_auction_bids(auction_id):
+    """
+    Full bid history, oldest first, in keyset pages:
+    ?limit=50&after_ts=<timestamp>&after_id=<bid id> with the cursor taken from `nextCursor`.
+    Live payloads only carry the last BID_WINDOW bids.
+    """
+    try:
+        limit = min(max(int(request.args.get('limit', BID_PAGE_DEFAULT)), 1), BID_PAGE_MAX)
+        after_ts = request.args.get('after_ts')
+        after_ts = float(after_ts) if after_ts is not None else None
+    except ValueError:
+        return jsonify({'error': 'Invalid pagination parameters'}), 400
+    after_id = request.args.get('after_id')
+
+    # evicted auctions come back through the cold tier / repository
+    auction = auctions.get(auction_id)
+    if auction is None:
+        return jsonify({'error': 'Auction not found'}), 404
+
+    page = auction.bids_page(after_ts, after_id, limit)
+    next_cursor = None
+    if len(page) == limit:
+        next_cursor = {'afterTs': page[-1]['timestamp'], 'afterId': page[-1]['id']}
+    return encode_response({'bids': page, 'bidCount': auction.bid_count, 'nextCursor': next_cursor})
 
 
 # ----------------------------
@@ -137,8 +312,7 @@ def get_auctions():
 # ----------------------------
 @auction_bp.route('/get-agents/<user_id>', methods=['GET'])
 def get_user_agents(user_id):
-    initialize_user_agents(user_id)
-    return jsonify({'agents': list(user_agents[user_id].values())}), 200
+    return encode_response({'agents': agents_for_user(user_id)})
 
 
 # ----------------------------
@@ -146,6 +320,7 @@ def get_user_agents(user_id):
 # ----------------------------
 @auction_bp.route('/start', methods=['POST'])
 @require_auth
+@admission_controlled(admission)
 def start_auction():
     data = request.get_json()
     auction_id = data.get('auction_id')
@@ -155,121 +330,199 @@ def start_auction():
     if not all([auction_id, user_id, selected_agent]):
         return jsonify({'error': 'Missing parameters'}), 400
 
-    if auction_id not in auctions:
+    auction = auctions.peek(auction_id)
+    if auction is None:
         return jsonify({'error': 'Auction not found'}), 404
 
     initialize_user_agents(user_id)
-    auction = auctions[auction_id]
     
     # Update participants
-    auction['selectedAgents'][user_id] = selected_agent
-    if user_id not in auction['participants']:
-        auction['participants'].append(user_id)
+    auction.selected_agents[user_id] = selected_agent
+    if user_id not in auction.participants:
+        auction.participants.append(user_id)
+    if journal:
+        journal.record_participant(auction_id, user_id, selected_agent)
+    wake_auction(auction_id)
 
     # If auction was pending, activate it
-    if auction['status'] == 'pending':
-        auction['status'] = 'active'
-        auction['startTime'] = time.time() * 1000
+    if auction.status == 'pending':
+        auction.status = 'active'
+        auction.start_time = clock.now_ms()
         print(f"🎬 Auction {auction_id} started by {user_id}")
+        if journal:
+            journal.record_status(auction_id, 'active', auction.start_time)
         
-        # Update Supabase status
-        if supabase:
-            try:
-                supabase.table('auctions').update({'status': 'active'}).eq('id', auction_id).execute()
-            except Exception as e:
-                print(f"Error updating status: {e}")
+        repository.update_status(auction_id, 'active')
 
+    # Sealed-bid lots have no rounds; the shared clearing loop closes them at endTime
+    if auction.format in SEALED_FORMATS:
+        if auction.status == 'active':
+            ensure_sealed_clearing_task()
     # Ensure thread is running if active
-    if auction['status'] == 'active' and auction_id not in running_threads:
+    elif auction.status == 'active' and auction_id not in running_threads:
         print(f"🔄 Restarting bidding thread for {auction_id}")
-        threading.Thread(target=run_auto_bidding, args=(auction_id,), daemon=True).start()
+        start_bidding_task(auction_id)
         
         # Trigger an initial simulated bid
         simulate_single_bid(auction_id)
 
     # Emit auction_update to interested clients
-    from backend.app import socketio
-    socketio.emit('auction_update', {'auction': auction}, room=f'auction_{auction_id}')
+    payload = auction.to_dict()
+    emitter.emit('auction_update', {'auction': payload}, room=f'auction_{auction_id}')
 
-    return jsonify({'auction': auction}), 200
+    return jsonify({'auction': payload}), 200
 
 
 # ----------------------------
 # Auto Bidding Thread
 # ----------------------------
+def round_delay(auction, now_ms):
+    """Seconds until the next bid round: faster as endTime approaches, never past endTime."""
+    time_left = max(0.0, (auction.end_time - now_ms) / 1000)
+    delay = BID_ROUND_SECONDS
+    if BID_ROUND_RAMP_SECONDS > 0 and time_left < BID_ROUND_RAMP_SECONDS:
+        delay = BID_ROUND_MIN_SECONDS + (BID_ROUND_SECONDS - BID_ROUND_MIN_SECONDS) * time_left / BID_ROUND_RAMP_SECONDS
+    return min(delay, time_left)
+
+
+def wake_auction(auction_id):
+    """Cut a parked (or sleeping) bidding loop short so it re-checks eligibility now."""
+    event = _wake_events.get(auction_id)
+    if event:
+        event.set()
+
+
+def notify_budget_change(agent_id):
+    """Wake parked auctions this agent takes part in; its eligibility may have changed."""
+    for auction_id in list(_parked_by_agent.get(agent_id, ())):
+        wake_auction(auction_id)
+
+
+def _park(auction):
+    parked_auctions.add(auction.id)
+    for agent_id in auction.selected_agents.values():
+        _parked_by_agent.setdefault(agent_id, set()).add(auction.id)
+
+
+def _unpark(auction):
+    if auction.id not in parked_auctions:
+        return
+    parked_auctions.discard(auction.id)
+    for agent_id in auction.selected_agents.values():
+        waiting = _parked_by_agent.get(agent_id)
+        if waiting is not None:
+            waiting.discard(auction.id)
+            if not waiting:
+                del _parked_by_agent[agent_id]
+
+
 def run_auto_bidding(auction_id):
-    """Automatically triggers bidding every few seconds within app context."""
-    # Import socketio and flask app lazily to avoid circular import on module load
-    from backend.app import socketio, app as flask_app
+    """
+    Run bid rounds for an active auction within app context and close it at endTime.
+    When no participant can bid the loop parks until woken or the deadline instead of
+    running empty rounds.
+    """
+    # Import flask app lazily to avoid circular import on module load
+    from backend.app import app as flask_app
     
     running_threads.add(auction_id)
+    wake = _wake_events.setdefault(auction_id, threading.Event())
     print(f"🧵 Thread started for {auction_id}")
 
     with flask_app.app_context():
         # loop only while auction exists and is active
-        while auction_id in auctions and auctions[auction_id]['status'] == 'active':
+        while True:
+            auction = auctions.peek(auction_id)
+            if auction is None or auction.status != 'active':
+                break
             try:
-                # simulate_single_bid will perform the bid and emit
-                simulate_single_bid(auction_id)
-                time.sleep(4)
+                now = clock.now_ms()
+                if now >= auction.end_time:
+                    finalize_auction(auction_id)
+                    break
+
+                # clear before checking so a wake during the check isn't lost
+                wake.clear()
+                if eligible_agents(auction):
+                    _unpark(auction)
+                    # simulate_single_bid will perform the bid and emit
+                    simulate_single_bid(auction_id)
+                    clock.wait(wake, round_delay(auction, clock.now_ms()))
+                else:
+                    _park(auction)
+                    clock.wait(wake, max(0.0, (auction.end_time - now) / 1000))
             except Exception as e:
                 print(f"⚠️ Auto-bidding error: {e}")
                 break
     
+    auction = auctions.peek(auction_id)
+    if auction is not None:
+        _unpark(auction)
+    parked_auctions.discard(auction_id)
+    _wake_events.pop(auction_id, None)
     running_threads.discard(auction_id)
     print(f"🧵 Thread stopped for {auction_id}")
 
 
+def eligible_agents(auction):
+    """Participants that could place a bid in the next round, as (user_id, agent) pairs."""
+    participants = auction.selected_agents
+    last_bidder = auction.last_bidder
+    min_bid = auction.current_price + auction.increment
+
+    eligible = []
+    for user_id, agent_id in participants.items():
+        initialize_user_agents(user_id)
+
+        # Find correct agent object by its id
+        entry = agent_index.get(agent_id)
+        if not entry or entry[0] != user_id:
+            print(f"⚠️ Agent not found for user {user_id}: {agent_id}")
+            continue
+        agent = entry[1]
+
+        # skip self-rebidding, or agents whose uncommitted budget can't cover the minimum raise
+        # (a single participant bids once to start, but never against itself)
+        if agent['id'] == last_bidder or ledger.available_for(agent_id, auction.id) < min_bid:
+            continue
+        eligible.append((user_id, agent))
+    return eligible
+
+
 # ----------------------------
 # Single Bid Simulation Logic
 # ----------------------------
 def simulate_single_bid(auction_id):
-    """Perform one DQN-based bid simulation round and emit results via socketio."""
-    if auction_id not in auctions:
+    """Perform one DQN-based bid simulation round and emit results via the configured emitter."""
+    auction = auctions.peek(auction_id)
+    if auction is None:
         return None
-    auction = auctions[auction_id]
-    if auction['status'] != 'active':
+    if auction.status != 'active' or auction.format in SEALED_FORMATS:
         return None
 
-    participants = auction['selectedAgents']
-    if not participants:
+    if not auction.selected_agents:
         return None
 
-    highest_bid = auction['currentPrice']
-    last_bidder = auction['bids'][-1]['bidderId'] if auction['bids'] else None
-
+    highest_bid = auction.current_price
+    bid_count = auction.bid_count
     best_agent = None
     best_bid = highest_bid
 
-    for user_id, agent_id in participants.items():
-        initialize_user_agents(user_id)
-        agents = user_agents[user_id]
-
-        # Find correct agent object by its id
-        agent = next((a for a in agents.values() if a['id'] == agent_id), None)
-        if not agent:
-            print(f"⚠️ Agent not found for user {user_id}: {agent_id}")
-            continue
-
-        # skip self-rebidding or insufficient funds
-        if agent['id'] == last_bidder or agent['remainingBudget'] <= highest_bid:
-            continue
-
-        # if only one participant and initial bid placed → stop
-        # (Allow single agent to bid once to start, but not bid against self)
-        if len(participants) == 1 and auction['bids'] and last_bidder == agent['id']:
-            continue
-
+    for user_id, agent in eligible_agents(auction):
+        budget = ledger.available_for(agent['id'], auction_id)
         state = np.array([
             highest_bid,
-            auction['increment'],
-            agent['remainingBudget'],
-            max(0, auction['endTime'] - time.time() * 1000)
+            auction.increment,
+            budget,
+            max(0, auction.end_time - clock.now_ms())
         ], dtype=np.float32)
 
-        _, bid_amount = dqn_agent.act(state)
+        # Inference is CPU-bound; keep it off the event loop
+        action, bid_amount = run_blocking(model_decision, state)
+        if online_learner:
+            online_learner.record(auction_id, agent['id'], state, action)
         # Ensure bid respects increment and budget
-        bid_amount = max(highest_bid + auction['increment'], min(agent['remainingBudget'], bid_amount))
+        bid_amount = max(highest_bid + auction.increment, min(budget, bid_amount))
 
         if bid_amount > best_bid:
             best_bid = bid_amount
@@ -277,49 +530,40 @@ def simulate_single_bid(auction_id):
 
     if best_agent:
         user_id, agent = best_agent
-        bid_obj = {
-            'id': str(uuid4()),
-            'bidderId': agent['id'],
-            'bidderName': agent['name'],
-            'bidderType': agent['strategyType'],
-            'amount': best_bid,
-            'timestamp': time.time() * 1000
-        }
-
-        # Update auction state
-        auction['bids'].append(bid_obj)
-        auction['currentPrice'] = best_bid
+        with _commit_lock:
+            # inference yielded: another round or the close may have moved the auction on
+            if (auction.status != 'active' or auction.current_price != highest_bid
+                    or auction.bid_count != bid_count):
+                return None
+            # Reserve the standing bid; another auction may have committed the balance meanwhile
+            if not ledger.hold(agent['id'], auction_id, best_bid):
+                return None
+            outbid = auction.last_bidder
+            if outbid:
+                ledger.release(outbid, auction_id)
+            bid = Bid(str(uuid4()), agent['id'], agent['name'], agent['strategyType'], best_bid, clock.now_ms())
+            # Update auction state
+            auction.add_bid(bid)
+            auction.current_price = best_bid
+        if outbid:
+            notify_budget_change(outbid)
+        bid_obj = bid.to_dict()
         print(f"🤖 {agent['name']} placed ${best_bid:.2f}")
+        if journal:
+            journal.record_bid(auction_id, bid_obj)
 
-        # Persist bid to Supabase
-        if supabase:
-            try:
-                supabase.table('bids').insert({
-                    'id': bid_obj['id'],
-                    'auction_id': auction_id,
-                    'bidder_id': agent['id'],
-                    'amount': best_bid,
-                    'created_at': datetime.fromtimestamp(bid_obj['timestamp']/1000).isoformat()
-                }).execute()
-                
-                supabase.table('auctions').update({
-                    'current_price': best_bid
-                }).eq('id', auction_id).execute()
-            except Exception as e:
-                print(f"Error persisting bid: {e}")
+        repository.record_bid(auction_id, bid)
 
 
-        # Emit through socketio lazily (avoid top-level import)
-        from backend.app import socketio
         room = f'auction_{auction_id}'
 
         # Emit a minimal bid_update message (preferred)
-        socketio.emit('bid_update', {'auction_id': auction_id, 'bid': bid_obj}, room=room)
+        emitter.emit('bid_update', {'auction_id': auction_id, 'bid': bid_obj}, room=room)
 
         # Also emit full auction_update so frontends that prefer the whole object can sync
-        socketio.emit('auction_update', {'auction': auction}, room=room)
+        emitter.emit('auction_update', {'auction': auction.to_dict()}, room=room)
 
-        return bid_obj
+        return bid
 
     return None
 
@@ -329,153 +573,420 @@ def simulate_single_bid(auction_id):
 # ----------------------------
 @auction_bp.route('/simulate-bid', methods=['POST'])
 @require_auth
+@admission_controlled(admission)
 def simulate_bid_route():
     data = request.get_json() or {}
     auction_id = data.get('auction_id')
     if not auction_id:
         return jsonify({'error': 'Missing auction_id'}), 400
 
-    if auction_id not in auctions:
+    auction = auctions.peek(auction_id)
+    if auction is None:
         return jsonify({'error': 'Auction not found'}), 404
 
-    bid_obj = simulate_single_bid(auction_id)
-    if bid_obj:
-        return jsonify({'success': True, 'bid': bid_obj, 'auction': auctions[auction_id]}), 200
+    bid = simulate_single_bid(auction_id)
+    if bid:
+        return jsonify({'success': True, 'bid': bid.to_dict(), 'auction': auction.to_dict()}), 200
     else:
         return jsonify({'success': False, 'message': 'No bid was placed'}), 200
 
 
+# ----------------------------
+# AI Bid Decisions (stateless model inference for clients)
+# ----------------------------
+def _state_row(state):
+    """[current_price, increment, remaining_budget, time_left] from a request state; raises on bad input."""
+    if not isinstance(state, dict):
+        raise ValueError("each state must be an object")
+    try:
+        return [float(state[field]) for field in AI_BID_STATE_FIELDS]
+    except KeyError as e:
+        raise ValueError(f"missing {e.args[0]}")
+    except (TypeError, ValueError):
+        raise ValueError("state fields must be numbers")
+
+
+def decide_bids(states):
+    """Actions and bid amounts for many states from one (coalesced) model call."""
+    rows = np.array([_state_row(s) for s in states], dtype=np.float32).reshape(-1, len(AI_BID_STATE_FIELDS))
+    actions, amounts = decision_coalescer.submit(rows)
+    return [{'agent_id': s.get('agent_id'), 'action': int(a), 'bid_amount': float(b)}
+            for s, a, b in zip(states, actions, amounts)]
+
+
+@auction_bp.route('/ai-bid', methods=['POST'])
+@admission_controlled(ai_bid_admission, key=_ai_bid_client)
+def ai_bid():
+    data = request.get_json() or {}
+    state = data.get('auction_state')
+    if not isinstance(state, dict):
+        return jsonify({'error': 'auction_state must be an object'}), 400
+    try:
+        [decision] = decide_bids([{**state, 'agent_id': data.get('agent_id')}])
+    except ValueError as e:
+        return jsonify({'error': f"Invalid auction_state: {e}"}), 400
+    return jsonify(decision), 200
+
+
+@auction_bp.route('/ai-bid/batch', methods=['POST'])
+@admission_controlled(ai_bid_admission, key=_ai_bid_client, cost=_ai_bid_cost)
+def ai_bid_batch():
+    """
+    Body: {"states": [{agent_id?, current_price, increment, remaining_budget, time_left}, ...]}
+    Returns {"decisions": [{agent_id, action, bid_amount}, ...]} in the same order.
+    """
+    data = request.get_json() or {}
+    states = data.get('states')
+    if not isinstance(states, list) or not states:
+        return jsonify({'error': 'states must be a non-empty list'}), 400
+    if len(states) > AI_BID_MAX_STATES:
+        return jsonify({'error': f'At most {AI_BID_MAX_STATES} states per request'}), 413
+    try:
+        decisions = decide_bids(states)
+    except ValueError as e:
+        return jsonify({'error': f"Invalid state: {e}"}), 400
+    return encode_response({'decisions': decisions})
+
+
 # ----------------------------
 # Finalize Auction
 # ----------------------------
 def finalize_auction(auction_id):
     """Marks auction as completed and updates winner budgets."""
-    if auction_id not in auctions:
+    auction = auctions.peek(auction_id)
+    if auction is None:
+        return
+    if auction.status == 'completed':
+        # both the bidding loop and get_auctions close auctions at endTime
+        return
+    if auction.format in SEALED_FORMATS:
+        # due sealed lots are cleared together by run_sealed_clearing, never one at a time here
+        ensure_sealed_clearing_task()
         return
-    auction = auctions[auction_id]
-    auction['status'] = 'completed'
 
-    if not auction['bids']:
-        auction['winnerName'] = 'No Bids'
-        auction['winnerType'] = None
-        auction['winningPrice'] = 0
+    with _commit_lock:
+        if auction.status == 'completed':
+            return
+        # closed here so a round still in inference can't commit afterwards
+        auction.status = 'completed'
+        # running aggregate, no scan over the bid history
+        highest_bid = auction.top_bid()
+    complete_auction(auction, highest_bid, highest_bid.amount if highest_bid else 0)
+
+
+def complete_auction(auction, winning_bid, price):
+    """Close the auction with `winning_bid` (or None) paying `price`, debit the winner and notify clients."""
+    auction_id = auction.id
+    auction.status = 'completed'
+
+    if winning_bid is None:
+        auction.winner_name = 'No Bids'
+        auction.winner_type = None
+        auction.winning_price = 0
+        for agent_id in ledger.release_auction(auction_id):
+            notify_budget_change(agent_id)
+        if journal:
+            journal.record_auction(auction.to_dict(include_bids=False))
+        if online_learner:
+            online_learner.finish(auction_id)
 
         # emit completion to room
-        from backend.app import socketio
-        socketio.emit('auction_complete', {'auction': auction}, room=f'auction_{auction_id}')
+        emitter.emit('auction_complete', {'auction': auction.to_dict()}, room=f'auction_{auction_id}')
+        auctions.retire(auction_id)
         return
 
-    highest_bid = max(auction['bids'], key=lambda b: b['amount'])
-    auction['winnerId'] = highest_bid['bidderId']
-    auction['winnerName'] = highest_bid['bidderName']
-    auction['winnerType'] = highest_bid.get('bidderType')
-    auction['winningPrice'] = highest_bid['amount']
+    auction.winner_id = winning_bid.bidder_id
+    auction.winner_name = winning_bid.bidder_name
+    auction.winner_type = winning_bid.bidder_type
+    auction.winning_price = price
+
+    # Convert the winner's hold into a debit
+    winner_id = winning_bid.bidder_id
+    ledger.settle(winner_id, auction_id, price)
+    entry = agent_index.get(winner_id)
+    if entry:
+        user_id, agent = entry
+        acct = ledger.account(winner_id)
+        agent['remainingBudget'] = acct.budget - acct.spent
+        agent['totalSpent'] = acct.spent
+        if journal:
+            journal.record_budget(user_id, agent)
+        repository.save_agent(user_id, agent)
+    notify_budget_change(winner_id)
+    # nobody else keeps a hold on a closed auction
+    for agent_id in ledger.release_auction(auction_id):
+        notify_budget_change(agent_id)
+    if journal:
+        journal.record_auction(auction.to_dict(include_bids=False))
+    if online_learner:
+        acct = ledger.account(winner_id)
+        online_learner.finish(auction_id, winner_id, outcome_reward(price, acct.budget if acct else 0.0))
+
+    print(f"🏁 Auction {auction_id} completed. Winner: {auction.winner_name} (${auction.winning_price})")
+
+    repository.complete_auction(auction)
+
+
+    emitter.emit('auction_complete', {'auction': auction.to_dict()}, room=f'auction_{auction_id}')
+    auctions.retire(auction_id)
 
-    # Deduct from winning agent
-    for user_id, agents in user_agents.items():
-        for agent in agents.values():
-            if agent['id'] == highest_bid['bidderId']:
-                agent['remainingBudget'] -= highest_bid['amount']
-                agent['totalSpent'] += highest_bid['amount']
 
-    print(f"🏁 Auction {auction_id} completed. Winner: {auction['winnerName']} (${auction['winningPrice']})")
+# ----------------------------
+# Sealed-Bid Clearing
+# ----------------------------
+def ensure_sealed_clearing_task():
+    """Start the shared sealed-bid clearing loop once per process."""
+    global _sealed_clearing_started
+    if _sealed_clearing_started:
+        return
+    _sealed_clearing_started = True
+    from backend.app import socketio
+    socketio.start_background_task(run_sealed_clearing)
 
-    # Update Supabase
-    if supabase:
-        try:
-            update_data = {
-                'status': 'completed',
-                'winner_id': auction['winnerId'] if auction['winnerId'] else None
-            }
-            supabase.table('auctions').update(update_data).eq('id', auction_id).execute()
-        except Exception as e:
-            print(f"Error finalizing auction in Supabase: {e}")
 
+def run_sealed_clearing():
+    """Every tick, clear all sealed-bid lots that reached endTime in one vectorised pass."""
+    from backend.app import app as flask_app
+    with flask_app.app_context():
+        while True:
+            try:
+                now = clock.now_ms()
+                due = [a.id for a in list(auctions.values())
+                       if a.status == 'active' and a.format in SEALED_FORMATS and now >= a.end_time]
+                if due:
+                    clear_sealed_auctions(due)
+            except Exception as e:
+                print(f"⚠️ Sealed clearing error: {e}")
+            clock.sleep(SEALED_CLEARING_SECONDS)
+
+
+def clear_sealed_auctions(auction_ids):
+    """
+    Close sealed-bid lots together. Every eligible (lot, agent) pair submits one sealed bid
+    from a single batched DQN call, then clear_lots resolves the [lots, bidders] matrix with
+    reserves, shared agent budgets and random tie-breaking.
+    """
+    lots_by_rule = {}
+    for auction_id in auction_ids:
+        auction = auctions.peek(auction_id)
+        if auction and auction.status == 'active' and auction.format in SEALED_FORMATS:
+            lots_by_rule.setdefault(SEALED_FORMATS[auction.format], []).append(auction)
+
+    for pricing, lots in lots_by_rule.items():
+        bidders = []          # (user_id, agent) per matrix column
+        column = {}           # agent id -> column
+        rows, cols, states = [], [], []
+        for i, auction in enumerate(lots):
+            for user_id, agent in eligible_agents(auction):
+                if agent['id'] not in column:
+                    column[agent['id']] = len(bidders)
+                    bidders.append((user_id, agent))
+                rows.append(i)
+                cols.append(column[agent['id']])
+                states.append([auction.current_price, auction.increment, ledger.available(agent['id']), 0.0])
+
+        bid_matrix = np.full((len(lots), len(bidders)), np.nan)
+        if states:
+            # Inference is CPU-bound; keep it off the event loop
+            states = np.array(states, dtype=np.float32)
+            actions, amounts = run_blocking(model_decisions, states)
+            if online_learner:
+                for i, j, state, action in zip(rows, cols, states, actions):
+                    online_learner.record(lots[i].id, bidders[j][1]['id'], state, action)
+            budgets_per_bid = np.array([s[2] for s in states])
+            bid_matrix[rows, cols] = np.minimum(amounts, budgets_per_bid)
+
+        reserves = np.array([a.reserve_price for a in lots], dtype=np.float64)
+        budgets = np.array([ledger.available(agent['id']) for _, agent in bidders], dtype=np.float64)
+        winners, prices = clear_lots(bid_matrix, reserves, budgets, pricing=pricing)
+
+        now = clock.now_ms()
+        for i, auction in enumerate(lots):
+            winning_bid = None
+            for j in np.flatnonzero(~np.isnan(bid_matrix[i])):
+                _, agent = bidders[j]
+                bid = Bid(str(uuid4()), agent['id'], agent['name'], agent['strategyType'], float(bid_matrix[i, j]), now)
+                auction.add_bid(bid)
+                if journal:
+                    journal.record_bid(auction.id, bid.to_dict())
+                # also moves the stored price; complete_auction writes the clearing price after
+                repository.record_bid(auction.id, bid)
+                if j == winners[i]:
+                    winning_bid = bid
+            if winning_bid:
+                auction.current_price = float(prices[i])
+            complete_auction(auction, winning_bid, float(prices[i]))
 
-    from backend.app import socketio
-    socketio.emit('auction_complete', {'auction': auction}, room=f'auction_{auction_id}')
 
 # ----------------------------
-# Load Auctions from Supabase (Persistence)
+# Load Persisted Auctions
 # ----------------------------
-def load_auctions_from_supabase():
-    """Load pending/active auctions from Supabase into memory on startup."""
-    print("🔄 Loading auctions from Supabase...", flush=True)
-    if not supabase:
-        print("⚠️ Supabase client not available. Starting with empty auction list.", flush=True)
-        return
 
+def load_persisted_auctions():
+    """Load pending/active auctions from the persistence backend into memory on startup."""
+    print(f"🔄 Loading auctions from {repository.name}...", flush=True)
     try:
-        # Fetch auctions that are not completed
-        response = supabase.table('auctions').select('*').neq('status', 'completed').execute()
-        db_auctions = response.data
-        
         count = 0
-        for db_auc in db_auctions:
-            auction_id = db_auc['id']
-            
-            # Helper to parse ISO string safely
-            def parse_ts(iso_str):
-                if not iso_str: return time.time() * 1000
-                try:
-                    # Replace Z with +00:00 for Python < 3.11 compatibility
-                    iso_str = iso_str.replace('Z', '+00:00')
-                    dt = datetime.fromisoformat(iso_str)
-                    return dt.timestamp() * 1000
-                except Exception:
-                    return time.time() * 1000
-
-            start_ts = parse_ts(db_auc.get('start_time'))
-            end_ts = parse_ts(db_auc.get('end_time'))
-            
-            auctions[auction_id] = {
-                'id': auction_id,
-                'title': db_auc['title'],
-                'description': db_auc.get('description', ''),
-                'startingPrice': float(db_auc['starting_price']),
-                'reservePrice': 0, 
-                'increment': 10,
-                'startTime': start_ts,
-                'endTime': end_ts,
-                'currentPrice': float(db_auc['current_price']),
-                'status': db_auc['status'],
-                'participants': [],
-                'selectedAgents': {},
-                'bids': [],
-                'winnerId': db_auc.get('winner_id'),
-                'winnerName': None,
-                'winnerType': None,
-                'winningPrice': None,
-            }
-            
-            # Load bids
-            try:
-                bids_resp = supabase.table('bids').select('*').eq('auction_id', auction_id).order('created_at').execute()
-                for db_bid in bids_resp.data:
-                    bid_ts = parse_ts(db_bid['created_at'])
-                    auctions[auction_id]['bids'].append({
-                        'id': db_bid['id'],
-                        'bidderId': db_bid['bidder_id'],
-                        'bidderName': 'Unknown',
-                        'bidderType': 'ai',
-                        'amount': float(db_bid['amount']),
-                        'timestamp': bid_ts
-                    })
-            except Exception as e:
-                print(f"⚠️ Error loading bids for {auction_id}: {e}", flush=True)
-            
+        for auction in repository.load_open_auctions():
+            auction_id = auction.id
+            if auctions.peek(auction_id) is not None:
+                # Already restored from the local journal, which is at least as fresh
+                continue
+
+            auctions[auction_id] = auction
+            restore_hold(auction)
+
             # Restart thread if active
-            if auctions[auction_id]['status'] == 'active':
+            if auction.status == 'active':
                 print(f"🔄 Restarting bidding thread for restored auction {auction_id}")
-                threading.Thread(target=run_auto_bidding, args=(auction_id,), daemon=True).start()
+                start_bidding_task(auction_id)
 
             count += 1
             
-        print(f"📦 Loaded {count} active auctions from Supabase.", flush=True)
+        print(f"📦 Loaded {count} active auctions from {repository.name}.", flush=True)
         
     except Exception as e:
-        print(f"❌ Error loading auctions from Supabase: {e}", flush=True)
+        print(f"❌ Error loading auctions from {repository.name}: {e}", flush=True)
+
+# ----------------------------
+# Local Journal Recovery
+# ----------------------------
+def _replay_journal(state, records):
+    """Apply a journal snapshot and the records logged after it to the in-memory stores."""
+    if state:
+        # snapshots written before auctions became records hold plain dicts
+        auctions.update({k: v if isinstance(v, Auction) else Auction.from_dict(v)
+                         for k, v in state['auctions'].items()})
+        user_agents.update(state['user_agents'])
+
+    seen_bids = {}
+    for rtype, rec in records:
+        if rtype == REC_AUCTION:
+            header = rec['auction']
+            existing = auctions.peek(header['id'])
+            if existing:
+                existing.apply_header(header)
+            else:
+                auctions[header['id']] = Auction.from_dict(header)
+            continue
+
+        if rtype == REC_BUDGET:
+            initialize_user_agents(rec['user_id'])
+            for agent in user_agents[rec['user_id']].values():
+                if agent['id'] == rec['agent_id']:
+                    agent['remainingBudget'] = rec['remainingBudget']
+                    agent['totalSpent'] = rec['totalSpent']
+            continue
+
+        auction = auctions.peek(rec['auction_id'])
+        if auction is None:
+            continue
+        if rtype == REC_BID:
+            ids = seen_bids.get(auction.id)
+            if ids is None:
+                ids = seen_bids[auction.id] = auction.bid_ids()
+            if rec['bid']['id'] in ids:
+                continue
+            ids.add(rec['bid']['id'])
+            auction.add_bid(Bid.from_dict(rec['bid']))
+            auction.current_price = rec['bid']['amount']
+        elif rtype == REC_STATUS:
+            auction.status = rec['status']
+            if rec['status'] == 'active':
+                auction.start_time = rec['timestamp']
+        elif rtype == REC_PARTICIPANT:
+            initialize_user_agents(rec['user_id'])
+            auction.selected_agents[rec['user_id']] = rec['agent_id']
+            if rec['user_id'] not in auction.participants:
+                auction.participants.append(rec['user_id'])
+
+
+def restore_hold(auction):
+    """Re-place the standing bid's hold for an active ascending auction."""
+    if auction.status == 'active' and auction.bid_count and auction.format not in SEALED_FORMATS:
+        ledger.hold(auction.last_bidder, auction.id, auction.current_price, force=True)
+
+
+def rebuild_ledger():
+    """Recreate ledger accounts and holds from the restored agents and auctions."""
+    ledger.clear()
+    agent_index.clear()
+    for user_id in list(user_agents):
+        register_user_agents(user_id)
+    for auction in list(auctions.values()):
+        restore_hold(auction)
+
+
+def _capture_state():
+    # copied on the event loop, where no bid round can interleave with a single copy;
+    # yield between auctions so a large book doesn't hold up sockets and bid loops
+    captured = {}
+    for k, v in list(auctions.items()):
+        captured[k] = copy.deepcopy(v)
+        clock.sleep(0)
+    return {
+        'auctions': captured,
+        'user_agents': {k: copy.deepcopy(v) for k, v in list(user_agents.items())},
+    }
+
+
+def run_journal_snapshots():
+    """Periodically snapshot auction/agent state so recovery only replays a short tail."""
+    from backend.app import socketio
+    while True:
+        socketio.sleep(JOURNAL_SNAPSHOT_SECONDS)
+        try:
+            # rotation, pickling and fsync run on the hub's native threads
+            old_segment = run_blocking(journal.rotate)
+            run_blocking(journal.write_snapshot, old_segment, _capture_state())
+        except Exception as e:
+            print(f"⚠️ Journal snapshot failed: {e}")
+
+
+def restore_state():
+    """
+    Rebuild in-memory state on startup. With a local journal the snapshot + tail is
+    replayed first and the persistence backend is reconciled in the background;
+    otherwise the backend is the only source.
+    """
+    if not journal:
+        load_persisted_auctions()
+        return
+
+    started = time.perf_counter()
+    state, records = journal.recover()
+    _replay_journal(state, records)
+    rebuild_ledger()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"📼 Recovered {len(auctions)} auctions from journal ({len(records)} records) in {elapsed_ms:.1f} ms", flush=True)
+
+    for auction_id, auction in list(auctions.items()):
+        if auction.status != 'active':
+            continue
+        if auction.format in SEALED_FORMATS:
+            ensure_sealed_clearing_task()
+        else:
+            start_bidding_task(auction_id)
+
+    from backend.app import socketio
+    socketio.start_background_task(load_persisted_auctions)
+    socketio.start_background_task(run_journal_snapshots)
+
+
+def run_online_weight_polling():
+    """Swap in weights published by the online learner as they arrive."""
+    while True:
+        clock.sleep(ONLINE_POLL_SECONDS)
+        try:
+            if online_learner.poll_weights():
+                print(f"🧠 Serving model updated to version {dqn_agent.model_version}", flush=True)
+        except Exception as e:
+            print(f"⚠️ Online weight swap failed: {e}")
+
 
 # Call immediately
-load_auctions_from_supabase()
+restore_state()
+if online_learner:
+    from backend.app import socketio as _socketio
+    _socketio.start_background_task(run_online_weight_polling)
 
@@ -1,8 +1,26 @@
+import os
 from flask import Blueprint, request, jsonify
 from backend.utils.supabase_client import supabase
+from backend.utils.auth_middleware import cached_user
+from backend.utils.read_through_cache import ReadThroughCache
+from backend.utils import metrics
 
 auth_bp = Blueprint('auth_bp', __name__)
 
+
+def load_profile(user_id):
+    return supabase.table('profiles').select('*').eq('id', user_id).single().execute().data
+
+
+# user id -> profile row (wallet balance); dashboards poll /wallet constantly
+profiles = ReadThroughCache(
+    load_profile,
+    ttl_seconds=float(os.environ.get("WALLET_CACHE_TTL_SECONDS", 5)),
+    max_size=int(os.environ.get("WALLET_CACHE_MAX", 10_000)),
+)
+metrics.register('wallet_cache', profiles.snapshot)
+
+
 @auth_bp.route('/auth', methods=['POST'])
 def auth_user():
     """
@@ -31,15 +49,13 @@ def get_wallet():
     token = auth_header.split(" ")[1]
     
     try:
-        # Get user from Supabase using the token
-        user_resp = supabase.auth.get_user(token)
-        user = user_resp.user
+        # Get user from Supabase using the token (cached per token)
+        user = cached_user(token)
         if not user:
              return jsonify({'error': 'Invalid token'}), 401
              
-        # Fetch profile/wallet from 'profiles' table
-        profile_resp = supabase.table('profiles').select('*').eq('id', user.id).single().execute()
-        profile = profile_resp.data
+        # Fetch profile/wallet from 'profiles' table (cached per user)
+        profile = profiles.get(user.id)
         
         return jsonify({
             'balance': profile.get('balance', 0) if profile else 0,
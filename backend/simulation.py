@@ -0,0 +1,145 @@
+"""
+Virtual-clock simulation of the production bid engine.
+
+Runs the real run_auto_bidding / simulate_single_bid / finalize_auction code
+against a VirtualClock and a NullEmitter, with persistence and the local journal
+disabled, so a 60 second auction completes in milliseconds.
+
+    python -m backend.simulation --auctions 1000 --participants 3 --duration 60
+"""
+import argparse
+import contextlib
+import io
+import random
+import time
+from uuid import uuid4
+
+from backend.routes import auction_routes as engine
+from backend.utils.clock import VirtualClock
+from backend.utils.emitter import NullEmitter
+from backend.utils.budget_ledger import BudgetLedger
+from backend.utils.auction_store import AuctionStore
+from backend.storage.repository import AuctionRepository
+
+AGENT_KEYS = ("alpha", "beta", "gamma")
+
+
+@contextlib.contextmanager
+def simulation_mode(clock=None, emitter=None, repository=None):
+    """
+    Point the bid engine at a virtual clock, a no-op emitter, empty stores and no
+    persistence (unless a `repository` is given) for the duration of the block. The engine's module globals are
+    swapped, so don't run this inside a process that is serving live auctions.
+    """
+    swapped = ('clock', 'emitter', 'repository', 'journal', 'auctions', 'user_agents', 'running_threads',
+               'ledger', 'agent_index', 'online_learner')
+    saved = {name: getattr(engine, name) for name in swapped}
+    engine.clock = clock or VirtualClock()
+    engine.emitter = emitter or NullEmitter()
+    engine.repository = repository or AuctionRepository()
+    engine.journal = None
+    engine.auctions = AuctionStore()
+    engine.user_agents = {}
+    engine.running_threads = set()
+    engine.ledger = BudgetLedger()
+    engine.agent_index = {}
+    engine.online_learner = None
+    try:
+        yield engine
+    finally:
+        for name, value in saved.items():
+            setattr(engine, name, value)
+
+
+def run_simulation(num_auctions=100, participants=3, duration=60.0, starting_price=100.0,
+                   increment=10.0, seed=None, quiet=True, fresh_agents=True, repository=None):
+    """
+    Run `num_auctions` auctions back to back on one virtual clock and return summary stats.
+    With `fresh_agents` every auction starts from default budgets; otherwise winners' budgets
+    carry over as they do in production. Pass a `repository` to include persistence writes.
+    """
+    if seed is not None:
+        random.seed(seed)
+        engine.np.random.seed(seed)
+
+    clock = VirtualClock()
+    emitter = NullEmitter()
+    winning_prices = []
+    bids = 0
+    sink = io.StringIO()
+
+    started = time.perf_counter()
+    with simulation_mode(clock, emitter, repository):
+        for i in range(num_auctions):
+            auction_id = str(uuid4())
+            auction = engine.new_auction(auction_id, {
+                'title': f"sim-{i}",
+                'startingPrice': starting_price,
+                'increment': increment,
+                'duration': duration,
+            }, clock.now_ms())
+            auction.status = 'active'
+            if fresh_agents:
+                engine.user_agents.clear()
+                engine.agent_index.clear()
+                engine.ledger.clear()
+            for p in range(participants):
+                user_id = f"sim_user_{p}"
+                engine.initialize_user_agents(user_id)
+                auction.participants.append(user_id)
+                auction.selected_agents[user_id] = f"{AGENT_KEYS[p % len(AGENT_KEYS)]}_{user_id}"
+            engine.auctions[auction_id] = auction
+            engine.repository.create_auction(auction)
+
+            with contextlib.redirect_stdout(sink) if quiet else contextlib.nullcontext():
+                engine.run_auto_bidding(auction_id)
+            sink.seek(0)
+            sink.truncate()
+
+            bids += auction.bid_count
+            winning_prices.append(auction.winning_price or 0)
+            # completed auctions aren't needed once their stats are collected
+            del engine.auctions[auction_id]
+        engine.repository.flush()
+    elapsed = time.perf_counter() - started
+
+    return {
+        'auctions': num_auctions,
+        'bids': bids,
+        'wall_seconds': elapsed,
+        'simulated_seconds': num_auctions * duration,
+        'auctions_per_second': num_auctions / elapsed if elapsed > 0 else float('inf'),
+        'avg_winning_price': sum(winning_prices) / len(winning_prices) if winning_prices else 0.0,
+        'events': dict(emitter.counts),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fast-forward auctions through the production bid engine")
+    parser.add_argument("--auctions", type=int, default=1000)
+    parser.add_argument("--participants", type=int, default=3)
+    parser.add_argument("--duration", type=float, default=60.0, help="auction length in simulated seconds")
+    parser.add_argument("--starting-price", type=float, default=100.0)
+    parser.add_argument("--increment", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--carry-budgets", action="store_true", help="keep agent budgets across auctions")
+    parser.add_argument("--sqlite", metavar="PATH", help="persist to an SQLite file to include write cost")
+    args = parser.parse_args()
+
+    repository = None
+    if args.sqlite:
+        from backend.storage.sqlite_repository import SQLiteRepository
+        repository = SQLiteRepository(args.sqlite)
+    stats = run_simulation(args.auctions, args.participants, args.duration,
+                           args.starting_price, args.increment, args.seed,
+                           fresh_agents=not args.carry_budgets, repository=repository)
+    if repository:
+        repository.close()
+        print(f"SQLite: {repository.stats['rows']} rows in {repository.stats['batches']} batches")
+    print(f"Simulated {stats['auctions']} auctions ({stats['simulated_seconds']:.0f}s of auction time) "
+          f"in {stats['wall_seconds']:.2f}s → {stats['auctions_per_second']:.0f} auctions/s")
+    print(f"Bids: {stats['bids']} | Avg winning price: {stats['avg_winning_price']:.2f} | Events: {stats['events']}")
+
+
+if __name__ == "__main__":
+    main()
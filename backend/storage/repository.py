@@ -0,0 +1,153 @@
+"""
+Persistence for auctions, bids and agents behind one interface.
+
+PERSISTENCE_BACKEND picks the implementation:
+  supabase  remote Postgres through the Supabase client (default)
+  sqlite    embedded SQLite file in WAL mode, for single-node deployments (SQLITE_PATH)
+  none      nothing is persisted (tests, benchmarks, simulation)
+"""
+import atexit
+import os
+import time
+from datetime import datetime
+
+from backend.models.records import Auction, Bid
+
+
+def to_iso(ms):
+    return datetime.fromtimestamp(ms / 1000).isoformat()
+
+
+def parse_ts(iso_str):
+    """Parse a stored ISO timestamp into epoch ms (now when missing/invalid)."""
+    if not iso_str:
+        return time.time() * 1000
+    try:
+        # Replace Z with +00:00 for Python < 3.11 compatibility
+        return datetime.fromisoformat(iso_str.replace('Z', '+00:00')).timestamp() * 1000
+    except Exception:
+        return time.time() * 1000
+
+
+def auction_from_row(row, bid_rows=()):
+    """Build an Auction record from an `auctions` row and its `bids` rows (oldest first)."""
+    auction = Auction(
+        row['id'],
+        title=row['title'],
+        description=row.get('description', ''),
+        starting_price=float(row['starting_price']),
+        # rows written before these columns existed were English lots with the old defaults
+        reserve_price=float(row.get('reserve_price') or 0),
+        increment=float(row['increment']) if row.get('increment') is not None else 10,
+        format=row.get('format') or 'english',
+        start_time=parse_ts(row.get('start_time')),
+        end_time=parse_ts(row.get('end_time')),
+        current_price=float(row['current_price']),
+        status=row['status'],
+        winner_id=row.get('winner_id'),
+    )
+    if auction.status == 'completed':
+        auction.winning_price = auction.current_price if auction.winner_id else 0
+    for b in bid_rows:
+        auction.add_bid(Bid(b['id'], b['bidder_id'], 'Unknown', 'ai', float(b['amount']), parse_ts(b['created_at'])))
+    return auction
+
+
+def auction_row(auction, created_by=None):
+    return {
+        'id': auction.id,
+        'title': auction.title,
+        'description': auction.description,
+        'starting_price': auction.starting_price,
+        'reserve_price': auction.reserve_price,
+        'increment': auction.increment,
+        'format': auction.format,
+        'current_price': auction.current_price,
+        'status': auction.status,
+        'start_time': to_iso(auction.start_time),
+        'end_time': to_iso(auction.end_time),
+        'created_by': created_by,
+    }
+
+
+def bid_row(auction_id, bid):
+    return {
+        'id': bid.id,
+        'auction_id': auction_id,
+        'bidder_id': bid.bidder_id,
+        'amount': bid.amount,
+        'created_at': to_iso(bid.timestamp),
+    }
+
+
+def agent_row(user_id, agent):
+    return {
+        'id': agent['id'],
+        'user_id': user_id,
+        'name': agent['name'],
+        'budget': agent['budget'],
+        'remaining_budget': agent['remainingBudget'],
+        'strategy': agent.get('strategyType'),
+    }
+
+
+class AuctionRepository:
+    """
+    Base repository; persists nothing. Implementations override the writes they
+    support and report their own errors, so callers never need a try/except.
+    """
+    name = 'none'
+
+    # -------- writes --------
+    def create_auction(self, auction, created_by=None, token=None):
+        """Insert a new auction. `token` is the creator's access token, for backends with row-level security."""
+
+    def update_status(self, auction_id, status):
+        pass
+
+    def record_bid(self, auction_id, bid):
+        """Insert the bid and move the auction's current_price to it."""
+
+    def complete_auction(self, auction):
+        """Persist the final status, winner and price."""
+
+    def save_agent(self, user_id, agent):
+        """Upsert an agent's budget after it changes."""
+
+    def flush(self):
+        """Block until queued writes are durable."""
+
+    def close(self):
+        pass
+
+    # -------- reads --------
+    def load_open_auctions(self):
+        """Pending/active auctions with their bids."""
+        return []
+
+    def load_auction(self, auction_id):
+        """One auction with its bids, or None."""
+        return None
+
+
+def create_repository(backend=None):
+    backend = (backend or os.environ.get("PERSISTENCE_BACKEND", "supabase")).lower()
+    if backend == 'sqlite':
+        from backend.storage.sqlite_repository import SQLiteRepository
+        repo = SQLiteRepository(
+            os.environ.get("SQLITE_PATH", os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs", "auctions.db")),
+            batch_ms=float(os.environ.get("SQLITE_BATCH_MS", 2)),
+        )
+        # commit whatever is still queued on shutdown
+        atexit.register(repo.close)
+        return repo
+    if backend == 'supabase':
+        from backend.utils.supabase_client import supabase
+        if supabase:
+            from backend.storage.supabase_repository import SupabaseRepository
+            return SupabaseRepository(supabase)
+        print("⚠️ Supabase client not available. Auctions will not be persisted.", flush=True)
+        return AuctionRepository()
+    if backend != 'none':
+        print(f"⚠️ Unknown PERSISTENCE_BACKEND={backend!r}; auctions will not be persisted.", flush=True)
+    return AuctionRepository()
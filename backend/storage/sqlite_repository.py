@@ -0,0 +1,232 @@
+import os
+import sqlite3
+import threading
+import time
+
+from backend.storage.repository import AuctionRepository, auction_from_row, auction_row, bid_row, agent_row
+from backend.utils.concurrency import run_blocking
+
+# Same tables/columns as frontend/supabase/migrations, plus the indexes our reads need
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS auctions (
+  id text PRIMARY KEY,
+  title text NOT NULL,
+  description text,
+  starting_price numeric NOT NULL DEFAULT 0,
+  reserve_price numeric NOT NULL DEFAULT 0,
+  increment numeric NOT NULL DEFAULT 10,
+  format text NOT NULL DEFAULT 'english',
+  current_price numeric NOT NULL DEFAULT 0,
+  status text NOT NULL DEFAULT 'pending',
+  start_time text,
+  end_time text,
+  winner_id text,
+  created_by text,
+  created_at text DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now')),
+  updated_at text DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+CREATE TABLE IF NOT EXISTS agents (
+  id text PRIMARY KEY,
+  user_id text,
+  name text NOT NULL,
+  budget numeric NOT NULL DEFAULT 0,
+  remaining_budget numeric NOT NULL DEFAULT 0,
+  strategy text,
+  created_at text DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now')),
+  updated_at text DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+CREATE TABLE IF NOT EXISTS bids (
+  id text PRIMARY KEY,
+  auction_id text REFERENCES auctions(id) ON DELETE CASCADE,
+  bidder_id text NOT NULL,
+  amount numeric NOT NULL,
+  created_at text
+);
+CREATE INDEX IF NOT EXISTS idx_auctions_status ON auctions(status);
+CREATE INDEX IF NOT EXISTS idx_bids_auction_created ON bids(auction_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_agents_user ON agents(user_id);
+"""
+
+# Added after the first release; older files get them with ALTER TABLE on open
+AUCTION_COLUMNS_ADDED = (
+    ('reserve_price', "numeric NOT NULL DEFAULT 0"),
+    ('increment', "numeric NOT NULL DEFAULT 10"),
+    ('format', "text NOT NULL DEFAULT 'english'"),
+)
+
+# Statements are fixed strings so sqlite3's statement cache keeps them prepared.
+# A batch is applied in this order, which respects the foreign keys.
+INSERT_AUCTION = ("INSERT OR IGNORE INTO auctions (id, title, description, starting_price, reserve_price, increment, "
+                  "format, current_price, status, start_time, end_time, created_by) VALUES (:id, :title, "
+                  ":description, :starting_price, :reserve_price, :increment, :format, :current_price, :status, "
+                  ":start_time, :end_time, :created_by)")
+UPDATE_STATUS = "UPDATE auctions SET status = ?, updated_at = strftime('%Y-%m-%dT%H:%M:%f', 'now') WHERE id = ?"
+INSERT_BID = ("INSERT OR IGNORE INTO bids (id, auction_id, bidder_id, amount, created_at) "
+              "VALUES (:id, :auction_id, :bidder_id, :amount, :created_at)")
+UPDATE_PRICE = "UPDATE auctions SET current_price = ? WHERE id = ?"
+COMPLETE_AUCTION = ("UPDATE auctions SET status = 'completed', winner_id = ?, current_price = ?, "
+                    "updated_at = strftime('%Y-%m-%dT%H:%M:%f', 'now') WHERE id = ?")
+UPSERT_AGENT = ("INSERT INTO agents (id, user_id, name, budget, remaining_budget, strategy) "
+                "VALUES (:id, :user_id, :name, :budget, :remaining_budget, :strategy) "
+                "ON CONFLICT(id) DO UPDATE SET remaining_budget = excluded.remaining_budget, "
+                "budget = excluded.budget, updated_at = strftime('%Y-%m-%dT%H:%M:%f', 'now')")
+BATCH_ORDER = (INSERT_AUCTION, UPDATE_STATUS, INSERT_BID, UPDATE_PRICE, COMPLETE_AUCTION, UPSERT_AGENT)
+
+
+class SQLiteRepository(AuctionRepository):
+    """
+    Embedded SQLite store in WAL mode. Writes are queued and a writer thread commits
+    everything queued within `batch_ms` as one transaction, with one executemany per
+    statement, so a bid costs a queue append on the request path and the fsync is
+    shared by the whole batch. Under gevent the writer is a greenlet, so the commit
+    itself goes through run_blocking to keep the fsync off the event loop. Reads flush the queue first, then use their own
+    connection (WAL lets them run alongside the writer).
+    """
+    name = 'sqlite'
+
+    def __init__(self, path, batch_ms=2):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.batch_seconds = batch_ms / 1000
+        self._writer = self._connect()
+        self._writer.executescript(SCHEMA)
+        self._add_missing_columns()
+        self._reader = self._connect() if path != ':memory:' else self._writer
+        self._read_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+        self._cond = threading.Condition()
+        self._pending = {sql: [] for sql in BATCH_ORDER}
+        self._prices = {}          # auction id -> latest price; only the last one per batch is written
+        self._flushed_seq = 0
+        self._queued_seq = 0
+        self._closed = False
+        self.stats = {'batches': 0, 'rows': 0}
+        self._thread = threading.Thread(target=self._run, name='sqlite-writer', daemon=True)
+        self._thread.start()
+
+    def _add_missing_columns(self):
+        # files created before the lot format was persisted (same change as the Supabase migration)
+        have = {row['name'] for row in self._writer.execute("PRAGMA table_info(auctions)")}
+        for column, ddl in AUCTION_COLUMNS_ADDED:
+            if column not in have:
+                self._writer.execute(f"ALTER TABLE auctions ADD COLUMN {column} {ddl}")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, cached_statements=64)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")   # each batch commit is fsynced; one fsync per batch, not per write
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    # -------- write queue --------
+    def _enqueue(self, sql, params):
+        with self._cond:
+            self._pending[sql].append(params)
+            self._queued_seq += 1
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._queued_seq == self._flushed_seq and not self._closed:
+                    self._cond.wait()
+                if self._closed and self._queued_seq == self._flushed_seq:
+                    return
+            # let a batch accumulate
+            if self.batch_seconds:
+                time.sleep(self.batch_seconds)
+            self._write_batch()
+
+    def _write_batch(self):
+        with self._cond:
+            pending, self._pending = self._pending, {sql: [] for sql in BATCH_ORDER}
+            prices, self._prices = self._prices, {}
+            seq = self._queued_seq
+        pending[UPDATE_PRICE] = [(price, auction_id) for auction_id, price in prices.items()]
+        rows = sum(len(v) for v in pending.values())
+        with self._write_lock:
+            try:
+                # the commit fsyncs; under gevent it runs on the hub's native threads
+                run_blocking(self._commit, pending)
+                self.stats['batches'] += 1
+                self.stats['rows'] += rows
+            except Exception as e:
+                print(f"❌ SQLite batch of {rows} rows failed: {e}", flush=True)
+        with self._cond:
+            self._flushed_seq = seq
+            self._cond.notify_all()
+
+    def _commit(self, pending):
+        try:
+            self._writer.execute("BEGIN")
+            for sql in BATCH_ORDER:
+                if pending[sql]:
+                    self._writer.executemany(sql, pending[sql])
+            self._writer.execute("COMMIT")
+        except Exception:
+            if self._writer.in_transaction:
+                self._writer.execute("ROLLBACK")
+            raise
+
+    def flush(self):
+        with self._cond:
+            target = self._queued_seq
+            self._cond.notify()
+            while self._flushed_seq < target and self._thread.is_alive():
+                self._cond.wait(0.1)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        with self._write_lock:
+            self._writer.close()
+            if self._reader is not self._writer:
+                self._reader.close()
+
+    # -------- writes --------
+    def create_auction(self, auction, created_by=None, token=None):
+        self._enqueue(INSERT_AUCTION, auction_row(auction, created_by))
+
+    def update_status(self, auction_id, status):
+        self._enqueue(UPDATE_STATUS, (status, auction_id))
+
+    def record_bid(self, auction_id, bid):
+        with self._cond:
+            self._prices[auction_id] = bid.amount
+        self._enqueue(INSERT_BID, bid_row(auction_id, bid))
+
+    def complete_auction(self, auction):
+        self._enqueue(COMPLETE_AUCTION, (auction.winner_id or None, auction.current_price, auction.id))
+
+    def save_agent(self, user_id, agent):
+        self._enqueue(UPSERT_AGENT, agent_row(user_id, agent))
+
+    # -------- reads --------
+    def _query(self, sql, params=()):
+        lock = self._write_lock if self._reader is self._writer else self._read_lock
+        with lock:
+            return [dict(r) for r in self._reader.execute(sql, params).fetchall()]
+
+    def _with_bids(self, rows):
+        if not rows:
+            return []
+        bids = {row['id']: [] for row in rows}
+        marks = ",".join("?" * len(bids))
+        for b in self._query(f"SELECT * FROM bids WHERE auction_id IN ({marks}) ORDER BY auction_id, created_at, id",
+                             list(bids)):
+            bids[b['auction_id']].append(b)
+        return [auction_from_row(row, bids[row['id']]) for row in rows]
+
+    def load_open_auctions(self):
+        self.flush()
+        return self._with_bids(self._query("SELECT * FROM auctions WHERE status != 'completed'"))
+
+    def load_auction(self, auction_id):
+        self.flush()
+        found = self._with_bids(self._query("SELECT * FROM auctions WHERE id = ?", (auction_id,)))
+        return found[0] if found else None
@@ -0,0 +1,122 @@
+import threading
+
+from backend.storage.repository import AuctionRepository, auction_from_row, auction_row, bid_row, agent_row
+
+
+class SupabaseRepository(AuctionRepository):
+    """
+    Writes through to the Supabase tables; each call is a round trip. Agent budget
+    upserts happen on settlement, so they are handed to a writer thread instead:
+    only the latest row per agent is kept and pending rows go out in one upsert.
+    """
+    name = 'supabase'
+
+    def __init__(self, client):
+        self.client = client
+        self._cond = threading.Condition()
+        self._agents = {}          # agent id -> latest row not yet written
+        self._writing = False
+        self._closed = False
+        self._thread = None
+
+    # -------- agent writer --------
+    def _start_writer(self):
+        self._thread = threading.Thread(target=self._run, name='supabase-agent-writer', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._agents and not self._closed:
+                    self._cond.wait()
+                if not self._agents:
+                    return
+                rows, self._agents = list(self._agents.values()), {}
+                self._writing = True
+            try:
+                self.client.table('agents').upsert(rows).execute()
+            except Exception as e:
+                print(f"Error saving {len(rows)} agent budgets: {e}")
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+    def flush(self):
+        with self._cond:
+            while (self._agents or self._writing) and self._thread is not None and self._thread.is_alive():
+                self._cond.wait(0.1)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def create_auction(self, auction, created_by=None, token=None):
+        try:
+            client = self.client
+            if token:
+                # Persist using the user's token so RLS sees the creator
+                from backend.utils.supabase_client import get_authenticated_client
+                client = get_authenticated_client(token)
+            print(f"💾 Persisting auction {auction.id} to Supabase (User Context)...")
+            client.table('auctions').insert(auction_row(auction, created_by)).execute()
+            print(f"✅ Auction {auction.id} persisted to Supabase.")
+        except Exception as e:
+            print(f"❌ Error creating auction in Supabase: {e}")
+
+    def update_status(self, auction_id, status):
+        try:
+            self.client.table('auctions').update({'status': status}).eq('id', auction_id).execute()
+        except Exception as e:
+            print(f"Error updating status: {e}")
+
+    def record_bid(self, auction_id, bid):
+        try:
+            self.client.table('bids').insert(bid_row(auction_id, bid)).execute()
+            self.client.table('auctions').update({
+                'current_price': bid.amount
+            }).eq('id', auction_id).execute()
+        except Exception as e:
+            print(f"Error persisting bid: {e}")
+
+    def complete_auction(self, auction):
+        try:
+            update_data = {
+                'status': 'completed',
+                'winner_id': auction.winner_id if auction.winner_id else None,
+                'current_price': auction.current_price,
+            }
+            self.client.table('auctions').update(update_data).eq('id', auction.id).execute()
+        except Exception as e:
+            print(f"Error finalizing auction in Supabase: {e}")
+
+    def save_agent(self, user_id, agent):
+        with self._cond:
+            if self._closed:
+                return
+            if self._thread is None:
+                self._start_writer()
+            self._agents[agent['id']] = agent_row(user_id, agent)
+            self._cond.notify()
+
+    def _bids(self, auction_id):
+        try:
+            return self.client.table('bids').select('*').eq('auction_id', auction_id).order('created_at').execute().data
+        except Exception as e:
+            print(f"⚠️ Error loading bids for {auction_id}: {e}", flush=True)
+            return []
+
+    def load_open_auctions(self):
+        # Fetch auctions that are not completed
+        rows = self.client.table('auctions').select('*').neq('status', 'completed').execute().data
+        return [auction_from_row(row, self._bids(row['id'])) for row in rows]
+
+    def load_auction(self, auction_id):
+        try:
+            rows = self.client.table('auctions').select('*').eq('id', auction_id).limit(1).execute().data
+        except Exception as e:
+            print(f"⚠️ Error fetching auction {auction_id} from Supabase: {e}", flush=True)
+            return None
+        return auction_from_row(rows[0], self._bids(auction_id)) if rows else None
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+from backend.utils.admission import AdmissionController, ConcurrencyGate, TokenBucketLimiter
+
+
+def test_token_bucket_allows_burst_then_refills_at_rate():
+    now = [0.0]
+    limiter = TokenBucketLimiter(rate=2, burst=3, clock=lambda: now[0])
+    assert [limiter.try_acquire('u1') for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.try_acquire('u1') == 0.5
+    assert limiter.try_acquire('u2') == 0.0          # keys are independent
+    now[0] = 0.5
+    assert limiter.try_acquire('u1') == 0.0
+
+
+def test_rejection_by_a_later_check_refunds_earlier_tokens():
+    controller = AdmissionController(TokenBucketLimiter(1, 1), TokenBucketLimiter(1, 1), ConcurrencyGate(1))
+    assert controller.admit('u1', 'a1') == (None, 0.0)
+    status, _ = controller.admit('u2', 'a2')
+    assert status == 503                              # gate full; u2 and a2 keep their tokens
+    controller.release()
+    assert controller.admit('u2', 'a2') == (None, 0.0)
+    controller.release()
+    assert controller.admit('u3', 'a1')[0] == 429
+    assert controller.stats == {'admitted': 2, 'rejected_user': 0, 'rejected_auction': 1, 'rejected_busy': 1}
+
+
+def test_simulate_bid_answers_429_with_retry_after_when_user_exceeds_rate(monkeypatch):
+    from backend.app import app
+    from backend.routes import auction_routes
+    from backend.utils import auth_middleware
+
+    verified = []
+
+    def get_user(token):
+        verified.append(token)
+        return SimpleNamespace(user=SimpleNamespace(id='flooder'))
+
+    monkeypatch.setattr(auth_middleware, 'supabase', SimpleNamespace(auth=SimpleNamespace(get_user=get_user)))
+    monkeypatch.setattr(auction_routes.admission, 'users', TokenBucketLimiter(0.5, 2))
+    client = app.test_client()
+    headers = {'Authorization': 'Bearer t'}
+    codes = [client.post('/api/auction/simulate-bid', json={'auction_id': 'missing'}, headers=headers)
+             for _ in range(3)]
+    assert [r.status_code for r in codes[:2]] == [404, 404]
+    assert codes[2].status_code == 429 and codes[2].headers['Retry-After'] == '2'
+    assert len(verified) == 3                         # every call verifies its token live
+
+
+def test_ai_bid_charges_the_client_address_per_state_and_caps_batch_rows(monkeypatch):
+    from backend.app import app
+    from backend.routes import auction_routes
+
+    monkeypatch.setattr(auction_routes.ai_bid_admission, 'users', TokenBucketLimiter(1, 8))
+    client = app.test_client()
+    state = {'current_price': 100, 'increment': 10, 'remaining_budget': 5000, 'time_left': 30000}
+    too_many = client.post('/api/auction/ai-bid/batch', json={'states': [state] * (auction_routes.AI_BID_MAX_STATES + 1)})
+    assert too_many.status_code == 413
+
+    monkeypatch.setattr(auction_routes.ai_bid_admission, 'users', TokenBucketLimiter(1, 8))
+    assert client.post('/api/auction/ai-bid/batch', json={'states': [state] * 6}).status_code == 200
+    assert client.post('/api/auction/ai-bid', json={'auction_state': state, 'user_id': 'spoof'}).status_code == 200
+    rejected = client.post('/api/auction/ai-bid/batch', json={'states': [state] * 3, 'user_id': 'other'})
+    assert rejected.status_code == 429 and rejected.headers['Retry-After'] == '2'
@@ -0,0 +1,124 @@
+import threading
+
+import numpy as np
+
+from backend.models.decision_cache import DecisionCache
+from backend.models.dqn_agent import DQNAgent
+from backend.utils.coalescer import RequestCoalescer
+
+
+def test_concurrent_callers_share_one_call_and_get_their_own_rows():
+    calls = []
+
+    def double(rows):
+        calls.append(len(rows))
+        return rows[:, 0] * 2, rows[:, 0] + 1
+
+    coalescer = RequestCoalescer(double, window_ms=50)
+    results = {}
+
+    def caller(i):
+        results[i] = coalescer.submit(np.array([[i], [i + 100]], dtype=np.float32))
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sum(calls) == 16 and len(calls) < 8
+    for i, (doubled, plus_one) in results.items():
+        assert list(doubled) == [2 * i, 2 * (i + 100)]
+        assert list(plus_one) == [i + 1, i + 101]
+
+
+def test_batches_never_exceed_max_batch_and_an_interrupted_leader_releases_followers():
+    sizes = []
+    coalescer = RequestCoalescer(lambda rows: (sizes.append(len(rows)) or rows[:, 0],), window_ms=50, max_batch=5)
+    threads = [threading.Thread(target=coalescer.submit, args=(np.zeros((3, 1)),)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sum(sizes) == 12 and max(sizes) <= 5
+
+    class Interrupted(BaseException):
+        pass
+
+    def interrupted(rows):
+        raise Interrupted()
+
+    coalescer = RequestCoalescer(interrupted, window_ms=50)
+    errors = []
+
+    def follower():
+        try:
+            coalescer.submit(np.zeros((1, 1)))
+        except Exception as e:
+            errors.append(e)
+
+    def leader():
+        try:
+            coalescer.submit(np.zeros((1, 1)))
+        except Interrupted:
+            errors.append('leader')
+
+    lead = threading.Thread(target=leader)
+    lead.start()
+    follow = threading.Thread(target=follower)
+    follow.start()
+    lead.join(1)
+    follow.join(1)
+    assert not follow.is_alive() and len(errors) == 2 and 'leader' in errors
+
+
+def test_batch_endpoint_returns_one_decision_per_state():
+    from backend.app import app
+
+    client = app.test_client()
+    states = [{'agent_id': f'a{i}', 'current_price': 100 + i, 'increment': 10,
+               'remaining_budget': 5000, 'time_left': 30000} for i in range(5)]
+    resp = client.post('/api/auction/ai-bid/batch', json={'states': states})
+    assert resp.status_code == 200
+    decisions = resp.get_json()['decisions']
+    assert [d['agent_id'] for d in decisions] == ['a0', 'a1', 'a2', 'a3', 'a4']
+    for state, d in zip(states, decisions):
+        assert d['bid_amount'] == state['current_price'] + 10 * (d['action'] + 1)
+
+    assert client.post('/api/auction/ai-bid/batch', json={'states': [{'current_price': 1}]}).status_code == 400
+    single = client.post('/api/auction/ai-bid', json={'agent_id': 'x', 'auction_state': states[0]}).get_json()
+    assert single['agent_id'] == 'x' and single['bid_amount'] > 100
+    assert client.post('/api/auction/ai-bid', json={'auction_state': [1, 2]}).status_code == 400
+    assert client.post('/api/auction/ai-bid', json={'auction_state': 'x'}).status_code == 400
+
+
+class _CountingAgent:
+    state_size, action_size, epsilon, model_version = 4, 10, 0.0, 0
+
+    def __init__(self):
+        self.forward_rows = 0
+
+    def greedy_actions(self, states):
+        self.forward_rows += len(states)
+        return np.full(len(states), 2, dtype=np.int64)
+
+    bid_amounts = staticmethod(DQNAgent.bid_amounts)
+
+
+def test_decision_cache_skips_forward_pass_for_nearby_states_until_model_swap():
+    agent = _CountingAgent()
+    cache = DecisionCache(max_size=100, quantum=(10, 1, 100, 1000))
+    states = np.array([[101, 10, 5000, 30_000], [104, 10, 5050, 30_400], [250, 10, 5000, 30_000]], dtype=np.float32)
+
+    actions, amounts = cache.act_batch(agent, states)
+    assert agent.forward_rows == 3 and list(actions) == [2, 2, 2]
+    assert list(amounts) == [131, 134, 280]          # priced from the real state, not the bucket
+
+    cache.act_batch(agent, states)
+    assert agent.forward_rows == 3
+    assert cache.act(agent, [108, 10, 5099, 30_999])[1] == 138
+    assert cache.snapshot()['hits'] == 4
+
+    agent.model_version += 1
+    cache.act_batch(agent, states[:1])
+    assert agent.forward_rows == 4 and cache.snapshot()['invalidations'] == 1
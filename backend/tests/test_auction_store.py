@@ -0,0 +1,56 @@
+from backend.models.records import Auction
+from backend.utils.auction_store import AuctionStore, DiskColdStore
+
+
+def _completed(n):
+    auction = Auction(f"a{n}", status='active')
+    auction.status = 'completed'
+    return auction
+
+
+def test_completed_auctions_age_out_to_disk_and_read_back(tmp_path):
+    store = AuctionStore(warm_max=2, cold=DiskColdStore(str(tmp_path)))
+    store['live'] = Auction('live', status='active')
+    for n in range(4):
+        store[f"a{n}"] = _completed(n)
+
+    assert sorted(store.keys()) == ['a2', 'a3', 'live']
+    assert store.stats['evictions'] == 2 and store.stats['cold_writes'] == 2
+    assert 'a0' in store
+    assert store['a0'].status == 'completed'       # read through and promoted to warm
+    assert store.stats['cold_hits'] == 1
+    assert 'a0' in store.keys() and 'a2' not in store.keys()
+
+
+def test_retire_moves_auction_out_of_hot_tier_and_loader_serves_misses():
+    loaded = []
+    store = AuctionStore(warm_max=1, loader=lambda aid: loaded.append(aid) or (_completed(0) if aid == 'a0' else None))
+    store['a0'] = Auction('a0', status='active')
+    store['a0'].status = 'completed'
+    store.retire('a0')
+    store['a1'] = _completed(1)                   # pushes a0 out, no cold tier to keep it
+
+    assert store.tier_sizes()['hot'] == 0 and list(store.keys()) == ['a1']
+    assert store.get('a0').id == 'a0'
+    assert store.get('missing') is None
+    assert loaded == ['a0', 'missing'] and store.stats['misses'] == 1
+
+
+def test_unknown_ids_are_negatively_cached_and_live_rows_stay_out_of_memory():
+    now = [0.0]
+    loaded = []
+
+    def loader(aid):
+        loaded.append(aid)
+        return Auction(aid, status='active') if aid == 'remote-live' else None
+
+    store = AuctionStore(loader=loader, miss_ttl=5, clock=lambda: now[0])
+    assert 'nope' not in store and store.get('nope') is None
+    assert loaded == ['nope'] and store.stats['negative_hits'] == 1
+    now[0] = 6
+    assert store.get('nope') is None and loaded == ['nope', 'nope']
+
+    assert store.get('remote-live').status == 'active'
+    assert store.tier_sizes()['hot'] == 0                      # no bidding loop runs for it
+    assert store.peek('remote-live') is None and store.peek('nope') is None
+    assert loaded.count('remote-live') == 1
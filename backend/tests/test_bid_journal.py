@@ -0,0 +1,51 @@
+import os
+from uuid import uuid4
+
+from backend.utils.bid_journal import BidJournal, REC_AUCTION, REC_BID, REC_STATUS, REC_BUDGET
+
+
+def _bid(amount):
+    return {
+        'id': str(uuid4()),
+        'bidderId': 'alpha_u1',
+        'bidderName': 'Alpha Bot',
+        'bidderType': 'reinforcement_learning',
+        'amount': amount,
+        'timestamp': 1700000000000.0,
+    }
+
+
+def test_records_round_trip_and_torn_tail_is_ignored(tmp_path):
+    auction_id = str(uuid4())
+    journal = BidJournal(str(tmp_path))
+    journal.recover()
+    journal.record_auction({'id': auction_id, 'title': 'Lamp', 'status': 'pending', 'bids': []})
+    journal.record_status(auction_id, 'active', 1.0)
+    journal.record_bid(auction_id, _bid(110.0))
+    journal.record_budget('u1', {'id': 'alpha_u1', 'remainingBudget': 9890.0, 'totalSpent': 110.0})
+    journal.close()
+
+    # simulate a crash mid-write: a partial record at the end of the segment
+    segment = os.path.join(str(tmp_path), sorted(os.listdir(str(tmp_path)))[-1])
+    with open(segment, "ab") as f:
+        f.write(b"\x40\x00\x00\x00partial")
+
+    _, records = BidJournal(str(tmp_path)).recover()
+    assert [r[0] for r in records] == [REC_AUCTION, REC_STATUS, REC_BID, REC_BUDGET]
+    assert records[2][1]['auction_id'] == auction_id
+    assert records[2][1]['bid']['amount'] == 110.0
+    assert records[3][1]['remainingBudget'] == 9890.0
+
+
+def test_snapshot_drops_covered_segments(tmp_path):
+    auction_id = str(uuid4())
+    journal = BidJournal(str(tmp_path))
+    journal.recover()
+    journal.record_bid(auction_id, _bid(100.0))
+    journal.snapshot(lambda: {'auctions': {auction_id: {'id': auction_id}}, 'user_agents': {}})
+    journal.record_bid(auction_id, _bid(120.0))
+    journal.close()
+
+    state, records = BidJournal(str(tmp_path)).recover()
+    assert auction_id in state['auctions']
+    assert [r[1]['bid']['amount'] for r in records] == [120.0]
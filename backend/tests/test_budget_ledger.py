@@ -0,0 +1,90 @@
+import uuid
+
+from backend.simulation import simulation_mode
+from backend.utils.budget_ledger import BudgetLedger
+
+
+def test_hold_release_settle_keep_available_balance():
+    ledger = BudgetLedger()
+    ledger.open_account('a', 100)
+    assert ledger.hold('a', 'x', 60)
+    assert not ledger.hold('a', 'y', 50)      # only 40 left
+    assert ledger.hold('a', 'x', 70)          # raising its own hold only needs the delta
+    assert ledger.available('a') == 30
+    ledger.release('a', 'x')
+    assert ledger.available('a') == 100
+    ledger.hold('a', 'y', 50)
+    ledger.settle('a', 'y', 45)               # e.g. a Vickrey price below the hold
+    acct = ledger.account('a')
+    assert (acct.spent, acct.held, acct.available) == (45, 0, 55)
+
+
+def test_agent_cannot_lead_more_auctions_than_its_budget_covers():
+    with simulation_mode() as engine:
+        ids = []
+        for _ in range(50):
+            auction_id = str(uuid.uuid4())
+            auction = engine.new_auction(auction_id, {'startingPrice': 1000, 'increment': 100}, engine.clock.now_ms())
+            auction.status = 'active'
+            engine.initialize_user_agents('u1')
+            auction.participants.append('u1')
+            auction.selected_agents['u1'] = 'beta_u1'   # 8000 budget
+            engine.auctions[auction_id] = auction
+            ids.append(auction_id)
+            engine.simulate_single_bid(auction_id)
+
+        led = [a for a in ids if engine.auctions[a].bid_count]
+        committed = sum(engine.auctions[a].current_price for a in led)
+        assert 0 < len(led) < 50
+        assert committed <= 8000
+        assert engine.ledger.available('beta_u1') == 8000 - committed
+
+
+def _two_agent_auction(engine, auction_id):
+    auction = engine.new_auction(auction_id, {'startingPrice': 100, 'increment': 10, 'duration': 60},
+                                 engine.clock.now_ms())
+    auction.status = 'active'
+    for user_id, key in (('u1', 'alpha'), ('u2', 'beta')):
+        engine.initialize_user_agents(user_id)
+        auction.participants.append(user_id)
+        auction.selected_agents[user_id] = f"{key}_{user_id}"
+    engine.auctions[auction_id] = auction
+    return auction
+
+
+def _interleave(monkeypatch, engine, during_inference):
+    """Run `during_inference` once, while the first round is waiting on its model call."""
+    real, pending = engine.run_blocking, [during_inference]
+
+    def yielding(fn, *args, **kwargs):
+        if pending:
+            pending.pop()()
+        return real(fn, *args, **kwargs)
+
+    monkeypatch.setattr(engine, 'run_blocking', yielding)
+
+
+def test_round_overtaken_during_inference_drops_its_bid(monkeypatch):
+    with simulation_mode() as engine:
+        auction = _two_agent_auction(engine, str(uuid.uuid4()))
+        engine.simulate_single_bid(auction.id)
+        _interleave(monkeypatch, engine, lambda: engine.simulate_single_bid(auction.id))
+
+        assert engine.simulate_single_bid(auction.id) is None      # the interleaved round won
+        prices = [b['amount'] for b in auction.to_dict()['bids']]
+        assert auction.bid_count == 2 and prices == sorted(prices)
+        leader = auction.last_bidder
+        assert engine.ledger.holds_count() == 1 and engine.ledger.held(leader, auction.id) == auction.current_price
+
+
+def test_close_during_inference_rejects_the_late_bid_and_releases_every_hold(monkeypatch):
+    with simulation_mode() as engine:
+        auction = _two_agent_auction(engine, str(uuid.uuid4()))
+        engine.simulate_single_bid(auction.id)
+        # a stray hold the closing path must not leave behind
+        engine.ledger.hold('alpha_u1' if auction.last_bidder == 'beta_u2' else 'beta_u2', auction.id, 50)
+        _interleave(monkeypatch, engine, lambda: engine.finalize_auction(auction.id))
+
+        assert engine.simulate_single_bid(auction.id) is None
+        assert auction.status == 'completed' and auction.bid_count == 1
+        assert engine.ledger.holds_count() == 0
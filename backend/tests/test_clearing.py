@@ -0,0 +1,36 @@
+import numpy as np
+
+from backend.models.clearing import clear_lots
+
+NO_BID = np.nan
+
+
+def test_second_price_pays_runner_up_but_not_below_reserve():
+    bids = np.array([
+        [10.0, 8.0, NO_BID],
+        [5.0, 7.0, 6.0],
+        [3.0, 9.0, NO_BID],
+    ])
+    winners, prices = clear_lots(bids, reserves=[0.0, 0.0, 4.0], pricing="second_price")
+    assert winners.tolist() == [0, 1, 1]
+    assert prices.tolist() == [8.0, 6.0, 4.0]
+
+
+def test_lots_below_reserve_stay_unsold():
+    winners, prices = clear_lots([[5.0, 6.0]], reserves=[10.0], pricing="first_price")
+    assert winners.tolist() == [-1]
+    assert prices.tolist() == [0.0]
+
+
+def test_budget_is_shared_across_lots():
+    # bidder 0 outbids everyone everywhere but can only afford the first lot
+    bids = np.array([[10.0, 4.0], [10.0, 5.0], [10.0, 6.0]])
+    winners, prices = clear_lots(bids, budgets=[12.0, 100.0], pricing="first_price")
+    assert winners.tolist() == [0, 1, 1]
+    assert prices.tolist() == [10.0, 5.0, 6.0]
+
+
+def test_ties_are_broken_by_rng():
+    bids = np.full((200, 2), 5.0)
+    winners, _ = clear_lots(bids, rng=np.random.default_rng(0))
+    assert 0 < (winners == 0).sum() < 200
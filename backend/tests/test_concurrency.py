@@ -0,0 +1,72 @@
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from backend.utils import concurrency
+
+
+def _fails():
+    raise ValueError("inference failed")
+
+
+def _use_mode(monkeypatch, gevent):
+    monkeypatch.setattr(concurrency, '_offload', None)
+    monkeypatch.setattr(concurrency, '_gevent_patched', lambda: gevent)
+    monkeypatch.setattr(concurrency, '_eventlet_patched', lambda: False)
+
+
+def test_threading_mode_runs_inline_and_reraises(monkeypatch):
+    _use_mode(monkeypatch, gevent=False)
+    caller = threading.get_ident()
+    assert concurrency.run_blocking(lambda a, b=0: (a + b, threading.get_ident()), 2, b=3) == (5, caller)
+    with pytest.raises(ValueError, match="inference failed"):
+        concurrency.run_blocking(_fails)
+
+
+def test_gevent_mode_hands_the_call_to_the_hub_threadpool_and_reraises(monkeypatch):
+    pool = ThreadPoolExecutor(max_workers=1)
+    calls = []
+
+    def apply(fn, args, kwargs):
+        # gevent's ThreadPool.apply: run on a native worker thread, return its result or raise its error
+        calls.append(fn)
+        return pool.submit(fn, *args, **kwargs).result()
+
+    hub = SimpleNamespace(threadpool=SimpleNamespace(apply=apply))
+    monkeypatch.setitem(sys.modules, 'gevent', SimpleNamespace(get_hub=lambda: hub))
+    _use_mode(monkeypatch, gevent=True)
+    try:
+        result, worker = concurrency.run_blocking(lambda a, b=0: (a + b, threading.get_ident()), 2, b=3)
+        assert result == 5 and worker != threading.get_ident()
+        with pytest.raises(ValueError, match="inference failed"):
+            concurrency.run_blocking(_fails)
+        assert len(calls) == 2
+    finally:
+        pool.shutdown()
+
+
+def test_bid_round_inference_goes_through_run_blocking(monkeypatch):
+    from backend.simulation import simulation_mode
+
+    offloaded = []
+
+    def recording_run_blocking(fn, *args, **kwargs):
+        offloaded.append(fn)
+        return fn(*args, **kwargs)
+
+    with simulation_mode() as engine:
+        monkeypatch.setattr(engine, 'run_blocking', recording_run_blocking)
+        auction = engine.new_auction('round', {'title': 'r', 'startingPrice': 100, 'increment': 10, 'duration': 60},
+                                     engine.clock.now_ms())
+        auction.status = 'active'
+        for user_id, key in (('u1', 'alpha'), ('u2', 'beta')):
+            engine.initialize_user_agents(user_id)
+            auction.participants.append(user_id)
+            auction.selected_agents[user_id] = f"{key}_{user_id}"
+        engine.auctions['round'] = auction
+
+        assert engine.simulate_single_bid('round') is not None
+    assert offloaded == [engine.model_decision, engine.model_decision]
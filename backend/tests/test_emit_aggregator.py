@@ -0,0 +1,79 @@
+from backend.utils.emitter import BATCH_EVENT, EmitAggregator, SocketIOEmitter
+
+
+class _Recorder:
+    def __init__(self):
+        self.sent = []
+
+    def emit(self, event, payload, room=None):
+        self.sent.append((event, payload, room))
+
+
+def _auction(auction_id, price):
+    return {'auction': {'id': auction_id, 'currentPrice': price}}
+
+
+def test_burst_flushes_as_one_frame_per_room_with_latest_state():
+    inner = _Recorder()
+    agg = EmitAggregator(inner, window_ms=50, spawn=lambda fn: None)
+    for price in (110, 120, 130):
+        agg.emit('bid_update', {'auction_id': 'a1', 'bid': {'amount': price}}, room='auction_a1')
+        agg.emit('auction_update', _auction('a1', price), room='auction_a1')
+    agg.emit('bid_update', {'auction_id': 'a2', 'bid': {'amount': 55}}, room='auction_a2')
+    assert inner.sent == []
+
+    agg.flush()
+    frames = {room: payload for event, payload, room in inner.sent}
+    assert all(event == BATCH_EVENT for event, _, _ in inner.sent) and len(inner.sent) == 2
+    assert frames['auction_a1'] == {'auctions': [{'id': 'a1', 'currentPrice': 130}], 'bids': []}
+    assert frames['auction_a2']['bids'] == [{'auction_id': 'a2', 'bid': {'amount': 55}}]
+
+
+def test_completion_is_sent_immediately_after_the_rooms_pending_updates():
+    inner = _Recorder()
+    agg = EmitAggregator(inner, window_ms=50, spawn=lambda fn: None)
+    agg.emit('auction_update', _auction('a1', 200), room='auction_a1')
+    agg.emit('auction_complete', _auction('a1', 200), room='auction_a1')
+    assert [event for event, _, _ in inner.sent] == [BATCH_EVENT, 'auction_complete']
+
+
+def test_completion_waits_for_a_batch_already_being_delivered():
+    import threading
+    import time
+
+    delivering = threading.Event()
+
+    class SlowRecorder(_Recorder):
+        def emit(self, event, payload, room=None):
+            if event == BATCH_EVENT:
+                delivering.set()
+                time.sleep(0.1)
+            super().emit(event, payload, room)
+
+    inner = SlowRecorder()
+    agg = EmitAggregator(inner, window_ms=50, spawn=lambda fn: None)
+    agg.emit('auction_update', _auction('a1', 200), room='auction_a1')
+    flusher = threading.Thread(target=agg.flush)
+    flusher.start()
+    delivering.wait()
+    agg.emit('auction_complete', _auction('a1', 200), room='auction_a1')
+    flusher.join()
+    assert [event for event, _, _ in inner.sent] == [BATCH_EVENT, 'auction_complete']
+
+def test_connection_in_several_rooms_gets_one_merged_frame():
+    from backend.app import app, socketio
+
+    lobby = socketio.test_client(app)
+    single = socketio.test_client(app)
+    for auction_id in ('m1', 'm2'):
+        lobby.emit('join_auction', {'auction_id': auction_id})
+    single.emit('join_auction', {'auction_id': 'm1'})
+    lobby.get_received(), single.get_received()
+
+    frames = {f'auction_{i}': {'auctions': [{'id': i}], 'bids': []} for i in ('m1', 'm2')}
+    assert SocketIOEmitter().emit_frames(BATCH_EVENT, frames) == 1
+
+    [lobby_msg] = lobby.get_received()
+    assert sorted(a['id'] for a in lobby_msg['args'][0]['auctions']) == ['m1', 'm2']
+    [single_msg] = single.get_received()
+    assert single_msg['args'][0]['auctions'] == [{'id': 'm1'}]
@@ -0,0 +1,35 @@
+import numpy as np
+import torch
+
+from backend.models.dqn_agent import DQNAgent
+from backend.models.inference import PROFILES, action_agreement, build_serving_model, sample_states
+
+
+def _agent():
+    torch.manual_seed(0)
+    return DQNAgent(agent_id='inference_test', state_size=4, action_size=10, epsilon=0.0, device=torch.device("cpu"))
+
+
+def test_profiles_keep_outputs_close_to_fp32():
+    agent = _agent()
+    states = sample_states(2000)
+    reference = agent.model(torch.from_numpy(states)).detach()
+    for profile in PROFILES:
+        model = build_serving_model(agent.model, profile, agent.state_size)
+        with torch.no_grad():
+            out = model(torch.from_numpy(states))
+        scale = reference.abs().max()
+        assert (out - reference).abs().max() / scale < (0.05 if profile == 'int8' else 1e-5), profile
+        assert action_agreement(agent.model, model, states) > (0.9 if profile == 'int8' else 0.999)
+
+
+def test_serving_variant_follows_weight_swaps():
+    agent, other = _agent(), _agent()
+    torch.nn.init.normal_(other.model.net[0].weight)
+    states = sample_states(256)
+
+    agent.set_inference_profile('traced')
+    version = agent.model_version
+    agent.swap_weights(other.model.state_dict())
+    assert agent.model_version == version + 1
+    assert np.array_equal(agent.greedy_actions(states), other.greedy_actions(states))
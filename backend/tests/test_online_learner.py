@@ -0,0 +1,63 @@
+import time
+
+import numpy as np
+import torch
+
+from backend.models.dqn_agent import DQNAgent
+from backend.models.online_learner import OnlineLearner, outcome_reward
+
+
+def _agent():
+    return DQNAgent(agent_id='online_test', state_size=4, action_size=10, epsilon=0.0, device=torch.device("cpu"))
+
+
+def test_transitions_chain_per_agent_and_close_with_outcome_reward():
+    learner = OnlineLearner(_agent())
+    sent = []
+    learner._send = sent.append
+
+    s1, s2 = [100, 10, 1000, 5000], [120, 10, 1000, 1000]
+    learner.record('a1', 'alpha', s1, 2)
+    learner.record('a1', 'beta', s1, 0)
+    learner.record('a1', 'alpha', s2, 4)
+    assert len(sent) == 1
+    state, action, reward, next_state, done = sent[0]
+    assert action == 2 and reward == 0.0 and done == 0.0 and list(next_state) == s2
+
+    learner.finish('a1', 'alpha', outcome_reward(250, 1000))
+    terminal = {t[1]: t for t in sent[1:]}
+    assert terminal[4][2] == 0.75 and terminal[4][4] == 1.0     # alpha won at a quarter of its budget
+    assert terminal[0][2] == 0.0                                # beta lost
+    assert learner.snapshot()['pending_auctions'] == 0
+
+
+def test_auctions_that_never_finish_are_evicted_oldest_first():
+    learner = OnlineLearner(_agent(), max_auctions=2)
+    learner._send = lambda transition: None
+    for auction_id in ('a1', 'a2', 'a1', 'a3'):
+        learner.record(auction_id, 'alpha', [1, 1, 1, 1], 0)
+    assert list(learner._pending) == ['a1', 'a3'] and learner.stats['evicted'] == 1
+
+
+def test_learner_process_trains_and_serving_agent_swaps_weights():
+    agent = _agent()
+    learner = OnlineLearner(agent, publish_seconds=0.2, replay_ratio=1)
+    learner.start()
+    try:
+        rng = np.random.default_rng(0)
+        for i in range(100):
+            state = rng.uniform(0, 1000, 4).astype(np.float32)
+            learner.record(f'a{i}', 'alpha', state, int(rng.integers(10)))
+            learner.finish(f'a{i}', 'alpha', 1.0)
+        before = {k: v.clone() for k, v in agent.model.state_dict().items()}
+
+        deadline = time.monotonic() + 60
+        while not learner.poll_weights():
+            assert time.monotonic() < deadline, "learner never published weights"
+            time.sleep(0.1)
+    finally:
+        learner.stop()
+
+    assert agent.model_version == 1 and learner.stats['sent'] + len(learner._buffer) == 100
+    after = agent.model.state_dict()
+    assert any(not torch.equal(before[k], after[k]) for k in before)
@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+
+from backend.utils.read_through_cache import ReadThroughCache
+
+
+def test_entries_expire_and_concurrent_misses_share_one_fetch():
+    now = [0.0]
+    calls = []
+
+    def slow_load(key):
+        calls.append(key)
+        time.sleep(0.05)
+        return {'id': key, 'balance': len(calls)}
+
+    cache = ReadThroughCache(slow_load, ttl_seconds=5, clock=lambda: now[0])
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('u1'))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == ['u1'] and all(r['balance'] == 1 for r in results)
+    assert cache.get('u1')['balance'] == 1
+    now[0] = 6.0
+    assert cache.get('u1')['balance'] == 2
+    stats = cache.snapshot()
+    assert stats['hits'] == 1 and stats['loads'] == 2 and stats['coalesced'] == 7
+
+
+def test_invalidate_discards_entry_and_in_flight_read_and_errors_are_not_cached():
+    balance = {'u1': 100}
+    started, release = threading.Event(), threading.Event()
+
+    def load(key):
+        value = balance[key]
+        started.set()
+        release.wait()
+        return value
+
+    cache = ReadThroughCache(load, ttl_seconds=60)
+    reader = threading.Thread(target=cache.get, args=('u1',))
+    reader.start()
+    started.wait()
+    balance['u1'] = 40           # backend debits the wallet while the old read is in flight
+    cache.invalidate('u1')
+    release.set()
+    reader.join()
+    assert cache.get('u1') == 40
+
+    def failing(key):
+        raise RuntimeError("supabase down")
+
+    cache = ReadThroughCache(failing)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            cache.get('u1')
+    assert cache.snapshot()['errors'] == 2
+
+
+def test_interrupted_load_releases_waiters_and_clears_the_flight():
+    started, release = threading.Event(), threading.Event()
+
+    class Killed(BaseException):
+        pass
+
+    def load(key):
+        started.set()
+        release.wait()
+        raise Killed()
+
+    cache = ReadThroughCache(load)
+    leader = threading.Thread(target=lambda: pytest.raises(Killed, cache.get, 'u1'))
+    leader.start()
+    started.wait()
+    errors = []
+    waiter = threading.Thread(target=lambda: errors.append(pytest.raises(RuntimeError, cache.get, 'u1')))
+    waiter.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join(1)
+    waiter.join(1)
+    assert not waiter.is_alive() and len(errors) == 1
+    assert not cache._flights and cache.snapshot()['errors'] == 1
@@ -0,0 +1,42 @@
+from backend.models.records import Auction, Bid
+
+
+def test_auction_record_keeps_running_aggregates():
+    auction = Auction('00000000-0000-0000-0000-000000000001', starting_price=10)
+    ids = [f"00000000-0000-0000-0000-00000000010{i}" for i in range(3)]
+    for bid_id, (bidder, amount) in zip(ids, [('a', 20), ('b', 35), ('a', 30)]):
+        auction.add_bid(Bid(bid_id, bidder, bidder.upper(), 'ai', amount, 1000))
+    assert auction.bid_count == 3
+    assert auction.last_bidder == 'a'
+    assert auction.top_bid().bidder_id == 'b' and auction.top_amount == 35
+    assert auction.bid_ids() == set(ids)
+
+    copy = Auction.from_dict(auction.to_dict())
+    assert copy.to_dict() == auction.to_dict()
+
+
+def test_payload_window_and_keyset_paging_cover_full_history():
+    auction = Auction('a')
+    for n in range(120):
+        # pairs of bids share a timestamp, as sealed clearing produces
+        auction.add_bid(Bid(f"00000000-0000-0000-0000-{n:012d}", 'b', 'B', 'ai', n, 1000 + n // 2))
+    payload = auction.to_dict()
+    assert payload['bidCount'] == 120 and len(payload['bids']) == 50
+    assert payload['bids'][-1]['amount'] == 119
+
+    seen, cursor = [], (None, None)
+    while True:
+        page = auction.bids_page(*cursor, limit=7)
+        seen += [b['amount'] for b in page]
+        if len(page) < 7:
+            break
+        cursor = (page[-1]['timestamp'], page[-1]['id'])
+    assert seen == list(range(120))
+
+
+def test_bid_history_rejects_malformed_cursor():
+    from backend.app import app
+
+    client = app.test_client()
+    assert client.get('/api/auction/get-auction/any/bids?after_ts=abc').status_code == 400
+    assert client.get('/api/auction/get-auction/any/bids?limit=x').status_code == 400
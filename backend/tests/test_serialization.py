@@ -0,0 +1,43 @@
+import msgpack
+
+from backend.utils import serialization
+from backend.utils.emitter import SocketIOEmitter
+
+PAYLOAD = {'auction_id': 'enc1', 'bid': {'amount': 120.5, 'bidderId': 'alpha_u1'}}
+
+
+def _joined(query_string=None, auth=None):
+    from backend.app import app, socketio
+
+    client = socketio.test_client(app, query_string=query_string, auth=auth)
+    client.emit('join_auction', {'auction_id': 'enc1'})
+    client.get_received()
+    return client
+
+
+def test_msgpack_and_json_clients_each_get_their_own_encoding():
+    binary = _joined(query_string='encoding=msgpack')
+    by_auth = _joined(auth={'encoding': 'msgpack'})
+    plain = _joined()
+
+    SocketIOEmitter().emit('bid_update', PAYLOAD, room='auction_enc1')
+
+    for client in (binary, by_auth):
+        [msg] = client.get_received()
+        assert msg['name'] == 'bid_update' and isinstance(msg['args'][0], bytes)
+        assert msgpack.unpackb(msg['args'][0], raw=False) == PAYLOAD
+    [msg] = plain.get_received()
+    assert msg['name'] == 'bid_update' and msg['args'][0] == PAYLOAD
+    for client in (binary, by_auth, plain):
+        client.disconnect()
+
+
+def test_msgpack_request_falls_back_to_json_when_msgpack_is_unavailable(monkeypatch):
+    monkeypatch.setattr(serialization, 'msgpack', None)
+    client = _joined(query_string='encoding=msgpack')
+
+    SocketIOEmitter().emit('bid_update', PAYLOAD, room='auction_enc1')
+
+    [msg] = client.get_received()
+    assert msg['args'][0] == PAYLOAD
+    client.disconnect()
@@ -0,0 +1,36 @@
+from backend.simulation import run_simulation, simulation_mode
+from backend.routes import auction_routes as engine
+from backend.models.records import Auction
+
+
+def test_auctions_run_to_completion_on_virtual_clock():
+    stats = run_simulation(num_auctions=20, participants=3, duration=60, seed=7)
+    assert stats['events']['auction_complete'] == 20
+    assert stats['bids'] > 0
+    # 20 minutes of auction time must not take anywhere near real time
+    assert stats['wall_seconds'] < 20
+
+
+def test_simulation_mode_restores_engine_globals():
+    live_clock, live_auctions = engine.clock, engine.auctions
+    with simulation_mode():
+        assert engine.clock is not live_clock
+        assert engine.repository.name == 'none'
+    assert engine.clock is live_clock and engine.auctions is live_auctions
+
+
+def test_lone_participant_parks_instead_of_polling():
+    # one agent bids once to open, then has nobody to outbid until the deadline
+    stats = run_simulation(num_auctions=10, participants=1, duration=60, seed=3)
+    assert stats['bids'] == 10
+    assert stats['events']['auction_complete'] == 10
+
+
+def test_round_delay_speeds_up_near_end_and_stops_at_deadline(monkeypatch):
+    monkeypatch.setattr(engine, 'BID_ROUND_SECONDS', 4.0)
+    monkeypatch.setattr(engine, 'BID_ROUND_MIN_SECONDS', 1.0)
+    monkeypatch.setattr(engine, 'BID_ROUND_RAMP_SECONDS', 20.0)
+    auction = Auction('a', end_time=100_000)
+    assert engine.round_delay(auction, 0) == 4.0
+    assert engine.round_delay(auction, 90_000) == 2.5
+    assert engine.round_delay(auction, 99_500) == 0.5
@@ -0,0 +1,60 @@
+from backend.models.records import Auction, Bid
+from backend.storage.sqlite_repository import SQLiteRepository
+
+
+def test_writes_are_batched_and_read_back_as_records(tmp_path):
+    repo = SQLiteRepository(str(tmp_path / "auctions.db"))
+    live = Auction('00000000-0000-0000-0000-0000000000aa', title='live', starting_price=100,
+                   start_time=1_700_000_000_000, end_time=1_700_000_060_000)
+    done = Auction('00000000-0000-0000-0000-0000000000bb', title='done', starting_price=50,
+                   start_time=1_700_000_000_000, end_time=1_700_000_060_000)
+    for auction in (live, done):
+        repo.create_auction(auction)
+    repo.update_status(live.id, 'active')
+    for n, amount in enumerate((110, 120, 130)):
+        repo.record_bid(live.id, Bid(f"00000000-0000-0000-0000-00000000000{n}", 'alpha_u1', 'Alpha', 'ai',
+                                     amount, 1_700_000_001_000 + n))
+    done.winner_id = 'beta_u2'
+    repo.complete_auction(done)
+    repo.save_agent('u2', {'id': 'beta_u2', 'name': 'Beta', 'budget': 8000, 'remainingBudget': 7900})
+    repo.flush()
+
+    [loaded] = repo.load_open_auctions()
+    assert loaded.id == live.id and loaded.status == 'active'
+    assert loaded.current_price == 130 and loaded.bid_count == 3
+    assert loaded.top_bid().bidder_id == 'alpha_u1'
+    assert repo.load_auction(done.id).winner_id == 'beta_u2'
+    assert repo.load_auction('missing') is None
+    assert repo.stats['batches'] <= 3
+    repo.close()
+
+    reopened = SQLiteRepository(str(tmp_path / "auctions.db"))
+    assert reopened.load_auction(live.id).bid_count == 3
+    reopened.close()
+
+
+def test_lot_format_reserve_and_increment_survive_a_reload(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "lots.db")
+    legacy = sqlite3.connect(path)     # a file from before the columns existed
+    legacy.execute("CREATE TABLE auctions (id text PRIMARY KEY, title text NOT NULL, description text, "
+                   "starting_price numeric NOT NULL DEFAULT 0, current_price numeric NOT NULL DEFAULT 0, "
+                   "status text NOT NULL DEFAULT 'pending', start_time text, end_time text, winner_id text, "
+                   "created_by text, created_at text, updated_at text)")
+    legacy.close()
+
+    repo = SQLiteRepository(path)
+    lot = Auction('00000000-0000-0000-0000-0000000000cc', title='lot', starting_price=100, reserve_price=500,
+                  increment=25, format='vickrey', start_time=1_700_000_000_000, end_time=1_700_000_060_000)
+    repo.create_auction(lot)
+    for n, amount in enumerate((700, 600)):
+        repo.record_bid(lot.id, Bid(f"00000000-0000-0000-0000-00000000002{n}", f'a{n}', 'A', 'ai', amount, 1))
+    lot.winner_id, lot.current_price = 'a0', 600.0
+    repo.complete_auction(lot)
+    repo.flush()
+
+    loaded = repo.load_auction(lot.id)
+    assert (loaded.format, loaded.reserve_price, loaded.increment) == ('vickrey', 500, 25)
+    assert loaded.bid_count == 2 and loaded.current_price == 600 and loaded.winning_price == 600
+    repo.close()
@@ -0,0 +1,20 @@
+from backend.models.sweep import grid_configs, run_sweep, train_run
+
+
+def test_training_run_is_reproducible_for_a_seed():
+    config = {'lr': 1e-3, 'gamma': 0.9, 'epsilon_decay': 0.99, 'batch_size': 8, 'target_update_freq': 50}
+    first, _ = train_run(0, config, seed=7, episodes=10, num_agents=3, rounds=5)
+    second, _ = train_run(0, config, seed=7, episodes=10, num_agents=3, rounds=5)
+    assert first['train_steps'] == 50 and first['steps_per_sec'] > 0
+    assert first['train_reward_mean'] == second['train_reward_mean']
+
+
+def test_sweep_trains_every_config_and_plays_round_robin():
+    configs = grid_configs({'lr': [1e-3, 1e-4], 'gamma': [0.9], 'epsilon_decay': [0.99],
+                            'batch_size': [8], 'target_update_freq': [50, 100]})
+    results = run_sweep(configs, episodes=5, match_episodes=4, seed=1, workers=2)
+    assert sorted(r['run'] for r in results) == [0, 1, 2, 3]
+    # 6 pairings x 4 episodes x 5 rounds, one winner per round, over 3 x 4 x 5 rounds played per run
+    assert abs(sum(r['tournament_win_rate'] for r in results) - 2.0) < 1e-9
+    means = [r['tournament_reward_mean'] for r in results]
+    assert means == sorted(means, reverse=True)
@@ -0,0 +1,186 @@
+"""
+Admission control for endpoints that run bid rounds inside the request.
+
+Three checks, cheapest first, before any inference or persistence work starts:
+  - a token bucket per user and one per auction (429 Too Many Requests)
+  - a global cap on request-driven bid rounds in flight (503 Service Unavailable)
+Rejections answer immediately with Retry-After, so overload turns into fast refusals
+instead of queueing behind the auto-bidding loops. The unauthenticated /ai-bid
+endpoints get their own controller, keyed on the client address and charged per state.
+"""
+import math
+import os
+import threading
+import time
+from functools import wraps
+
+from flask import g, jsonify, request
+
+
+class TokenBucketLimiter:
+    """`rate` requests/second per key with bursts up to `burst`; rate <= 0 disables it."""
+
+    def __init__(self, rate, burst, max_keys=100_000, clock=time.monotonic):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.max_keys = max_keys
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._buckets = {}   # key -> [tokens, updated_at]
+
+    def try_acquire(self, key, cost=1.0):
+        """Take `cost` tokens. Returns 0.0 on success, else the seconds until they are available."""
+        if self.rate <= 0:
+            return 0.0
+        now = self.clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    self._prune(now)
+                bucket = self._buckets[key] = [float(self.burst), now]
+            else:
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return 0.0
+            return (cost - bucket[0]) / self.rate
+
+    def refund(self, key, cost=1.0):
+        """Give back tokens taken by a request that was rejected by a later check."""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket[0] = min(self.burst, bucket[0] + cost)
+
+    def _prune(self, now):
+        # buckets that have refilled completely carry no state worth keeping
+        full = [k for k, (tokens, at) in self._buckets.items() if tokens + (now - at) * self.rate >= self.burst]
+        for key in full:
+            del self._buckets[key]
+        if len(self._buckets) >= self.max_keys:
+            self._buckets.clear()
+
+
+class ConcurrencyGate:
+    """Non-blocking cap on concurrent holders; limit <= 0 disables it."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self.in_flight = 0
+
+    def try_enter(self):
+        with self._lock:
+            if 0 < self.limit <= self.in_flight:
+                return False
+            self.in_flight += 1
+            return True
+
+    def exit(self):
+        with self._lock:
+            self.in_flight -= 1
+
+
+class AdmissionController:
+    def __init__(self, user_limiter, auction_limiter, gate, busy_retry_after=1.0):
+        self.users = user_limiter
+        self.auctions = auction_limiter
+        self.gate = gate
+        self.busy_retry_after = busy_retry_after
+        self.stats = {'admitted': 0, 'rejected_user': 0, 'rejected_auction': 0, 'rejected_busy': 0}
+
+    def admit(self, user_key, auction_id, cost=1.0):
+        """
+        (status, retry_after): status is None when admitted (the caller must then call
+        release()), else the HTTP status to reject with. `cost` is charged to the user's bucket.
+        """
+        wait = self.users.try_acquire(user_key, cost)
+        if wait:
+            self.stats['rejected_user'] += 1
+            return 429, wait
+        if auction_id:
+            wait = self.auctions.try_acquire(auction_id)
+            if wait:
+                self.users.refund(user_key, cost)
+                self.stats['rejected_auction'] += 1
+                return 429, wait
+        if not self.gate.try_enter():
+            self.users.refund(user_key, cost)
+            if auction_id:
+                self.auctions.refund(auction_id)
+            self.stats['rejected_busy'] += 1
+            return 503, self.busy_retry_after
+        self.stats['admitted'] += 1
+        return None, 0.0
+
+    def release(self):
+        self.gate.exit()
+
+    def snapshot(self):
+        return {**self.stats, 'in_flight': self.gate.in_flight, 'max_in_flight': self.gate.limit}
+
+
+def admission_controlled(controller, key=None, cost=None):
+    """
+    Route decorator (apply under require_auth): admits the request for the caller
+    (g.user_id, falling back to the body's user_id or the client address) and the
+    body's auction_id, or answers 429/503 with Retry-After. `key(body)` overrides the
+    caller key and `cost(body)` the tokens charged (default 1).
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            data = request.get_json(silent=True)
+            data = data if isinstance(data, dict) else {}
+            if key is not None:
+                user_key = key(data)
+            else:
+                user_key = getattr(g, 'user_id', None) or data.get('user_id') or request.remote_addr
+            status, retry_after = controller.admit(user_key, data.get('auction_id'),
+                                                   cost(data) if cost is not None else 1.0)
+            if status is not None:
+                error = 'Too many requests' if status == 429 else 'Server busy'
+                resp = jsonify({'error': error, 'retry_after': round(retry_after, 3)})
+                resp.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+                return resp, status
+            try:
+                return f(*args, **kwargs)
+            finally:
+                controller.release()
+        return decorated
+    return decorator
+
+
+def open_admission_controller():
+    """
+    AdmissionController from the environment (0 disables a limit):
+      ADMISSION_USER_RATE / ADMISSION_USER_BURST        per-user requests/s and burst (default 5 / 10)
+      ADMISSION_AUCTION_RATE / ADMISSION_AUCTION_BURST  per-auction requests/s and burst (default 10 / 20)
+      ADMISSION_MAX_IN_FLIGHT                           request-driven bid rounds at once (default 32)
+    """
+    return AdmissionController(
+        TokenBucketLimiter(float(os.environ.get("ADMISSION_USER_RATE", 5)),
+                           float(os.environ.get("ADMISSION_USER_BURST", 10))),
+        TokenBucketLimiter(float(os.environ.get("ADMISSION_AUCTION_RATE", 10)),
+                           float(os.environ.get("ADMISSION_AUCTION_BURST", 20))),
+        ConcurrencyGate(int(os.environ.get("ADMISSION_MAX_IN_FLIGHT", 32))),
+    )
+
+
+def open_ai_bid_admission():
+    """
+    AdmissionController for the unauthenticated /ai-bid endpoints (0 disables a limit):
+      AI_BID_CLIENT_RATE / AI_BID_CLIENT_BURST  states/s per client address and burst (default 50 / 200)
+      AI_BID_MAX_IN_FLIGHT                      /ai-bid requests at once (default 16)
+    Kept apart from the bid-round controller so model-decision traffic can't take its slots.
+    """
+    return AdmissionController(
+        TokenBucketLimiter(float(os.environ.get("AI_BID_CLIENT_RATE", 50)),
+                           float(os.environ.get("AI_BID_CLIENT_BURST", 200))),
+        TokenBucketLimiter(0, 1),
+        ConcurrencyGate(int(os.environ.get("AI_BID_MAX_IN_FLIGHT", 16))),
+    )
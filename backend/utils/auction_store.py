@@ -0,0 +1,223 @@
+import os
+import pickle
+import shelve
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+
+class DiskColdStore:
+    """Completed auctions pickled into a local shelve file, read back on demand."""
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = shelve.open(os.path.join(directory, "auctions"), protocol=pickle.HIGHEST_PROTOCOL)
+
+    def put(self, auction):
+        with self._lock:
+            self._db[auction.id] = auction
+
+    def get(self, auction_id):
+        with self._lock:
+            return self._db.get(auction_id)
+
+    def __contains__(self, auction_id):
+        with self._lock:
+            return auction_id in self._db
+
+    def delete(self, auction_id):
+        with self._lock:
+            self._db.pop(auction_id, None)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class AuctionStore(MutableMapping):
+    """
+    Auction records split into tiers:
+
+    - hot:  pending/active auctions, always in memory
+    - warm: recently completed auctions, an LRU bounded by count and approximate bytes
+    - cold: everything evicted from warm, in a DiskColdStore and/or behind `loader`
+            (e.g. a Supabase fetch), read through on lookup and promoted back to warm
+
+    Behaves like the dict it replaces. Iteration, len(), keys()/values()/items()
+    only cover the in-memory tiers; lookups by id (`[]`, get(), `in`) also reach the
+    cold tier. Ids that missed everywhere are remembered for `miss_ttl` seconds so
+    repeated lookups of unknown ids don't each cost a loader round trip. The bid
+    engine and journal replay use peek(), which never leaves memory.
+
+    A row read through the loader that is still pending/active is returned but not
+    cached: no bidding loop runs for it, so only load_persisted_auctions (or a
+    create) may put a live auction in the hot tier.
+    """
+
+    def __init__(self, warm_max=1000, warm_max_bytes=64 * 1024 * 1024, cold=None, loader=None,
+                 miss_ttl=10.0, miss_max=10_000, clock=time.monotonic):
+        self.warm_max = warm_max
+        self.warm_max_bytes = warm_max_bytes
+        self.cold = cold
+        self.loader = loader
+        self.miss_ttl = miss_ttl
+        self.miss_max = miss_max
+        self.clock = clock
+        self._lock = threading.RLock()
+        self._hot = {}
+        self._warm = OrderedDict()
+        self._warm_bytes = 0
+        self._missing = OrderedDict()   # auction id -> time its negative entry expires
+        self.stats = {'evictions': 0, 'cold_writes': 0, 'cold_hits': 0, 'loader_hits': 0, 'misses': 0,
+                      'negative_hits': 0}
+
+    # -------- mapping protocol --------
+    def __getitem__(self, auction_id):
+        auction = self.peek(auction_id)
+        if auction is not None:
+            return auction
+        return self._read_through(auction_id)
+
+    def peek(self, auction_id):
+        """The auction if it is in memory (hot or warm), else None. Never touches cold/loader."""
+        # live auctions are looked up on every bid round; a plain dict read needs no lock
+        auction = self._hot.get(auction_id)
+        if auction is not None:
+            return auction
+        with self._lock:
+            auction = self._warm.get(auction_id)
+            if auction is not None:
+                self._warm.move_to_end(auction_id)
+            return auction
+
+    def __setitem__(self, auction_id, auction):
+        with self._lock:
+            self._missing.pop(auction_id, None)
+            self._discard(auction_id)
+            if auction.status == 'completed':
+                self._admit_warm(auction)
+            else:
+                self._hot[auction_id] = auction
+
+    def __delitem__(self, auction_id):
+        with self._lock:
+            found = self._discard(auction_id)
+        if self.cold is not None and auction_id in self.cold:
+            self.cold.delete(auction_id)
+            found = True
+        if not found:
+            raise KeyError(auction_id)
+
+    def __contains__(self, auction_id):
+        # same reach as get(): an id is "in" the store if a lookup would find it
+        try:
+            self[auction_id]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self._hot) + len(self._warm)
+
+    def keys(self):
+        with self._lock:
+            return list(self._hot) + list(self._warm)
+
+    def values(self):
+        with self._lock:
+            return list(self._hot.values()) + list(self._warm.values())
+
+    def items(self):
+        with self._lock:
+            return list(self._hot.items()) + list(self._warm.items())
+
+    def clear(self):
+        """Drop the in-memory tiers (the cold tier is left alone)."""
+        with self._lock:
+            self._hot.clear()
+            self._warm.clear()
+            self._warm_bytes = 0
+
+    # -------- tiering --------
+    def retire(self, auction_id):
+        """Move a just-completed auction from the hot tier into the warm LRU."""
+        with self._lock:
+            auction = self._hot.pop(auction_id, None)
+            if auction is not None:
+                self._admit_warm(auction)
+
+    def tier_sizes(self):
+        with self._lock:
+            return {'hot': len(self._hot), 'warm': len(self._warm), 'warm_bytes': self._warm_bytes}
+
+    def _discard(self, auction_id):
+        if self._hot.pop(auction_id, None) is not None:
+            return True
+        auction = self._warm.pop(auction_id, None)
+        if auction is not None:
+            self._warm_bytes -= auction.approx_bytes()
+            return True
+        return False
+
+    def _admit_warm(self, auction):
+        self._warm[auction.id] = auction
+        self._warm_bytes += auction.approx_bytes()
+        while self._warm and (len(self._warm) > self.warm_max or self._warm_bytes > self.warm_max_bytes):
+            _, evicted = self._warm.popitem(last=False)
+            self._warm_bytes -= evicted.approx_bytes()
+            self.stats['evictions'] += 1
+            if self.cold is not None:
+                self.cold.put(evicted)
+                self.stats['cold_writes'] += 1
+
+    def _read_through(self, auction_id):
+        now = self.clock()
+        with self._lock:
+            expires = self._missing.get(auction_id)
+            if expires is not None:
+                if expires > now:
+                    self.stats['negative_hits'] += 1
+                    raise KeyError(auction_id)
+                del self._missing[auction_id]
+
+        auction = self.cold.get(auction_id) if self.cold is not None else None
+        if auction is not None:
+            self.stats['cold_hits'] += 1
+        elif self.loader is not None:
+            auction = self.loader(auction_id)
+            if auction is not None:
+                self.stats['loader_hits'] += 1
+        if auction is None:
+            self.stats['misses'] += 1
+            with self._lock:
+                self._missing[auction_id] = now + self.miss_ttl
+                while len(self._missing) > self.miss_max:
+                    self._missing.popitem(last=False)
+            raise KeyError(auction_id)
+        if auction.status == 'completed':
+            self[auction_id] = auction
+        return auction
+
+
+def open_auction_store(loader=None):
+    """
+    Build the store from the environment:
+      AUCTION_WARM_MAX     completed auctions kept in memory (default 1000)
+      AUCTION_WARM_MAX_MB  approximate memory budget for them (default 64)
+      AUCTION_COLD_DIR     local directory for evicted auctions; unset means evicted
+                           auctions are only reachable through `loader`
+      AUCTION_MISS_TTL     seconds an unknown id is answered from memory as missing (default 10)
+    """
+    cold_dir = os.environ.get("AUCTION_COLD_DIR")
+    return AuctionStore(
+        warm_max=int(os.environ.get("AUCTION_WARM_MAX", 1000)),
+        warm_max_bytes=float(os.environ.get("AUCTION_WARM_MAX_MB", 64)) * 1024 * 1024,
+        cold=DiskColdStore(cold_dir) if cold_dir else None,
+        loader=loader,
+        miss_ttl=float(os.environ.get("AUCTION_MISS_TTL", 10)),
+    )
@@ -1,6 +1,24 @@
+import os
 from functools import wraps
-from flask import request, jsonify
+from flask import g, request, jsonify
 from backend.utils.supabase_client import supabase
+from backend.utils.read_through_cache import ReadThroughCache
+from backend.utils import metrics
+
+# Token -> Supabase user, so polling endpoints don't verify the same token on every request.
+# A revoked token keeps working for at most AUTH_CACHE_TTL_SECONDS.
+token_users = ReadThroughCache(
+    lambda token: supabase.auth.get_user(token).user,
+    ttl_seconds=float(os.environ.get("AUTH_CACHE_TTL_SECONDS", 30)),
+    max_size=int(os.environ.get("AUTH_CACHE_MAX", 10_000)),
+)
+metrics.register('auth_cache', token_users.snapshot)
+
+
+def cached_user(token):
+    """The Supabase user for a bearer token (None if invalid), read through token_users."""
+    return token_users.get(token)
+
 
 def require_auth(f):
     @wraps(f)
@@ -18,13 +36,15 @@ def require_auth(f):
                 token = token.split(" ")[1]
             
             # Verify token
-            # With Anon Key, we can still verify the token using get_user
-            user = supabase.auth.get_user(token)
+            # With Anon Key, we can still verify the token using get_user. Checked live on
+            # every call (not through token_users) so a revoked token stops mutating at once.
+            response = supabase.auth.get_user(token)
+            user = response.user if response else None
             if not user:
                 return jsonify({"error": "Invalid token"}), 401
             
-            # Attach user to request (optional, or just pass)
-            # request.user = user
+            # Attach the caller's id to the request (used for per-user rate limits)
+            g.user_id = user.id
             
         except Exception as e:
             return jsonify({"error": f"Authentication failed: {str(e)}"}), 401
@@ -0,0 +1,305 @@
+import json
+import mmap
+import os
+import pickle
+import struct
+import time
+import zlib
+from uuid import UUID
+
+from backend.utils.concurrency import native_lock, native_sleep, start_native_thread
+
+# ----------------------------
+# Record format
+# ----------------------------
+# Each segment file starts with MAGIC, followed by records of
+#   <u32 payload length><u32 crc32(type + payload)><u8 type><payload>
+# Strings are <u16 length><utf-8>, auction/bid ids are raw 16-byte UUIDs.
+MAGIC = b"BJNL\x01"
+_HEADER = struct.Struct("<IIB")
+_STR_LEN = struct.Struct("<H")
+_BID = struct.Struct("<16s16sdd")
+_STATUS = struct.Struct("<16sBd")
+_BUDGET = struct.Struct("<dd")
+
+REC_AUCTION = 1      # auction header (everything except bids), JSON encoded
+REC_BID = 2          # one accepted bid
+REC_STATUS = 3       # status transition (+ startTime)
+REC_PARTICIPANT = 4  # user joined with a selected agent
+REC_BUDGET = 5       # agent budget after a debit (absolute values, so replay is idempotent)
+
+STATUS_CODES = {'pending': 0, 'active': 1, 'completed': 2}
+STATUS_NAMES = {v: k for k, v in STATUS_CODES.items()}
+
+SNAPSHOT_FILE = "snapshot.pkl"
+
+
+def _pack_str(value):
+    raw = (value or "").encode("utf-8")
+    return _STR_LEN.pack(len(raw)) + raw
+
+
+def _unpack_str(buf, offset):
+    (length,) = _STR_LEN.unpack_from(buf, offset)
+    offset += _STR_LEN.size
+    return bytes(buf[offset:offset + length]).decode("utf-8"), offset + length
+
+
+def _uuid_bytes(value):
+    return UUID(str(value)).bytes
+
+
+def _uuid_str(raw):
+    return str(UUID(bytes=bytes(raw)))
+
+
+def decode_record(rtype, payload):
+    """Decode one record payload into a plain dict."""
+    if rtype == REC_AUCTION:
+        return {'auction': json.loads(bytes(payload[16:]).decode("utf-8"))}
+    if rtype == REC_BID:
+        auction_raw, bid_raw, amount, ts = _BID.unpack_from(payload, 0)
+        offset = _BID.size
+        bidder_id, offset = _unpack_str(payload, offset)
+        bidder_name, offset = _unpack_str(payload, offset)
+        bidder_type, offset = _unpack_str(payload, offset)
+        return {
+            'auction_id': _uuid_str(auction_raw),
+            'bid': {
+                'id': _uuid_str(bid_raw),
+                'bidderId': bidder_id,
+                'bidderName': bidder_name,
+                'bidderType': bidder_type,
+                'amount': amount,
+                'timestamp': ts,
+            },
+        }
+    if rtype == REC_STATUS:
+        auction_raw, code, ts = _STATUS.unpack_from(payload, 0)
+        return {'auction_id': _uuid_str(auction_raw), 'status': STATUS_NAMES[code], 'timestamp': ts}
+    if rtype == REC_PARTICIPANT:
+        auction_id = _uuid_str(payload[:16])
+        user_id, offset = _unpack_str(payload, 16)
+        agent_id, offset = _unpack_str(payload, offset)
+        return {'auction_id': auction_id, 'user_id': user_id, 'agent_id': agent_id}
+    if rtype == REC_BUDGET:
+        user_id, offset = _unpack_str(payload, 0)
+        agent_id, offset = _unpack_str(payload, offset)
+        remaining, total_spent = _BUDGET.unpack_from(payload, offset)
+        return {'user_id': user_id, 'agent_id': agent_id,
+                'remainingBudget': remaining, 'totalSpent': total_spent}
+    raise ValueError(f"Unknown journal record type {rtype}")
+
+
+def read_segment(path):
+    """
+    Yield (type, record) from one segment via a read-only memory map.
+    Stops at the first torn or corrupt record: everything after it was never fsynced.
+    """
+    size = os.path.getsize(path)
+    if size <= len(MAGIC):
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        if buf[:len(MAGIC)] != MAGIC:
+            print(f"⚠️ Journal segment {path} has a bad header, skipping")
+            return
+        offset = len(MAGIC)
+        while offset + _HEADER.size <= size:
+            length, crc, rtype = _HEADER.unpack_from(buf, offset)
+            start = offset + _HEADER.size
+            end = start + length
+            if end > size:
+                break
+            payload = buf[start:end]
+            if zlib.crc32(payload, zlib.crc32(bytes([rtype]))) != crc:
+                print(f"⚠️ Journal segment {path} corrupt at offset {offset}, ignoring tail")
+                break
+            yield rtype, decode_record(rtype, payload)
+            offset = end
+
+
+class BidJournal:
+    """
+    Local append-only journal of auction mutations with periodic snapshots.
+
+    Appends are buffered in memory and written + fsynced in batches by a
+    flusher on a native OS thread every `sync_interval` seconds, so neither the
+    bid loop nor (under gevent) the event loop waits on the disk. A snapshot
+    rotates to a new segment first and then captures state, so replay (snapshot +
+    newer segments) may see a mutation twice but never misses one; the records
+    are designed to replay idempotently.
+
+    Disk work (sync, rotate, write_snapshot) blocks its caller; from an event
+    loop, call it through run_blocking.
+    """
+
+    def __init__(self, directory, sync_interval=0.02):
+        self.directory = directory
+        self.sync_interval = sync_interval
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = native_lock()       # guards _buffer; held only for in-memory work
+        self._io_lock = native_lock()    # guards the segment file
+        self._buffer = bytearray()
+        self._file = None
+        self._closed = False
+        self.segment = max(self._segments(), default=0)
+        self.records_written = 0
+        self.syncs = 0
+
+    # -------- files --------
+    def _segment_path(self, seq):
+        return os.path.join(self.directory, f"journal.{seq:08d}.log")
+
+    def _segments(self):
+        seqs = []
+        for name in os.listdir(self.directory):
+            if name.startswith("journal.") and name.endswith(".log"):
+                try:
+                    seqs.append(int(name.split(".")[1]))
+                except ValueError:
+                    continue
+        return sorted(seqs)
+
+    def _open_segment(self, seq):
+        self.segment = seq
+        self._file = open(self._segment_path(seq), "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    # -------- recovery --------
+    def recover(self):
+        """
+        Load the latest snapshot (or None) and the records appended after it.
+        Returns (snapshot_state, records). Opens a fresh segment for new appends.
+        """
+        state = None
+        first_segment = 0
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            try:
+                with open(snapshot_path, "rb") as f:
+                    snap = pickle.load(f)
+                state = snap['state']
+                first_segment = snap['next_segment']
+            except Exception as e:
+                print(f"⚠️ Could not read journal snapshot: {e}")
+
+        records = []
+        for seq in self._segments():
+            if seq >= first_segment:
+                records.extend(read_segment(self._segment_path(seq)))
+
+        # never append after a possibly torn tail
+        self._open_segment(max(self.segment, first_segment) + 1)
+        self._start_flusher()
+        return state, records
+
+    # -------- appends --------
+    def _append(self, rtype, payload):
+        crc = zlib.crc32(payload, zlib.crc32(bytes([rtype])))
+        with self._lock:
+            self._buffer += _HEADER.pack(len(payload), crc, rtype)
+            self._buffer += payload
+            self.records_written += 1
+
+    def record_auction(self, auction):
+        header = {k: v for k, v in auction.items() if k != 'bids'}
+        self._append(REC_AUCTION, _uuid_bytes(auction['id']) + json.dumps(header).encode("utf-8"))
+
+    def record_bid(self, auction_id, bid):
+        payload = _BID.pack(_uuid_bytes(auction_id), _uuid_bytes(bid['id']),
+                            float(bid['amount']), float(bid['timestamp']))
+        payload += _pack_str(bid['bidderId']) + _pack_str(bid['bidderName']) + _pack_str(bid.get('bidderType'))
+        self._append(REC_BID, payload)
+
+    def record_status(self, auction_id, status, timestamp):
+        self._append(REC_STATUS, _STATUS.pack(_uuid_bytes(auction_id), STATUS_CODES[status], float(timestamp)))
+
+    def record_participant(self, auction_id, user_id, agent_id):
+        self._append(REC_PARTICIPANT, _uuid_bytes(auction_id) + _pack_str(user_id) + _pack_str(agent_id))
+
+    def record_budget(self, user_id, agent):
+        payload = _pack_str(user_id) + _pack_str(agent['id'])
+        payload += _BUDGET.pack(float(agent['remainingBudget']), float(agent['totalSpent']))
+        self._append(REC_BUDGET, payload)
+
+    # -------- durability --------
+    def sync(self):
+        """Write buffered records and fsync them."""
+        with self._io_lock:
+            self._sync_locked()
+
+    def _sync_locked(self):
+        if self._file is None:
+            return
+        with self._lock:
+            if not self._buffer:
+                return
+            data = bytes(self._buffer)
+            self._buffer.clear()
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.syncs += 1
+
+    def _start_flusher(self):
+        def loop():
+            while not self._closed:
+                native_sleep(self.sync_interval)
+                try:
+                    self.sync()
+                except Exception as e:
+                    print(f"⚠️ Journal sync failed: {e}")
+        start_native_thread(loop, "bid-journal-flusher")
+
+    def rotate(self):
+        """Flush into the current segment and start a new one. Returns the closed segment's number."""
+        with self._io_lock:
+            self._sync_locked()
+            old_segment = self.segment
+            self._file.close()
+            self._open_segment(old_segment + 1)
+        return old_segment
+
+    def snapshot(self, capture_state):
+        """
+        Rotate to a new segment, then persist `capture_state()` as the snapshot
+        and drop the segments it covers.
+        """
+        old_segment = self.rotate()
+        self.write_snapshot(old_segment, capture_state())
+
+    def write_snapshot(self, old_segment, state):
+        """Persist `state`, captured after rotate() returned `old_segment`, and drop the segments it covers."""
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        tmp_path = snapshot_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({'next_segment': old_segment + 1, 'state': state, 'created_at': time.time()},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, snapshot_path)
+
+        for seq in self._segments():
+            if seq <= old_segment:
+                os.remove(self._segment_path(seq))
+
+    def close(self):
+        self._closed = True
+        with self._io_lock:
+            self._sync_locked()
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
+def open_journal():
+    """Create the journal configured by BID_JOURNAL_DIR, or None when journaling is disabled."""
+    directory = os.environ.get("BID_JOURNAL_DIR")
+    if not directory:
+        return None
+    sync_ms = float(os.environ.get("BID_JOURNAL_SYNC_MS", 20))
+    return BidJournal(directory, sync_interval=sync_ms / 1000.0)
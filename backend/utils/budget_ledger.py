@@ -0,0 +1,120 @@
+import threading
+
+
+class Account:
+    __slots__ = ("budget", "spent", "held", "available")
+
+    def __init__(self, budget, spent=0.0):
+        self.budget = float(budget)
+        self.spent = float(spent)
+        self.held = 0.0
+        self.available = self.budget - self.spent
+
+
+class BudgetLedger:
+    """
+    Agent budgets shared across concurrent auctions.
+
+    An agent leading an auction has a hold for its standing bid. Holds are released
+    when it is outbid and converted into a debit when the auction settles, so the sum
+    of an agent's standing bids can never exceed its budget. Each account keeps
+    `available = budget - spent - held` up to date; every operation is O(1).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._accounts = {}   # agent_id -> Account
+        self._holds = {}      # (agent_id, auction_id) -> amount
+        self._holders = {}    # auction_id -> agent ids with a hold on it
+        self.stats = {'holds': 0, 'releases': 0, 'settlements': 0, 'rejected_holds': 0}
+
+    def clear(self):
+        with self._lock:
+            self._accounts.clear()
+            self._holds.clear()
+            self._holders.clear()
+
+    def open_account(self, agent_id, budget, spent=0.0):
+        """Create the account if it doesn't exist yet."""
+        with self._lock:
+            if agent_id not in self._accounts:
+                self._accounts[agent_id] = Account(budget, spent)
+
+    def account(self, agent_id):
+        return self._accounts.get(agent_id)
+
+    def available(self, agent_id):
+        acct = self._accounts.get(agent_id)
+        return acct.available if acct else 0.0
+
+    def held(self, agent_id, auction_id):
+        return self._holds.get((agent_id, auction_id), 0.0)
+
+    def available_for(self, agent_id, auction_id):
+        """What the agent could commit to this auction: free balance plus its hold here."""
+        return self.available(agent_id) + self.held(agent_id, auction_id)
+
+    def hold(self, agent_id, auction_id, amount, force=False):
+        """
+        Place (or raise/lower) the agent's hold on an auction to `amount`.
+        Returns False without changing anything if the balance can't cover it,
+        unless `force` is set (used when rebuilding holds from restored state).
+        """
+        with self._lock:
+            acct = self._accounts.get(agent_id)
+            if acct is None:
+                return False
+            key = (agent_id, auction_id)
+            delta = amount - self._holds.get(key, 0.0)
+            if delta > acct.available + 1e-9 and not force:
+                self.stats['rejected_holds'] += 1
+                return False
+            self._holds[key] = amount
+            self._holders.setdefault(auction_id, set()).add(agent_id)
+            acct.held += delta
+            acct.available -= delta
+            self.stats['holds'] += 1
+            return True
+
+    def release(self, agent_id, auction_id):
+        """Drop the agent's hold on an auction (e.g. it was outbid). Returns the released amount."""
+        with self._lock:
+            return self._release_locked(agent_id, auction_id)
+
+    def _release_locked(self, agent_id, auction_id):
+        amount = self._pop_hold(agent_id, auction_id)
+        acct = self._accounts.get(agent_id)
+        if acct and amount:
+            acct.held -= amount
+            acct.available += amount
+            self.stats['releases'] += 1
+        return amount
+
+    def release_auction(self, auction_id):
+        """Drop every hold left on a closed auction. Returns the agent ids whose balance changed."""
+        with self._lock:
+            agents = list(self._holders.get(auction_id, ()))
+            return [agent_id for agent_id in agents if self._release_locked(agent_id, auction_id)]
+
+    def _pop_hold(self, agent_id, auction_id):
+        holders = self._holders.get(auction_id)
+        if holders is not None:
+            holders.discard(agent_id)
+            if not holders:
+                del self._holders[auction_id]
+        return self._holds.pop((agent_id, auction_id), 0.0)
+
+    def settle(self, agent_id, auction_id, amount):
+        """Convert the agent's hold on an auction into a debit of `amount` (may differ from the hold)."""
+        with self._lock:
+            held = self._pop_hold(agent_id, auction_id)
+            acct = self._accounts.get(agent_id)
+            if acct is None:
+                return
+            acct.held -= held
+            acct.spent += amount
+            acct.available += held - amount
+            self.stats['settlements'] += 1
+
+    def holds_count(self):
+        return len(self._holds)
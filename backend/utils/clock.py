@@ -0,0 +1,45 @@
+import time
+
+
+class WallClock:
+    """Real time. `sleep` defaults to time.sleep; pass socketio.sleep to stay cooperative."""
+
+    def __init__(self, sleep=None):
+        self._sleep = sleep or time.sleep
+
+    def now_ms(self):
+        return time.time() * 1000
+
+    def sleep(self, seconds):
+        self._sleep(seconds)
+
+    def wait(self, event, timeout):
+        """Block until `event` is set or `timeout` seconds pass. Returns True if woken."""
+        return event.wait(timeout)
+
+
+class VirtualClock:
+    """
+    Simulated time for running the bid engine faster than real time.
+    `sleep` returns immediately after advancing the clock.
+    """
+
+    def __init__(self, start_ms=None):
+        self._now_ms = float(start_ms if start_ms is not None else time.time() * 1000)
+
+    def now_ms(self):
+        return self._now_ms
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def wait(self, event, timeout):
+        # a pending wake returns at once; otherwise nothing else can happen
+        # in simulated time, so jump straight to the timeout
+        if event.is_set():
+            return True
+        self.advance(timeout)
+        return False
+
+    def advance(self, seconds):
+        self._now_ms += max(0.0, seconds) * 1000
@@ -0,0 +1,82 @@
+import threading
+
+import numpy as np
+
+
+class _Batch:
+    __slots__ = ("parts", "size", "full", "done", "result", "error")
+
+    def __init__(self):
+        self.parts = []
+        self.size = 0
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class RequestCoalescer:
+    """
+    Merges concurrent calls to a vectorised function into one call.
+
+    `fn` takes an [N, ...] array and returns a tuple of [N] arrays. The first caller
+    to arrive opens a batch and waits up to `window_ms` (or until `max_batch` rows
+    are queued); callers arriving meanwhile add their rows and block. The opener then
+    runs `fn` once on all rows and every caller gets back its own slice. A call whose
+    rows would push the open batch past `max_batch` sends that batch and opens the next.
+    """
+
+    def __init__(self, fn, window_ms=2.0, max_batch=1024):
+        self.fn = fn
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._open = None
+        self.stats = {'calls': 0, 'batches': 0, 'rows': 0}
+
+    def submit(self, rows):
+        rows = np.asarray(rows)
+        with self._lock:
+            batch = self._open
+            if batch is not None and batch.size + len(rows) > self.max_batch:
+                # would overflow: send the open batch as it is and start a new one
+                self._open = None
+                batch.full.set()
+                batch = None
+            leader = batch is None
+            if leader:
+                batch = self._open = _Batch()
+            start = batch.size
+            batch.parts.append(rows)
+            batch.size += len(rows)
+            if batch.size >= self.max_batch:
+                self._open = None
+                batch.full.set()
+            self.stats['calls'] += 1
+
+        if leader:
+            try:
+                if self.window:
+                    batch.full.wait(self.window)
+                with self._lock:
+                    if self._open is batch:
+                        self._open = None
+                batch.result = self.fn(np.concatenate(batch.parts))
+                with self._lock:
+                    self.stats['batches'] += 1
+                    self.stats['rows'] += batch.size
+            except BaseException as e:
+                # followers get an ordinary error even if the leader was killed or interrupted
+                batch.error = e if isinstance(e, Exception) else RuntimeError("coalesced batch was interrupted")
+                raise
+            finally:
+                with self._lock:
+                    if self._open is batch:
+                        self._open = None
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        return tuple(out[start:start + len(rows)] for out in batch.result)
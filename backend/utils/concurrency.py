@@ -0,0 +1,86 @@
+import importlib
+import os
+import threading
+
+# Socket.IO async mode: "threading", "eventlet" or "gevent".
+# Left unset, Flask-SocketIO picks the best one that is installed.
+ASYNC_MODE = os.environ.get("SOCKETIO_ASYNC_MODE") or None
+
+_offload = None
+
+
+def _gevent_patched():
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched("socket")
+
+
+def _eventlet_patched():
+    try:
+        from eventlet import patcher
+    except ImportError:
+        return False
+    return patcher.is_monkey_patched("socket")
+
+
+def _resolve_offload():
+    # Monkey patching happens at worker start, before the app is imported,
+    # so the answer is fixed by the time the first bid round runs.
+    if _gevent_patched():
+        from gevent import get_hub
+        return lambda fn, args, kwargs: get_hub().threadpool.apply(fn, args, kwargs)
+    if _eventlet_patched():
+        from eventlet import tpool
+        return lambda fn, args, kwargs: tpool.execute(fn, *args, **kwargs)
+    return lambda fn, args, kwargs: fn(*args, **kwargs)
+
+
+def run_blocking(fn, *args, **kwargs):
+    """
+    Run a CPU-bound call (e.g. model inference) without stalling the event loop.
+    Under gevent/eventlet the call is handed to the hub's native thread pool so
+    other greenlets (socket I/O, Supabase requests) keep running while torch
+    holds the core. In plain threading mode every caller already owns an OS
+    thread, so the call runs inline.
+    """
+    global _offload
+    if _offload is None:
+        _offload = _resolve_offload()
+    return _offload(fn, args, kwargs)
+
+
+def _original(module, name):
+    """`module.name` as it was before gevent/eventlet monkey patching."""
+    if _gevent_patched():
+        from gevent import monkey
+        return monkey.get_original(module, name)
+    if _eventlet_patched():
+        from eventlet import patcher
+        return getattr(patcher.original(module), name)
+    return getattr(importlib.import_module(module), name)
+
+
+def start_native_thread(fn, name):
+    """
+    Run `fn` on a real OS thread. Under gevent/eventlet a threading.Thread is a
+    greenlet, so blocking disk or pipe I/O in it would stall the event loop.
+    """
+    if _gevent_patched() or _eventlet_patched():
+        _original('_thread', 'start_new_thread')(fn, ())
+    else:
+        threading.Thread(target=fn, name=name, daemon=True).start()
+
+
+def native_sleep(seconds):
+    """time.sleep for code running on a native thread (see start_native_thread)."""
+    _original('time', 'sleep')(seconds)
+
+
+def native_lock():
+    """
+    A lock that works between native threads and greenlets. A greenlet waiting on it
+    blocks its whole loop, so only hold it for a few in-memory operations.
+    """
+    return _original('_thread', 'allocate_lock')()
@@ -0,0 +1,196 @@
+import os
+import threading
+from collections import Counter
+
+from backend.utils.serialization import BINARY_ROOM_SUFFIX, binary_supported, pack
+
+# One frame per room per flush window, carrying everything EmitAggregator buffered
+BATCH_EVENT = 'auction_batch'
+
+
+def _room_has_members(socketio, room, namespace="/"):
+    try:
+        return bool(socketio.server.manager.rooms.get(namespace, {}).get(room))
+    except AttributeError:
+        return True
+
+
+def _room_members(socketio, room, namespace="/"):
+    """Session ids in `room`, or None if the server doesn't expose them."""
+    try:
+        return list(socketio.server.manager.rooms.get(namespace, {}).get(room) or ())
+    except (AttributeError, RuntimeError):
+        return None
+
+
+def merge_frames(frames):
+    return {
+        'auctions': [a for frame in frames for a in frame['auctions']],
+        'bids': [b for frame in frames for b in frame['bids']],
+    }
+
+
+class SocketIOEmitter:
+    """
+    Emits through the app's SocketIO server (imported lazily to avoid a circular import).
+    Each room has a twin for clients that negotiated MessagePack; they get the same event
+    with the payload packed once into a single binary attachment.
+    """
+
+    def emit(self, event, payload, room=None):
+        from backend.app import socketio
+        socketio.emit(event, payload, room=room)
+        if room is not None and binary_supported():
+            binary_room = room + BINARY_ROOM_SUFFIX
+            if _room_has_members(socketio, binary_room):
+                socketio.emit(event, pack(payload), room=binary_room)
+
+    def emit_frames(self, event, frames):
+        """
+        Deliver one `event` frame per room (room -> payload). A connection in several of
+        these rooms (a lobby watching many auctions) is skipped by the room broadcasts and
+        gets a single merged frame instead.
+        """
+        from backend.app import socketio
+        binary = binary_supported()
+        rooms_of = {}  # sid -> [(room, is_binary)]
+        for room in frames:
+            for twin, is_binary in ((room, False), (room + BINARY_ROOM_SUFFIX, True)):
+                if is_binary and not binary:
+                    continue
+                for sid in _room_members(socketio, twin) or ():
+                    rooms_of.setdefault(sid, []).append((room, is_binary))
+        merged = [sid for sid, rooms in rooms_of.items() if len(rooms) > 1]
+        skip = merged or None
+
+        for room, payload in frames.items():
+            socketio.emit(event, payload, room=room, skip_sid=skip)
+            if binary and _room_has_members(socketio, room + BINARY_ROOM_SUFFIX):
+                socketio.emit(event, pack(payload), room=room + BINARY_ROOM_SUFFIX, skip_sid=skip)
+        for sid in merged:
+            rooms = rooms_of[sid]
+            payload = merge_frames([frames[room] for room, _ in rooms])
+            socketio.emit(event, pack(payload) if rooms[0][1] else payload, to=sid)
+        return len(merged)
+
+
+class NullEmitter:
+    """Drops every event, keeping only per-event counts. Used by simulations."""
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def emit(self, event, payload, room=None):
+        self.counts[event] += 1
+
+
+class EmitAggregator:
+    """
+    Buffers room events for `window_ms` and flushes each room as one BATCH_EVENT frame:
+    {'auctions': [latest full state per auction], 'bids': [bid_update payloads]}. A
+    bid_update is dropped when the same frame carries its auction's full state, which
+    already includes the bid. Events in `immediate` (auction_complete) flush the room's
+    buffer and go out at once, as do events without a room and any other event type.
+
+    Every send (flushes and immediate events) happens under one delivery lock, and a
+    buffer is only taken while that lock is held, so a batch popped before an
+    auction_complete can never reach clients after it.
+    """
+
+    def __init__(self, inner, window_ms=50, immediate=('auction_complete',), sleep=None, spawn=None):
+        self.inner = inner
+        self.window = window_ms / 1000
+        self.immediate = frozenset(immediate)
+        self._sleep = sleep
+        self._spawn = spawn
+        self._lock = threading.Lock()            # guards _pending
+        self._deliver_lock = threading.Lock()    # serialises pop + send
+        self._pending = {}   # room -> {'auctions': {auction_id: state}, 'bids': [payload]}
+        self._flusher_started = False
+        self.stats = {'events': 0, 'immediate': 0, 'flushes': 0, 'frames': 0, 'merged_connections': 0}
+
+    def emit(self, event, payload, room=None):
+        if room is None or event in self.immediate or event not in ('auction_update', 'bid_update'):
+            with self._deliver_lock:
+                self.stats['immediate'] += 1
+                if room is not None:
+                    self._flush_room_locked(room)
+                self.inner.emit(event, payload, room=room)
+            return
+
+        with self._lock:
+            self.stats['events'] += 1
+            buf = self._pending.setdefault(room, {'auctions': {}, 'bids': []})
+            if event == 'auction_update':
+                buf['auctions'][payload['auction']['id']] = payload['auction']
+            else:
+                buf['bids'].append(payload)
+            start = not self._flusher_started
+            self._flusher_started = True
+        if start:
+            self._start_flusher()
+
+    @staticmethod
+    def _frame(buf):
+        auctions = buf['auctions']
+        return {
+            'auctions': list(auctions.values()),
+            'bids': [b for b in buf['bids'] if b.get('auction_id') not in auctions],
+        }
+
+    def flush_room(self, room):
+        with self._deliver_lock:
+            self._flush_room_locked(room)
+
+    def _flush_room_locked(self, room):
+        with self._lock:
+            buf = self._pending.pop(room, None)
+        if buf:
+            self._deliver({room: self._frame(buf)})
+
+    def flush(self):
+        with self._deliver_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if pending:
+                self._deliver({room: self._frame(buf) for room, buf in pending.items()})
+
+    def _deliver(self, frames):
+        self.stats['flushes'] += 1
+        self.stats['frames'] += len(frames)
+        if hasattr(self.inner, 'emit_frames'):
+            self.stats['merged_connections'] += self.inner.emit_frames(BATCH_EVENT, frames)
+        else:
+            for room, frame in frames.items():
+                self.inner.emit(BATCH_EVENT, frame, room=room)
+
+    def _start_flusher(self):
+        def run():
+            while True:
+                self._sleep(self.window)
+                try:
+                    self.flush()
+                except Exception as e:
+                    print(f"⚠️ Emit flush failed: {e}")
+        self._spawn(run)
+
+
+def open_emitter():
+    """
+    SocketIOEmitter, wrapped in an EmitAggregator when EMIT_COALESCE_MS > 0
+    (default 0: every event is emitted as it happens).
+    """
+    emitter = SocketIOEmitter()
+    window_ms = float(os.environ.get("EMIT_COALESCE_MS", 0))
+    if window_ms <= 0:
+        return emitter
+
+    def sleep(seconds):
+        from backend.app import socketio
+        socketio.sleep(seconds)
+
+    def spawn(fn):
+        from backend.app import socketio
+        socketio.start_background_task(fn)
+
+    return EmitAggregator(emitter, window_ms=window_ms, sleep=sleep, spawn=spawn)
@@ -0,0 +1,26 @@
+"""
+Process-wide metrics registry. Components register a callable returning a dict of
+counters/gauges; GET /metrics returns a snapshot of all of them.
+"""
+import threading
+
+_lock = threading.Lock()
+_sources = {}
+
+
+def register(name, fn):
+    """Expose `fn()` under `name` in the /metrics snapshot (re-registering replaces it)."""
+    with _lock:
+        _sources[name] = fn
+
+
+def snapshot():
+    with _lock:
+        sources = list(_sources.items())
+    out = {}
+    for name, fn in sources:
+        try:
+            out[name] = fn()
+        except Exception as e:
+            out[name] = {'error': str(e)}
+    return out
@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error", "stale")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.stale = False
+
+
+class ReadThroughCache:
+    """
+    Per-key cache in front of a slow `loader(key)` (e.g. a Supabase round trip).
+
+    Entries live for `ttl_seconds`. Concurrent misses for one key share a single
+    loader call: the first caller fetches, the others wait for its result (or its
+    exception, which is not cached). invalidate() drops an entry and discards any
+    fetch for that key already in progress, so a write made by the backend is never
+    papered over by a read that started before it.
+    """
+
+    def __init__(self, loader, ttl_seconds=5.0, max_size=10_000, clock=time.monotonic):
+        self.loader = loader
+        self.ttl = ttl_seconds
+        self.max_size = max_size
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (expires_at, value)
+        self._flights = {}
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'loads': 0, 'errors': 0, 'invalidations': 0}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self.clock():
+                self.stats['hits'] += 1
+                return entry[1]
+            self.stats['misses'] += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        loaded = False
+        try:
+            flight.value = self.loader(key)
+            loaded = True
+        except BaseException as e:
+            # waiters get an ordinary error even if the loading greenlet was killed
+            flight.error = e if isinstance(e, Exception) else RuntimeError(f"load of {key!r} was interrupted")
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                if loaded:
+                    self.stats['loads'] += 1
+                    if not flight.stale:
+                        self._entries[key] = (self.clock() + self.ttl, flight.value)
+                        self._entries.move_to_end(key)
+                        while len(self._entries) > self.max_size:
+                            self._entries.popitem(last=False)
+                else:
+                    self.stats['errors'] += 1
+            flight.done.set()
+        return flight.value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+            flight = self._flights.pop(key, None)
+            if flight is not None:
+                flight.stale = True
+            self.stats['invalidations'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            for flight in self._flights.values():
+                flight.stale = True
+            self._flights.clear()
+
+    def snapshot(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {**self.stats, 'size': len(self._entries),
+                'hit_rate': self.stats['hits'] / lookups if lookups else 0.0}
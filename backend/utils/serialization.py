@@ -0,0 +1,76 @@
+import json
+
+from flask import Response, request
+
+# Optional fast paths: msgpack for binary clients, orjson for everyone else.
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+MSGPACK_MIMETYPES = ("application/msgpack", "application/x-msgpack")
+JSON_MIMETYPE = "application/json"
+
+# Socket rooms for binary clients are the JSON room name plus this suffix
+BINARY_ROOM_SUFFIX = "#msgpack"
+
+
+def _default(obj):
+    # numpy scalars/arrays sneak into payloads from the bid engine
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+class FastJSON:
+    """json-module stand-in backed by orjson when installed; handed to SocketIO as its encoder."""
+
+    @staticmethod
+    def dumps(obj, **kwargs):
+        if orjson is not None:
+            return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+        return json.dumps(obj, default=_default, separators=(",", ":"))
+
+    @staticmethod
+    def loads(s, **kwargs):
+        if orjson is not None:
+            return orjson.loads(s)
+        return json.loads(s)
+
+
+def pack(payload):
+    """Encode a payload as MessagePack bytes."""
+    return msgpack.packb(payload, default=_default, use_bin_type=True)
+
+
+def binary_supported():
+    return msgpack is not None
+
+
+def wants_msgpack(encoding=None, accept=None):
+    """True when the client asked for MessagePack (X-Encoding / Accept / handshake) and we can provide it."""
+    if not binary_supported():
+        return False
+    if encoding:
+        return encoding.lower() == "msgpack"
+    return bool(accept) and any(m in accept for m in MSGPACK_MIMETYPES)
+
+
+def encode_response(payload, status=200):
+    """
+    Build a response in the encoding the request negotiated: MessagePack when the
+    client sends `X-Encoding: msgpack` or `Accept: application/msgpack`, otherwise
+    JSON through the fast encoder.
+    """
+    if wants_msgpack(request.headers.get("X-Encoding"), request.headers.get("Accept")):
+        resp = Response(pack(payload), status=status, mimetype=MSGPACK_MIMETYPES[0])
+    else:
+        resp = Response(FastJSON.dumps(payload), status=status, mimetype=JSON_MIMETYPE)
+    resp.vary.add("Accept")
+    resp.vary.add("X-Encoding")
+    return resp
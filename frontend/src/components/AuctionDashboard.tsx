@@ -226,7 +226,7 @@ function AuctionCard({ auction, timeRemaining, onClick }: { auction: Auction, ti
         <div className="flex items-center justify-between text-sm text-gray-500 pt-4 border-t border-gray-100">
           <div className="flex items-center">
             <TrendingUp className="w-4 h-4 mr-1.5 text-blue-500" />
-            <span className="font-medium text-gray-700">{auction.bids?.length || 0}</span>
+            <span className="font-medium text-gray-700">{auction.bidCount ?? auction.bids?.length ?? 0}</span>
             <span className="ml-1">Bids</span>
           </div>
           <div className="flex items-center">
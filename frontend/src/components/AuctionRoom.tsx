@@ -3,9 +3,10 @@ import React, { useState, useEffect } from 'react';
 import socket from '../lib/socket';
 
 import { useAuction } from '../hooks/useAuction';
-import { Auction } from '../types/auction.types';
+import { Auction, AuctionBatchFrame } from '../types/auction.types';
 import { Clock, X, Bot, User, DollarSign, Trophy, Play, Zap } from 'lucide-react';
 import { useAuth } from '../contexts/AuthContext';
+import { BID_WINDOW } from '../utils/config';
 
 interface AuctionRoomProps {
   auction: Auction;
@@ -68,7 +69,8 @@ export function AuctionRoom({ auction: initialAuction, onClose }: AuctionRoomPro
             return next;
           }
           existing.push(payload.bid);
-          next.bids = existing;
+          next.bids = existing.slice(-BID_WINDOW);
+          next.bidCount = (next.bidCount ?? existing.length - 1) + 1;
           return next;
         });
       }
@@ -82,9 +84,16 @@ export function AuctionRoom({ auction: initialAuction, onClose }: AuctionRoomPro
       }
     };
 
+    // Coalesced frame: bids first, then the latest full state
+    const handleBatch = (frame: AuctionBatchFrame) => {
+      frame?.bids?.forEach(handleBidUpdate);
+      frame?.auctions?.forEach((a) => handleAuctionUpdate({ auction: a }));
+    };
+
     socket.on('bid_update', handleBidUpdate);
     socket.on('auction_update', handleAuctionUpdate);
     socket.on('auction_complete', handleAuctionUpdate);
+    socket.on('auction_batch', handleBatch);
 
     return () => {
       // leave room and clean listeners on unmount / auction change
@@ -92,6 +101,7 @@ export function AuctionRoom({ auction: initialAuction, onClose }: AuctionRoomPro
       socket.off('bid_update', handleBidUpdate);
       socket.off('auction_update', handleAuctionUpdate);
       socket.off('auction_complete', handleAuctionUpdate);
+      socket.off('auction_batch', handleBatch);
     };
     // We intentionally depend on auction.id so we re-join if auction changes
     // eslint-disable-next-line react-hooks/exhaustive-deps
@@ -302,7 +312,7 @@ export function AuctionRoom({ auction: initialAuction, onClose }: AuctionRoomPro
                 Live Bid History
               </h3>
               <span className="text-xs font-medium px-2 py-1 bg-gray-200 text-gray-600 rounded-full">
-                {auction.bids?.length || 0} Bids
+                {auction.bidCount ?? auction.bids?.length ?? 0} Bids
               </span>
             </div>
 
@@ -1,10 +1,10 @@
 // src/hooks/useAuction.ts
 import { useState, useEffect, useCallback } from 'react';
-import { Auction, AIAgent } from '../types/auction.types';
+import { Auction, AIAgent, AuctionBatchFrame } from '../types/auction.types';
 import { useAuth } from '../contexts/AuthContext';
 import socket from '../lib/socket';
 
-import { API_BASE_URL } from '../utils/config';
+import { API_BASE_URL, BID_WINDOW } from '../utils/config';
 
 const API_BASE = `${API_BASE_URL}/api/auction`;
 
@@ -234,23 +234,32 @@ export function useAuction(): UseAuctionResult {
           const existing = Array.isArray(next.bids) ? [...next.bids] : [];
           if (!(bid.id && existing.some((b) => b.bidderId === bid.id))) {
             existing.push(bid);
+            next.bidCount = (next.bidCount ?? existing.length - 1) + 1;
           }
-          next.bids = existing;
+          next.bids = existing.slice(-BID_WINDOW);
           return next;
         })
       );
     };
 
+    // Coalesced frame: bids first, then the latest full state
+    const handleBatch = (frame: AuctionBatchFrame) => {
+      frame?.bids?.forEach(handleBidUpdate);
+      frame?.auctions?.forEach((a) => handleAuctionUpdate({ auction: a }));
+    };
+
     // Listen for events
     socket.on('auction_update', handleAuctionUpdate);
     socket.on('bid_update', handleBidUpdate);
     socket.on('auction_complete', handleAuctionUpdate);
+    socket.on('auction_batch', handleBatch);
 
     // cleanup
     return () => {
       socket.off('auction_update', handleAuctionUpdate);
       socket.off('bid_update', handleBidUpdate);
       socket.off('auction_complete', handleAuctionUpdate);
+      socket.off('auction_batch', handleBatch);
     };
     // empty deps so we attach listeners once per hook lifecycle
   }, []);
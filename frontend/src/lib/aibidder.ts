@@ -1,13 +1,15 @@
 // src/lib/aiBidder.ts
 
-import { Auction, AIAgent, Bid, BackendAIBidResponse } from '../types/auction.types';
+import { Auction, AIAgent, Bid, BackendAIBatchResponse } from '../types/auction.types';
 
 import { API_BASE_URL } from '../utils/config';
 
 const API_BASE = `${API_BASE_URL}/api/auction`;
 
 export class AIBidder {
-  private activeBidders: Map<string, NodeJS.Timeout> = new Map();
+  // one bidding loop per auction; each tick asks the backend for all its agents at once
+  private auctionLoops: Map<string, NodeJS.Timeout> = new Map();
+  private auctionAgents: Map<string, AIAgent[]> = new Map();
 
   /**
    * Starts AI bidding loop for given auction using backend RL agents.
@@ -24,66 +26,72 @@ export class AIBidder {
 
     console.log(`Starting AI bidding for auction ${auction.id} with ${agents.length} agents`);
 
-    agents.forEach((agent) => {
-      const interval = setInterval(async () => {
-        // Check if auction is still active
-        if (auction.status !== 'active') {
-          clearInterval(interval);
-          this.activeBidders.delete(agent.id);
-          return;
-        }
+    this.stopAuction(auction.id);
+    this.auctionAgents.set(auction.id, [...agents]);
+
+    const interval = setInterval(async () => {
+      // Check if auction is still active
+      if (auction.status !== 'active') {
+        this.stopAuction(auction.id);
+        return;
+      }
 
+      const bidders = (this.auctionAgents.get(auction.id) ?? []).filter((agent) => {
         // Stop if budget exhausted
         if (agent.remainingBudget <= 0) {
-          clearInterval(interval);
-          this.activeBidders.delete(agent.id);
           console.log(`Agent ${agent.name} stopped bidding - budget exhausted`);
-          return;
+          this.stopBidding(agent.id);
+          return false;
         }
-
         // Check if current price is within agent's budget
         if (auction.currentPrice + auction.increment > agent.remainingBudget) {
           console.log(`Agent ${agent.name} cannot afford minimum bid`);
+          return false;
+        }
+        return true;
+      });
+      if (bidders.length === 0) return;
+
+      // Prepare one state per agent for the backend RL model
+      const timeLeft = Math.max(0, Number(auction.endTime) - Date.now());
+      const states = bidders.map((agent) => ({
+        agent_id: agent.id,
+        current_price: auction.currentPrice,
+        increment: auction.increment,
+        remaining_budget: agent.remainingBudget,
+        time_left: timeLeft,
+      }));
+
+      try {
+        // Ask backend DQN agent to decide for every agent in one round trip
+        const response = await fetch(`${API_BASE}/ai-bid/batch`, {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify({ states }),
+        });
+
+        if (!response.ok) {
+          console.error(`AI bid batch request failed for auction ${auction.id}`);
           return;
         }
 
-        // Prepare state for backend RL model
-        const auctionState = {
-          current_price: auction.currentPrice,
-          increment: auction.increment,
-          remaining_budget: agent.remainingBudget,
-          time_left: Math.max(0, Number(auction.endTime) - Date.now()),
-        };
-
-        try {
-          // Ask backend DQN agent to decide the bid
-          const response = await fetch(`${API_BASE}/ai-bid`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-              agent_id: agent.id,
-              auction_state: auctionState,
-            }),
-          });
-
-          if (!response.ok) {
-            console.error(`AI bid request failed for agent ${agent.name}`);
-            return;
-          }
+        const data: BackendAIBatchResponse = await response.json();
 
-          const data: BackendAIBidResponse = await response.json();
+        if (data.error || !data.decisions) {
+          console.error(`AI bidding error for auction ${auction.id}:`, data.error);
+          return;
+        }
 
-          if (data.error) {
-            console.error(`AI bidding error for agent ${agent.name}:`, data.error);
-            return;
-          }
+        data.decisions.forEach((decision, idx) => {
+          const agent = bidders[idx];
+          if (!agent) return;
 
-          if (!data.bid_amount || data.bid_amount <= auction.currentPrice) {
+          if (!decision.bid_amount || decision.bid_amount <= auction.currentPrice) {
             console.log(`Agent ${agent.name} decided not to bid or bid too low`);
             return;
           }
 
-          const bidAmount = Number(data.bid_amount);
+          const bidAmount = Number(decision.bid_amount);
 
           // Validate bid amount
           if (bidAmount < auction.currentPrice + auction.increment) {
@@ -115,14 +123,13 @@ export class AIBidder {
 
           // Callback to place the bid through the auction engine
           onBid(bid);
+        });
+      } catch (error) {
+        console.error(`AI Bidder (auction ${auction.id}) failed to bid:`, error);
+      }
+    }, this.randomBetween(3000, 8000)); // 3–8 sec bidding interval
 
-        } catch (error) {
-          console.error(`AI Bidder (${agent.name}) failed to bid:`, error);
-        }
-      }, this.randomBetween(3000, 8000)); // 3–8 sec bidding interval
-
-      this.activeBidders.set(agent.id, interval);
-    });
+    this.auctionLoops.set(auction.id, interval);
   }
 
   /**
@@ -130,35 +137,47 @@ export class AIBidder {
    * @param agentId Agent ID to stop
    */
   stopBidding(agentId: string): void {
-    const interval = this.activeBidders.get(agentId);
-    if (interval) {
-      clearInterval(interval);
-      this.activeBidders.delete(agentId);
+    this.auctionAgents.forEach((agents, auctionId) => {
+      const remaining = agents.filter((agent) => agent.id !== agentId);
+      if (remaining.length === agents.length) return;
       console.log(`Stopped bidding for agent ${agentId}`);
-    }
+      if (remaining.length === 0) {
+        this.stopAuction(auctionId);
+      } else {
+        this.auctionAgents.set(auctionId, remaining);
+      }
+    });
   }
 
   /**
    * Stop all AI bidding loops
    */
   stopAllBidding(): void {
-    console.log(`Stopping ${this.activeBidders.size} AI bidders`);
-    this.activeBidders.forEach((interval) => clearInterval(interval));
-    this.activeBidders.clear();
+    console.log(`Stopping ${this.getActiveBidders().length} AI bidders`);
+    this.auctionLoops.forEach((interval) => clearInterval(interval));
+    this.auctionLoops.clear();
+    this.auctionAgents.clear();
   }
 
   /**
    * Check if any agents are currently bidding
    */
   isAnyAgentBidding(): boolean {
-    return this.activeBidders.size > 0;
+    return this.auctionLoops.size > 0;
   }
 
   /**
    * Get list of currently active bidding agents
    */
   getActiveBidders(): string[] {
-    return Array.from(this.activeBidders.keys());
+    return Array.from(this.auctionAgents.values()).flatMap((agents) => agents.map((agent) => agent.id));
+  }
+
+  private stopAuction(auctionId: string): void {
+    const interval = this.auctionLoops.get(auctionId);
+    if (interval) clearInterval(interval);
+    this.auctionLoops.delete(auctionId);
+    this.auctionAgents.delete(auctionId);
   }
 
   /**
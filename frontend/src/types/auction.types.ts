@@ -30,7 +30,10 @@ export interface Auction {
   status: 'pending' | 'active' | 'completed' | 'cancelled';
   participants: string[];
   selectedAgents?: Record<string, string>;
+  /** Most recent bids only (the backend sends a bounded window) */
   bids: AuctionBid[];
+  /** Total number of bids; full history is paged from /get-auction/:id/bids */
+  bidCount?: number;
   winnerId?: string;
   winnerName?: string;
   winningPrice?: number;
@@ -100,6 +103,22 @@ export interface BackendBidResponse {
 
 export interface BackendAIBidResponse {
   agent_id: string;
+  action?: number;
   bid_amount: number;
   error?: string;
 }
+
+/**
+ * Socket 'auction_batch' frame, sent instead of individual updates when the backend
+ * coalesces emits: latest full state per auction plus bids for auctions not included
+ */
+export interface AuctionBatchFrame {
+  auctions: Auction[];
+  bids: { auction_id: string; bid: Bid }[];
+}
+
+/** Response of POST /api/auction/ai-bid/batch: one decision per submitted state, in order */
+export interface BackendAIBatchResponse {
+  decisions?: BackendAIBidResponse[];
+  error?: string;
+}
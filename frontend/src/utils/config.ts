@@ -11,3 +11,6 @@ export const API_BASE_URL = import.meta.env.VITE_API_URL || `http://localhost:${
 export const SOCKET_URL = import.meta.env.VITE_WS_URL || `http://localhost:${PORT}`;
 
 console.log('API_BASE_URL:', API_BASE_URL); // Debug log
+
+// Live auction payloads carry only the most recent bids (matches BID_WINDOW on the backend)
+export const BID_WINDOW = 50;
@@ -0,0 +1,16 @@
+-- Migration: Auction format columns
+-- Description: Persists each lot's format (english, sealed, vickrey), reserve price and bid
+-- increment, so a restart without the local journal reloads sealed lots as sealed lots.
+-- Existing rows were English auctions created with the old defaults.
+
+ALTER TABLE public.auctions ADD COLUMN IF NOT EXISTS reserve_price numeric NOT NULL DEFAULT 0;
+ALTER TABLE public.auctions ADD COLUMN IF NOT EXISTS increment numeric NOT NULL DEFAULT 10;
+ALTER TABLE public.auctions ADD COLUMN IF NOT EXISTS format text NOT NULL DEFAULT 'english';
+
+DO $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'auctions_format_check') THEN
+    ALTER TABLE public.auctions
+      ADD CONSTRAINT auctions_format_check CHECK (format IN ('english', 'sealed', 'vickrey'));
+  END IF;
+END $$;